@@ -0,0 +1,79 @@
+"""
+Benchmark of the binary alpha fast path of the sprite blits.
+
+Renders batches of states of every game once with the renderer's sprites declared to have
+binary alpha (opaque pixels are copied, see ``aj.has_binary_alpha``) and once with the
+general float alpha blend, and reports the XLA cost analysis (flops and bytes accessed)
+and the frames per second of both. Both are verified to produce identical frames before
+timing.
+
+Usage:
+    python scripts/benchmarks/binary_alpha.py --games pong seaquest --batch-sizes 1 256
+"""
+import argparse
+import time
+
+import jax
+import numpy as np
+
+from jaxatari import registry
+
+
+def random_states(env, batch_size, steps, seed):
+    """States of ``batch_size`` environments after ``steps`` random actions."""
+    action_set = np.asarray(env.get_action_space())
+    actions = np.random.default_rng(seed).choice(action_set, (steps, batch_size))
+    _, state = jax.vmap(env.reset)(jax.random.split(jax.random.PRNGKey(seed), batch_size))
+    step = jax.jit(jax.vmap(env.step))
+    for action in actions:
+        _, state, _, _, _ = step(state, action)
+    return state
+
+
+def benchmark(fn, states, repeats):
+    compiled = jax.jit(fn).lower(states).compile()
+    cost = compiled.cost_analysis()
+    cost = cost[0] if isinstance(cost, (list, tuple)) else cost
+
+    out = jax.block_until_ready(compiled(states))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        jax.block_until_ready(compiled(states))
+        best = min(best, time.perf_counter() - start)
+    return cost.get("flops", 0.0), cost.get("bytes accessed", 0.0), best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the binary alpha fast path of the sprite blits.")
+    parser.add_argument("--games", nargs="+", choices=registry.list_games(), default=registry.list_games())
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 256])
+    parser.add_argument("--steps", type=int, default=100, help="random steps before the states are rendered")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'game':>10} {'batch':>6} {'alpha':>7} {'MFLOP':>10} {'MB accessed':>12} {'frames/s':>10}")
+    for game in args.games:
+        env, binary = registry.make(game), registry.make_renderer(game)
+        if not binary.binary_alpha:
+            print(f"{game:>10}: sprites do not have binary alpha, skipped")
+            continue
+        blend = registry.make_renderer(game)
+        blend.binary_alpha = False
+        for batch_size in args.batch_sizes:
+            states = random_states(env, batch_size, args.steps, args.seed)
+            results = {}
+            for name, renderer in (("blend", blend), ("binary", binary)):
+                flops, bytes_accessed, run_time, out = benchmark(jax.vmap(renderer.render), states, args.repeats)
+                results[name] = np.asarray(out)
+                print(
+                    f"{game:>10} {batch_size:>6} {name:>7} {flops / 1e6:>10.2f} "
+                    f"{bytes_accessed / 1e6:>12.2f} {batch_size / run_time:>10.0f}"
+                )
+            if not np.array_equal(results["blend"], results["binary"]):
+                raise RuntimeError(f"{game}: the binary alpha frames differ from the blended frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark of rendered observations with frame skipping.
+
+Rolls out batches of environments wrapped in ``AtariWrapper`` with rendered (max pooled,
+stacked) observations, once with the renderer hook of the wrapper
+(``AtariWrapper(env, renderer=...)``, only the last two frames of every frame skip window
+are rendered) and once naively rendering every frame of the window inside the frame skip
+scan and max pooling the last two. The wrapper without a renderer (the environment's own
+observations) is reported for reference. Both rendered versions are verified to produce
+identical final observations and rewards.
+
+Usage:
+    python scripts/benchmarks/frame_skip_render.py --games pong seaquest --num-envs 1 64 --steps 200
+    python scripts/benchmarks/frame_skip_render.py --width 84 --height 84 --grayscale
+"""
+import argparse
+import time
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari import registry
+from jaxatari.rendering import atraJaxis as aj
+from jaxatari.wrappers import AtariWrapper
+
+
+def naive_step(wrapper, renderer):
+    """AtariWrapper.step (without sticky actions) rendering every frame of the frame skip window."""
+
+    def step(key, state, action):
+        def body(env_state, _):
+            _, env_state, reward, done, _ = wrapper._env.step(env_state, action)
+            return env_state, (renderer.render(env_state), reward, done)
+
+        env_state, (frames, rewards, dones) = jax.lax.scan(body, state.env_state, None, length=wrapper.frame_skip)
+        frames = jnp.concatenate([renderer.render(state.env_state)[None], frames])
+        obs = jnp.concatenate([state.obs_stack[1:], jnp.maximum(frames[-2], frames[-1])[None]])
+        done = jnp.logical_or(dones.any(), state.step >= wrapper.max_episode_length)
+        new_state = state.replace(env_state=env_state, step=state.step + 1, prev_action=action, obs_stack=obs)
+        obs, new_state = jax.lax.cond(done, lambda _: wrapper.reset(key), lambda _: (obs, new_state), operand=None)
+        return obs, new_state, jnp.sum(rewards), done, None
+
+    return step
+
+
+def rollout(reset, step, action_set, num_envs, steps, seed):
+    """Final observations and rewards (steps, envs) of ``num_envs`` environments stepped ``steps`` times with random actions."""
+
+    def run():
+        key = jax.random.PRNGKey(seed)
+        obs, state = jax.vmap(reset)(jax.random.split(key, num_envs))
+
+        def body(carry, key):
+            _, state = carry
+            action_key, step_key = jax.random.split(key)
+            actions = jax.random.choice(action_key, action_set, (num_envs,))
+            obs, state, reward, _, _ = jax.vmap(step)(jax.random.split(step_key, num_envs), state, actions)
+            return (obs, state), reward
+
+        (obs, _), rewards = jax.lax.scan(body, (obs, state), jax.random.split(key, steps))
+        return obs, rewards
+
+    return run
+
+
+def benchmark(fn, repeats):
+    start = time.perf_counter()
+    compiled = jax.jit(fn).lower().compile()
+    compile_time = time.perf_counter() - start
+
+    out = jax.block_until_ready(compiled())
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        jax.block_until_ready(compiled())
+        best = min(best, time.perf_counter() - start)
+    return compile_time, best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendered observations with frame skipping.")
+    # freeway's reset and step states have different dtypes, which AtariWrapper does not support yet
+    parser.add_argument("--games", nargs="+", choices=registry.list_games(), default=["kangaroo", "pong", "seaquest"])
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 64])
+    parser.add_argument("--steps", type=int, default=200, help="wrapper steps per rollout")
+    parser.add_argument("--frame-skip", type=int, default=4)
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=210)
+    parser.add_argument("--grayscale", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    viewport = aj.Viewport(args.width, args.height, grayscale=args.grayscale)
+    print(viewport)
+    print(f"{'game':>10} {'envs':>5} {'version':>8} {'compile [s]':>12} {'steps/s':>10}")
+    for game in args.games:
+        env = registry.make(game)
+        renderer = registry.make_renderer(game, viewport=None if viewport == aj.Viewport() else viewport)
+        action_set = jnp.asarray(env.get_action_space())
+        plain = AtariWrapper(env, sticky_actions=False, frame_skip=args.frame_skip)
+        rendered = AtariWrapper(env, sticky_actions=False, frame_skip=args.frame_skip, renderer=renderer)
+        versions = (
+            ("env obs", plain.reset, plain.step),
+            ("naive", rendered.reset, naive_step(rendered, renderer)),
+            ("hook", rendered.reset, rendered.step),
+        )
+        for num_envs in args.num_envs:
+            results = {}
+            for name, reset, step in versions:
+                compile_time, run_time, out = benchmark(rollout(reset, step, action_set, num_envs, args.steps, args.seed), args.repeats)
+                results[name] = jax.tree.map(np.asarray, out)
+                print(f"{game:>10} {num_envs:>5} {name:>8} {compile_time:>12.3f} {args.steps * num_envs / run_time:>10.0f}")
+            if not all(jax.tree.leaves(jax.tree.map(np.array_equal, results["naive"], results["hook"]))):
+                raise RuntimeError(f"{game}: the observations of the renderer hook differ from rendering every frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark of the import time of the game modules.
+
+Imports every game module in a fresh interpreter (so nothing is cached between runs) and
+reports the wall time of the import and the modules with the largest cumulative import
+time (from ``python -X importtime``). The kernels of a game must not pull in the
+interactive front-ends, so the benchmark first checks that none of the ``--forbidden``
+modules (pygame and gymnax by default) is imported and fails if one is.
+
+Usage:
+    python scripts/benchmarks/import_time.py
+    python scripts/benchmarks/import_time.py --modules jaxatari.games.jax_seaquest --repeats 5 --top 15
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from jaxatari import registry
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"time": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def import_module(module):
+    """Import ``module`` in a fresh interpreter, returns the import time, the imported modules and the importtime log."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return data["time"], data["modules"], result.stderr
+
+
+def slowest_imports(log, top):
+    """Parse a ``-X importtime`` log into the ``top`` (cumulative us, module) entries."""
+    entries = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative), name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main():
+    game_modules = sorted({spec.env.partition(":")[0] for spec in registry.games().values()})
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the game modules.")
+    parser.add_argument("--modules", nargs="+", default=game_modules)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list per module")
+    parser.add_argument("--forbidden", nargs="*", default=["pygame", "gymnax"])
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        times = []
+        for _ in range(args.repeats):
+            elapsed, modules, log = import_module(module)
+            times.append(elapsed)
+        leaked = [
+            name for name in args.forbidden
+            if any(imported == name or imported.startswith(name + ".") for imported in modules)
+        ]
+        if leaked:
+            failed = True
+            print(f"{module}: FAILED, imports {', '.join(leaked)}")
+        print(
+            f"{module}: {statistics.median(times) * 1000:.0f} ms median over {args.repeats} imports, "
+            f"{len(modules)} modules loaded"
+        )
+        for cumulative, name in slowest_imports(log, args.top):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
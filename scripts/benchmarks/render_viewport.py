@@ -0,0 +1,94 @@
+"""
+Benchmark of rendering reduced resolution observations directly with a viewport.
+
+Compares rendering 84x84 grayscale observations (or any other viewport) of batches of
+states directly with a viewport (``make_renderer(game, viewport=...)``) against rendering
+the full (160, 210) RGB frames and converting them afterwards (sampling the same points,
+converting to grayscale and transposing to the layout). Both are verified to produce
+identical observations before timing.
+
+Usage:
+    python scripts/benchmarks/render_viewport.py --games pong seaquest --batch-sizes 1 256 --width 84 --height 84 --grayscale
+    python scripts/benchmarks/render_viewport.py --width 160 --height 210 --layout HWC
+"""
+import argparse
+import time
+
+import jax
+import numpy as np
+
+from jaxatari import registry
+from jaxatari.rendering import atraJaxis as aj
+
+
+def random_states(env, batch_size, steps, seed):
+    """States of ``batch_size`` environments after ``steps`` random actions."""
+    action_set = np.asarray(env.get_action_space())
+    actions = np.random.default_rng(seed).choice(action_set, (steps, batch_size))
+    _, state = jax.vmap(env.reset)(jax.random.split(jax.random.PRNGKey(seed), batch_size))
+    step = jax.jit(jax.vmap(env.step))
+    for action in actions:
+        _, state, _, _, _ = step(state, action)
+    return state
+
+
+def downsample(renderer, viewport):
+    """Full frames sampled at the points of the viewport and transposed to its layout."""
+    sample_x, sample_y = viewport.sample_points()
+
+    def render(state):
+        frame = renderer.render(state)
+        if not (np.array_equal(sample_x, np.arange(frame.shape[0])) and np.array_equal(sample_y, np.arange(frame.shape[1]))):
+            frame = frame[sample_x][:, sample_y]
+        return aj.finish_frame(aj.Canvas(frame.transpose(viewport.axes()), viewport))
+
+    return jax.vmap(render)
+
+
+def benchmark(fn, states, repeats):
+    start = time.perf_counter()
+    compiled = jax.jit(fn).lower(states).compile()
+    compile_time = time.perf_counter() - start
+
+    out = jax.block_until_ready(compiled(states))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        jax.block_until_ready(compiled(states))
+        best = min(best, time.perf_counter() - start)
+    return compile_time, best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering with a viewport against downsampling full frames.")
+    parser.add_argument("--games", nargs="+", choices=registry.list_games(), default=registry.list_games())
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 256])
+    parser.add_argument("--width", type=int, default=84)
+    parser.add_argument("--height", type=int, default=84)
+    parser.add_argument("--crop", type=int, nargs=4, default=[0, 0, 160, 210], metavar=("X", "Y", "WIDTH", "HEIGHT"))
+    parser.add_argument("--grayscale", action="store_true")
+    parser.add_argument("--layout", choices=aj.LAYOUTS, default="WHC")
+    parser.add_argument("--steps", type=int, default=100, help="random steps before the states are rendered")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    viewport = aj.Viewport(args.width, args.height, tuple(args.crop), args.grayscale, args.layout)
+    print(viewport)
+    print(f"{'game':>10} {'batch':>6} {'version':>10} {'compile [s]':>12} {'frames/s':>10}")
+    for game in args.games:
+        env = registry.make(game)
+        full, direct = registry.make_renderer(game), registry.make_renderer(game, viewport=viewport)
+        for batch_size in args.batch_sizes:
+            states = random_states(env, batch_size, args.steps, args.seed)
+            results = {}
+            for name, fn in (("downsample", downsample(full, viewport)), ("viewport", jax.vmap(direct.render))):
+                compile_time, run_time, out = benchmark(fn, states, args.repeats)
+                results[name] = np.asarray(out)
+                print(f"{game:>10} {batch_size:>6} {name:>10} {compile_time:>12.3f} {batch_size / run_time:>10.0f}")
+            if not np.array_equal(results["downsample"], results["viewport"]):
+                raise RuntimeError(f"{game}: the viewport observations differ from the downsampled frames")
+
+
+if __name__ == "__main__":
+    main()
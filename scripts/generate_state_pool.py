@@ -0,0 +1,64 @@
+"""
+Generates a start-state pool for a game (see jaxatari.state_pool).
+
+States are collected from random rollouts, or from the action sequences of recordings
+made with ``play.py --record``. Each recording drives one environment and is repeated
+until the pool is full.
+
+Usage:
+    python scripts/generate_state_pool.py --game seaquest --size 100000 --out seaquest.pool
+    python scripts/generate_state_pool.py --game kangaroo --size 10000 --recordings demo1.npy demo2.npy
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from jaxatari import registry, state_pool
+
+
+def recorded_actions(paths):
+    """Stack the actions of play.py recordings to (steps, recordings), repeating shorter recordings."""
+    actions = [np.load(path, allow_pickle=True).item()["actions"] for path in paths]
+    length = max(len(a) for a in actions)
+    return np.stack([np.resize(np.asarray(a, dtype=np.int32), length) for a in actions], axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a pool of start states for a game.")
+    parser.add_argument("--game", choices=registry.list_games(), required=True)
+    parser.add_argument("--out", help="pool file, defaults to <game>.pool")
+    parser.add_argument("--size", type=int, default=100_000, help="number of states in the pool")
+    parser.add_argument("--num-envs", type=int, default=256, help="environments stepped in parallel")
+    parser.add_argument("--warmup", type=int, default=100, help="steps since the last reset before the state of an environment is collected")
+    parser.add_argument("--interval", type=int, default=25, help="steps between collected states of an environment")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--recordings", nargs="+", help="play.py recordings whose actions are used instead of random actions")
+    args = parser.parse_args()
+
+    env = registry.make(args.game)
+    out = args.out or f"{args.game}.pool"
+
+    actions = None
+    num_envs = args.num_envs
+    if args.recordings:
+        actions = recorded_actions(args.recordings)
+        num_envs = actions.shape[1]
+
+    start = time.time()
+    state_pool.generate_pool(
+        env,
+        out,
+        args.size,
+        num_envs=num_envs,
+        warmup_steps=args.warmup,
+        interval=args.interval,
+        seed=args.seed,
+        actions=actions,
+    )
+    print(f"Wrote {args.size} states to {out} ({os.path.getsize(out) / 1e6:.1f} MB) in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
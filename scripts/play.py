@@ -3,104 +3,37 @@ import importlib.util
 import inspect
 import os
 import sys
-import pygame
+import time
 from typing import Tuple
 
 import jax
 import jax.random as jrandom
 import numpy as np
 
+from jaxatari import interactive, registry
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.interactive import get_human_action
 from jaxatari.renderers import AtraJaxisRenderer
-import jaxatari.rendering.atraJaxis as aj
 
 UPSCALE_FACTOR = 4
 
-def get_human_action() -> jax.numpy.ndarray: # Or chex.Array if you use chex
+def load_game_environment(game: str) -> Tuple[JaxEnvironment, AtraJaxisRenderer]:
     """
-    Get human action from keyboard with support for diagonal movement and combined fire,
-    using Action constants.
-    Returns a JAX array containing a single integer action.
+    Loads a game environment and the renderer, either by the name of a registered game (see jaxatari.registry)
+    or dynamically from a .py file.
+    From a file, the first class that inherits from JaxEnvironment (and AtraJaxisRenderer) defined in it is used.
     """
-    # Important: Process Pygame events to allow window to close, etc.
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            raise SystemExit("Pygame window closed by user.")
-        # You could handle other events here if needed (e.g., KEYDOWN for one-shot actions)
-
-    keys = pygame.key.get_pressed()
-
-    # Consolidate key checks
-    up = keys[pygame.K_UP] or keys[pygame.K_w]
-    down = keys[pygame.K_DOWN] or keys[pygame.K_s]
-    left = keys[pygame.K_LEFT] or keys[pygame.K_a]
-    right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
-    fire = keys[pygame.K_SPACE]
-
-    action_to_take: int # Explicitly declare the type for clarity
-
-    # The order of these checks is crucial for prioritizing actions
-    # (e.g., UPRIGHTFIRE before UPFIRE or UPRIGHT)
-
-    # Diagonal movements with fire (3 keys)
-    if up and right and fire:
-        action_to_take = Action.UPRIGHTFIRE
-    elif up and left and fire:
-        action_to_take = Action.UPLEFTFIRE
-    elif down and right and fire:
-        action_to_take = Action.DOWNRIGHTFIRE
-    elif down and left and fire:
-        action_to_take = Action.DOWNLEFTFIRE
-
-    # Cardinal directions with fire (2 keys)
-    elif up and fire:
-        action_to_take = Action.UPFIRE
-    elif down and fire:
-        action_to_take = Action.DOWNFIRE
-    elif left and fire:
-        action_to_take = Action.LEFTFIRE
-    elif right and fire:
-        action_to_take = Action.RIGHTFIRE
-
-    # Diagonal movements (2 keys)
-    elif up and right:
-        action_to_take = Action.UPRIGHT
-    elif up and left:
-        action_to_take = Action.UPLEFT
-    elif down and right:
-        action_to_take = Action.DOWNRIGHT
-    elif down and left:
-        action_to_take = Action.DOWNLEFT
-
-    # Cardinal directions (1 key for movement)
-    elif up:
-        action_to_take = Action.UP
-    elif down:
-        action_to_take = Action.DOWN
-    elif left:
-        action_to_take = Action.LEFT
-    elif right:
-        action_to_take = Action.RIGHT
-    # Fire alone (1 key)
-    elif fire:
-        action_to_take = Action.FIRE
-    # No relevant keys pressed
-    else:
-        action_to_take = Action.NOOP
-
-    return jax.numpy.array(action_to_take, dtype=jax.numpy.int32)
+    if game in registry.games():
+        spec = registry.get_spec(game)
+        print(f"Found game environment: {spec.env}")
+        if spec.renderer is not None:
+            print(f"Found renderer: {spec.renderer}")
+        return spec.make(), spec.make_renderer()
 
+    if not os.path.exists(game):
+        raise FileNotFoundError(f"Game file not found: {game} (registered games: {', '.join(registry.list_games())})")
 
-
-def load_game_environment(game_file_path: str) -> Tuple[JaxEnvironment, AtraJaxisRenderer]:
-    """
-    Dynamically loads a game environment and the renderer from a .py file.
-    It looks for a class that inherits from JaxEnvironment.
-    """
-    if not os.path.exists(game_file_path):
-        raise FileNotFoundError(f"Game file not found: {game_file_path}")
-
+    game_file_path = game
     module_name = os.path.splitext(os.path.basename(game_file_path))[0]
 
     # Add the directory of the game file to sys.path to handle relative imports within the game file
@@ -123,22 +56,75 @@ def load_game_environment(game_file_path: str) -> Tuple[JaxEnvironment, AtraJaxi
     if game_dir in sys.path and sys.path[0] == game_dir:  # Clean up sys.path if we added to it
         sys.path.pop(0)
 
-    game = None
-    renderer = None
-    # Find the class that inherits from JaxEnvironment
-    for name, obj in inspect.getmembers(game_module):
-        if inspect.isclass(obj) and issubclass(obj, JaxEnvironment) and obj is not JaxEnvironment:
+    game_class = None
+    renderer_class = None
+    # Find the classes defined in the file that inherit from JaxEnvironment and AtraJaxisRenderer,
+    # only those are instantiated
+    for name, obj in inspect.getmembers(game_module, inspect.isclass):
+        if obj.__module__ != game_module.__name__:
+            continue
+        if game_class is None and issubclass(obj, JaxEnvironment) and obj is not JaxEnvironment:
             print(f"Found game environment: {name}")
-            game = obj()  # Instantiate and return
+            game_class = obj
 
-        if inspect.isclass(obj) and issubclass(obj, AtraJaxisRenderer) and obj is not AtraJaxisRenderer:
+        if renderer_class is None and issubclass(obj, AtraJaxisRenderer) and obj is not AtraJaxisRenderer:
             print(f"Found renderer: {name}")
-            renderer = obj()
+            renderer_class = obj
 
-    if game is None:
+    if game_class is None:
         raise ImportError(f"No class found in {game_file_path} that inherits from JaxEnvironment")
 
-    return game, renderer
+    return game_class(), renderer_class() if renderer_class is not None else None
+
+
+def load_recording(path: str) -> dict:
+    """Load a recording saved with --record (a pickled dict of actions, seed and frame rate)."""
+    with open(path, "rb") as f:
+        return np.load(f, allow_pickle=True).item()
+
+
+def replay_headless(env: JaxEnvironment, renderer: AtraJaxisRenderer, recordings: list, render: bool = False) -> dict:
+    """
+    Replays recordings without a window, all at once.
+    The action sequences are padded to the longest recording and stepped with a single lax.scan that is vmapped
+    over the recordings. Steps beyond the end of a recording are masked, so every recording keeps its final state.
+    Returns the final states, the per-step rewards and dones, the recording lengths and (if render) the frames
+    as uint8 arrays of shape (steps, recordings, ...), where frames past the end of a recording repeat its last frame.
+    """
+    lengths = np.array([len(recording["actions"]) for recording in recordings], dtype=np.int32)
+    actions = np.full((lengths.max(), len(recordings)), Action.NOOP, dtype=np.int32)
+    for i, recording in enumerate(recordings):
+        actions[: lengths[i], i] = recording["actions"]
+    valid = np.arange(lengths.max())[:, None] < lengths[None, :]
+    keys = jax.vmap(jrandom.PRNGKey)(jax.numpy.array([int(recording["seed"]) for recording in recordings]))
+
+    def step(state, action, is_valid):
+        obs, new_state, reward, done, info = env.step(state, action)
+        # keep the final state of recordings that already ended
+        new_state = jax.tree_util.tree_map(lambda new, old: jax.numpy.where(is_valid, new, old), new_state, state)
+        outputs = (jax.numpy.where(is_valid, reward, 0), jax.numpy.logical_and(is_valid, done))
+        if render:
+            outputs += (renderer.render(new_state).astype(jax.numpy.uint8),)
+        return new_state, outputs
+
+    @jax.jit
+    def run(keys, actions, valid):
+        _, states = jax.vmap(env.reset)(keys)
+        return jax.lax.scan(lambda state, xs: jax.vmap(step)(state, *xs), states, (actions, valid))
+
+    final_states, outputs = run(keys, actions, valid)
+    result = {"final_states": final_states, "rewards": outputs[0], "dones": outputs[1], "lengths": lengths}
+    if render:
+        result["frames"] = outputs[2]
+    return result
+
+
+def save_replay_results(path: str, result: dict):
+    """Save the output of replay_headless as .npz, with one array per state field."""
+    leaves, _ = jax.tree_util.tree_flatten_with_path(result["final_states"])
+    arrays = {"final_state" + jax.tree_util.keystr(p): np.asarray(leaf) for p, leaf in leaves}
+    arrays.update({name: np.asarray(value) for name, value in result.items() if name != "final_states"})
+    np.savez(path, **arrays)
 
 
 def main():
@@ -147,7 +133,7 @@ def main():
         "--game",
         type=str,
         required=True,
-        help="Path to the Python file containing the game environment class (e.g., ./games/JaxFreeway.py).",
+        help="Name of a registered game (e.g., seaquest) or path to the Python file containing the game environment class (e.g., ./games/JaxFreeway.py).",
     )
 
     mode_group = parser.add_mutually_exclusive_group(required=True)
@@ -165,8 +151,10 @@ def main():
     mode_group.add_argument(
         "--replay",
         type=str,
+        nargs="+",
         metavar="FILE",
-        help="Replay recorded actions from the specified file (e.g. actions.npy).",
+        help="Replay recorded actions from the specified file (e.g. actions.npy). "
+             "Several files can be given together with --headless.",
     )
     mode_group.add_argument(
         "--random",
@@ -183,10 +171,31 @@ def main():
         "--fps",
         type=int,
         default=None,
-        help="Frame rate for the game.",
+        help="Frame rate for the game (default 60, a replay uses its recorded frame rate).",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Replay without a window, stepping all given recordings at once.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="FILE",
+        default=None,
+        help="Save the final states, rewards and dones of a headless replay to the specified file (e.g. replay.npz).",
+    )
+    parser.add_argument(
+        "--frames",
+        action="store_true",
+        help="Also render and save the frames of a headless replay.",
     )
 
     args = parser.parse_args()
+    if args.headless and not args.replay:
+        parser.error("--headless requires --replay")
+    if args.replay and len(args.replay) > 1 and not args.headless:
+        parser.error("replaying several recordings requires --headless")
 
     execute_without_rendering = False
     # Load the game environment
@@ -201,71 +210,54 @@ def main():
         print(f"Error loading game: {e}")
         sys.exit(1)
 
-    # Initialize the environment
-    key = jrandom.PRNGKey(args.seed)
-    jitted_reset = jax.jit(env.reset)
-    jitted_step = jax.jit(env.step)
-    # TODO: for now, we do not test jitted rendering
-
-    # initialize the environment
-    obs, state = jitted_reset(key)
+    if args.headless:
+        if args.frames and execute_without_rendering:
+            print("No renderer found, cannot render frames.")
+            sys.exit(1)
+        recordings = [load_recording(path) for path in args.replay]
+        start = time.perf_counter()
+        result = replay_headless(env, renderer, recordings, render=args.frames)
+        jax.block_until_ready(result)
+        elapsed = time.perf_counter() - start
+        rewards = np.asarray(result["rewards"]).sum(axis=0)
+        dones = np.asarray(result["dones"]).any(axis=0)
+        for path, length, reward, done in zip(args.replay, result["lengths"], rewards, dones):
+            print(f"{path}: {length} steps, total reward {reward}, done: {done}")
+        print(f"Replayed {result['lengths'].sum()} steps in {elapsed:.2f}s (including compilation).")
+        if args.output is not None:
+            save_replay_results(args.output, result)
+        sys.exit(0)
 
-    # setup pygame if we are rendering
-    if not execute_without_rendering:
-        pygame.init()
-        pygame.display.set_caption("JAXAtari Game")
-        env_render_shape = renderer.render(state).shape[:2]
-        window = pygame.display.set_mode((env_render_shape[0] * UPSCALE_FACTOR, env_render_shape[1] * UPSCALE_FACTOR))
-        clock = pygame.time.Clock()
+    key = jrandom.PRNGKey(args.seed)
 
     # get the action space of the current game (i.e. which actions are available)
     action_space = env.get_action_space()
 
-    save_keys = {}
-    playing = True
-    frame_rate = 30
+    recorded_actions = []
+    frame_rate = 60
     if args.replay:
-        with open(args.replay, "rb") as f:
-            # Load the saved data
-            save_data = np.load(f, allow_pickle=True).item()
-
-            # Extract saved data
-            actions_array = save_data['actions']
-            seed = save_data['seed']
-            loaded_frame_rate = save_data['frame_rate']
-
-            frame_rate = loaded_frame_rate
-
-            # Reset environment with the saved seed
-            key = jrandom.PRNGKey(seed)
-            obs, state = jitted_reset(key)
-        
-        # loop over all the actions and play the game
-        for action in actions_array:
-            # Convert numpy action to JAX array
-            action = jax.numpy.array(action, dtype=jax.numpy.int32)
-            obs, state, reward, done, info = jitted_step(state, action)
-            image = renderer.render(state)
-            aj.update_pygame(window, image, UPSCALE_FACTOR, 160, 210)
-            clock.tick(frame_rate)
-            
-            # Check for quit event
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                    pygame.quit()
-                    sys.exit(0)
-        
-        pygame.quit()
-        sys.exit(0)
+        # Load the saved data
+        save_data = load_recording(args.replay[0])
+        replay_actions = iter(save_data['actions'])
 
-    # set the frame rate
-    if args.fps is not None:
-        frame_rate = args.fps
+        # Reset the environment with the saved seed and play at the saved frame rate
+        key = jrandom.PRNGKey(save_data['seed'])
+        frame_rate = save_data['frame_rate']
+
+        def get_action():
+            # None ends the replay after the last action
+            return next(replay_actions, None)
 
-    # main game loop
-    while playing:
-        action = Action.NOOP
-        if args.play or args.record:
+    elif args.random:
+        def get_action():
+            nonlocal key
+            # sample an action from the action space array
+            action = jax.random.choice(key, action_space)
+            key, subkey = jax.random.split(key)
+            return action
+
+    else:
+        def get_action():
             # get the pressed keys
             action = get_human_action()
 
@@ -273,49 +265,45 @@ def main():
             if action not in action_space:
                 action = Action.NOOP
 
-            # Save the action to the save_keys dictionary
             if args.record:
-                # Save the action to the save_keys dictionary
-                save_keys[len(save_keys)] = action
-
-        elif args.random:
-            # sample an action from the action space array
-            action = jax.random.choice(key, action_space)
-            key, subkey = jax.random.split(key)
-
-        else:
-            print("Invalid mode. Use --play, --record, or --replay.")
-            sys.exit(1)
-
-        # Step the environment
-        obs, state, reward, done, info = jitted_step(state, action)
+                recorded_actions.append(action)
+            return action
 
-        # Render the environment
-        if not execute_without_rendering:
-            image = renderer.render(state)
-
-            aj.update_pygame(window, image, UPSCALE_FACTOR, 160, 210)
-
-            clock.tick(frame_rate)
-
-        # check for quit event (esc)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                playing = False
+    # set the frame rate (a replay plays at its recorded frame rate)
+    if args.fps is not None and not args.replay:
+        frame_rate = args.fps
 
+    if execute_without_rendering:
+        jitted_step = jax.jit(env.step)
+        obs, state = jax.jit(env.reset)(key)
+        while True:
+            action = get_action()
+            if action is None:
+                break
+            obs, state, reward, done, info = jitted_step(state, jax.numpy.asarray(action, dtype=jax.numpy.int32))
+    else:
+        # step, render and upscale in one jitted call per frame (see jaxatari.interactive)
+        interactive.run(
+            env,
+            renderer,
+            get_action,
+            fps=frame_rate,
+            frameskip=getattr(env, "frameskip", 1),
+            scale=UPSCALE_FACTOR,
+            caption="JAXAtari Game",
+            key=key,
+        )
 
     if args.record:
-        # Convert dictionary to array of actions
+        # Convert the list to an array of actions
         save_data = {
-            'actions': np.array([action for action in save_keys.values()], dtype=np.int32),
+            'actions': np.array(recorded_actions, dtype=np.int32),
             'seed': args.seed,  # The random seed used
             'frame_rate': frame_rate  # The frame rate for consistent replay
         }
         with open(args.record, "wb") as f:
             np.save(f, save_data)
 
-    pygame.quit()
-
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
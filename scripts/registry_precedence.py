@@ -0,0 +1,80 @@
+"""
+Check of the order in which the registry resolves a game name registered by several sources.
+
+Installs a temporary distribution on ``sys.path`` whose entry points register ``pong``
+(also a built-in game) and ``breakout`` (only an entry point), then verifies that
+``register`` takes precedence over the game modules of ``jaxatari.games``, which take
+precedence over entry points. Nothing is imported from the temporary distribution.
+
+Usage:
+    python scripts/registry_precedence.py
+"""
+import os
+import sys
+import tempfile
+
+from jaxatari import registry
+
+ENTRY_POINTS = """\
+[jaxatari.games]
+pong = stale_games:JaxPong
+breakout = stale_games:JaxBreakout
+
+[jaxatari.renderers]
+pong = stale_games:PongRenderer
+breakout = stale_games:BreakoutRenderer
+"""
+
+
+def install_distribution(directory):
+    """Write the metadata of a distribution with the entry points to ``directory`` and add it to sys.path."""
+    dist_info = os.path.join(directory, "stale_games-0.1.dist-info")
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, "METADATA"), "w") as f:
+        f.write("Metadata-Version: 2.1\nName: stale-games\nVersion: 0.1\n")
+    with open(os.path.join(dist_info, "entry_points.txt"), "w") as f:
+        f.write(ENTRY_POINTS)
+    sys.path.insert(0, directory)
+
+
+def check():
+    """Names of the failed checks."""
+    registry._discovered_games.cache_clear()
+    checks = [
+        (
+            "built-in game over entry point",
+            "pong",
+            registry.GameSpec("pong", "jaxatari.games.jax_pong:JaxPong", "jaxatari.games.jax_pong:PongRenderer"),
+        ),
+        (
+            "entry point game",
+            "breakout",
+            registry.GameSpec("breakout", "stale_games:JaxBreakout", "stale_games:BreakoutRenderer"),
+        ),
+    ]
+    failures = [name for name, game, spec in checks if registry.get_spec(game) != spec]
+
+    registry.register("pong", "runtime_games:JaxPong")
+    registry.register("breakout", "runtime_games:JaxBreakout", "runtime_games:BreakoutRenderer")
+    checks = [
+        ("register over built-in game", "pong", registry.GameSpec("pong", "runtime_games:JaxPong")),
+        (
+            "register over entry point",
+            "breakout",
+            registry.GameSpec("breakout", "runtime_games:JaxBreakout", "runtime_games:BreakoutRenderer"),
+        ),
+    ]
+    failures += [name for name, game, spec in checks if registry.get_spec(game) != spec]
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        install_distribution(directory)
+        failures = check()
+    print("ok" if not failures else "FAILED " + ", ".join(failures))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Round-trip check of the snapshot format for the game states.
+
+Steps a batch of environments of every game with random actions, saves single and
+batched states (uncompressed and compressed) and verifies that loading them back gives
+identical pytrees: single states with a single template, batched states with a batched
+template and with an unbatched template, and memory mapped batched states. A template
+with wrongly shaped fields must be rejected.
+
+Usage:
+    python scripts/snapshot_roundtrip.py
+    python scripts/snapshot_roundtrip.py --games seaquest kangaroo --num-envs 8 --steps 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari import registry, snapshot
+
+
+def stepped_states(env, num_envs, steps, seed):
+    """States of ``num_envs`` environments after ``steps`` random steps."""
+    key = jax.random.PRNGKey(seed)
+    _, states = jax.vmap(env.reset)(jax.random.split(key, num_envs))
+    action_set = jnp.asarray(env.get_action_space())
+
+    @jax.jit
+    def run(states, key):
+        def body(states, key):
+            actions = jax.random.choice(key, action_set, (num_envs,))
+            return jax.vmap(env.step)(states, actions)[1], None
+
+        return jax.lax.scan(body, states, jax.random.split(key, steps))[0]
+
+    return run(states, key)
+
+
+def equal(a, b) -> bool:
+    leaves_a, leaves_b = jax.tree.leaves(a), jax.tree.leaves(b)
+    return (
+        jax.tree.structure(a) == jax.tree.structure(b)
+        and len(leaves_a) == len(leaves_b)
+        and all(np.asarray(x).dtype == np.asarray(y).dtype and np.array_equal(x, y) for x, y in zip(leaves_a, leaves_b))
+    )
+
+
+def check_game(env, num_envs, steps, seed, directory):
+    """Names of the failed checks."""
+    states = stepped_states(env, num_envs, steps, seed)
+    state = jax.tree.map(lambda x: x[0], states)
+    single_path, batch_path = os.path.join(directory, "state.snap"), os.path.join(directory, "states.snap")
+    failures = []
+    for compress in (False, True):
+        snapshot.save_state(single_path, state, compress=compress)
+        snapshot.save_states(batch_path, states, compress=compress)
+        checks = {
+            "single": snapshot.load_state(single_path, like=state),
+            "batched, unbatched template": snapshot.load_states(batch_path, like=state),
+            "batched, batched template": snapshot.load_states(batch_path, like=states),
+        }
+        if not compress:
+            checks["memory mapped, unbatched template"] = snapshot.memmap_states(batch_path, like=state)
+            checks["memory mapped, batched template"] = snapshot.memmap_states(batch_path, like=states)
+        for name, loaded in checks.items():
+            expected = state if name == "single" else states
+            if not equal(loaded, expected):
+                failures.append(f"{name}{' (compressed)' if compress else ''}")
+
+    # a template with an extra axis on every field matches neither the batched nor the unbatched states
+    wrong = jax.tree.map(lambda x: x[None], states)
+    try:
+        snapshot.load_states(batch_path, like=wrong)
+        failures.append("wrongly shaped template accepted")
+    except ValueError:
+        pass
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip check of the snapshot format for the game states.")
+    parser.add_argument("--games", nargs="+", choices=registry.list_games(), default=registry.list_games())
+    parser.add_argument("--num-envs", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for game in args.games:
+            failures = check_game(registry.make(game), args.num_envs, args.steps, args.seed, directory)
+            print(f"{game}: {'ok' if not failures else 'FAILED ' + ', '.join(failures)}")
+            failed |= bool(failures)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Startup profile of the JAXAtari modules.
+
+Imports each target module in a fresh interpreter and reports, for every imported module
+whose name starts with ``--prefix``:
+
+- the cumulative and self import time
+- the device arrays that are still alive after the module was executed (count and bytes),
+  i.e. module-level constants that were materialized on the device
+- which module initialized the JAX backend
+
+Module-level constants should be NumPy arrays or Python values, which become device
+arrays only inside traced code, so importing a game should neither initialize the
+backend nor allocate device memory.
+
+Usage:
+    python scripts/startup_profile.py
+    python scripts/startup_profile.py --targets jaxatari.games.jax_seaquest --prefix jaxatari --json profile.json
+"""
+import argparse
+import importlib.abc
+import json
+import subprocess
+import sys
+import time
+
+
+def _backend_initialized() -> bool:
+    if "jax" not in sys.modules:
+        return False
+    from jax._src import xla_bridge
+
+    return bool(getattr(xla_bridge, "_backends", None))
+
+
+def _device_memory():
+    """Number and bytes of the live device arrays, without initializing the backend."""
+    if not _backend_initialized():
+        return 0, 0
+    import jax
+
+    arrays = jax.live_arrays()
+    return len(arrays), sum(array.nbytes for array in arrays)
+
+
+class ProfilingFinder(importlib.abc.MetaPathFinder):
+    """Wraps the loaders of the modules with the given prefix to record their import time and device allocations."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.records = []
+        self._stack = []
+
+    def find_spec(self, fullname, path, target=None):
+        if not fullname.startswith(self.prefix):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    self._wrap(spec.loader)
+                return spec
+        return None
+
+    def _wrap(self, loader):
+        exec_module = loader.exec_module
+        if getattr(exec_module, "_profiled", False):
+            return
+
+        def profiled_exec_module(module):
+            backend_before = _backend_initialized()
+            count, nbytes = _device_memory()
+            frame = {"children_time": 0.0, "children_arrays": 0, "children_bytes": 0}
+            self._stack.append(frame)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+                new_count, new_nbytes = _device_memory()
+                arrays, array_bytes = new_count - count, new_nbytes - nbytes
+                self.records.append({
+                    "module": module.__name__,
+                    "cumulative_s": elapsed,
+                    "self_s": elapsed - frame["children_time"],
+                    "device_arrays": arrays - frame["children_arrays"],
+                    "device_bytes": array_bytes - frame["children_bytes"],
+                    "initialized_backend": not backend_before and _backend_initialized(),
+                })
+                if self._stack:
+                    self._stack[-1]["children_time"] += elapsed
+                    self._stack[-1]["children_arrays"] += arrays
+                    self._stack[-1]["children_bytes"] += array_bytes
+
+        profiled_exec_module._profiled = True
+        loader.exec_module = profiled_exec_module
+
+
+def profile_import(target, prefix):
+    """Import ``target`` in this interpreter with a profiling import hook."""
+    finder = ProfilingFinder(prefix)
+    sys.meta_path.insert(0, finder)
+    start = time.perf_counter()
+    __import__(target)
+    total = time.perf_counter() - start
+    sys.meta_path.remove(finder)
+    count, nbytes = _device_memory()
+    return {
+        "target": target,
+        "total_s": total,
+        "backend_initialized": _backend_initialized(),
+        "device_arrays": count,
+        "device_bytes": nbytes,
+        "modules": finder.records,
+    }
+
+
+def print_profile(profile, top):
+    print(
+        f"{profile['target']}: {profile['total_s'] * 1000:.0f} ms, backend initialized: "
+        f"{profile['backend_initialized']}, {profile['device_arrays']} device arrays "
+        f"({profile['device_bytes'] / 1e6:.2f} MB)"
+    )
+    print(f"  {'cumulative':>10} {'self':>9} {'arrays':>7} {'bytes':>10}  module")
+    for record in sorted(profile["modules"], key=lambda r: r["self_s"], reverse=True)[:top]:
+        backend = "  (initialized the backend)" if record["initialized_backend"] else ""
+        print(
+            f"  {record['cumulative_s'] * 1000:8.1f}ms {record['self_s'] * 1000:7.1f}ms "
+            f"{record['device_arrays']:7d} {record['device_bytes']:10d}  {record['module']}{backend}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the import time and device allocations of modules.")
+    parser.add_argument("--targets", nargs="+", help="modules to import, defaults to all registered games")
+    parser.add_argument("--prefix", default="jaxatari", help="only modules with this prefix are profiled")
+    parser.add_argument("--top", type=int, default=15, help="number of modules to list per target")
+    parser.add_argument("--json", metavar="FILE", help="also write the profiles to a JSON file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(profile_import(args.child, args.prefix)))
+        return
+
+    targets = args.targets
+    if targets is None:
+        from jaxatari import registry
+
+        targets = sorted({spec.env.partition(":")[0] for spec in registry.games().values()})
+
+    profiles = []
+    for target in targets:
+        # a fresh interpreter per target, so no module is already imported
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", target, "--prefix", args.prefix],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print(f"{target}: import failed\n{result.stderr}")
+            continue
+        profile = json.loads(result.stdout.strip().splitlines()[-1])
+        profiles.append(profile)
+        print_profile(profile, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
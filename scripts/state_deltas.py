@@ -0,0 +1,393 @@
+"""
+Offline state-delta analysis of the JAXAtari games.
+
+The batch counterpart of ``RAMStateDeltas.py``: instead of stepping a single ALE
+environment and looking at its RAM, a JAXAtari game is stepped for many seeds at once
+(``vmap`` inside a ``lax.scan``) and every element of the state pytree is analysed.
+
+``stats`` runs a game with random actions and reports, for every state field element:
+
+- the range of its values, how often it changes and the mean and spread of its deltas
+- the mean delta for each action, and the correlation between its delta and each action
+- the fields whose deltas are most strongly correlated with each other
+
+The statistics are accumulated on the device in chunks of steps (and summed on the host
+in float64), so the memory use does not depend on the number of steps. Finished episodes
+are reset to the initial state of their environment.
+
+``diff`` compares two trajectories recorded with ``step_equivalence.py record`` field by
+field, or a recorded trajectory with the current implementation, and reports where each
+field diverges first. The earliest divergence is usually the cause of all later ones.
+
+Usage:
+    python scripts/state_deltas.py stats --game seaquest --num-envs 256 --steps 5000 --json seaquest_stats.json
+    python scripts/state_deltas.py stats --game kangaroo --fields player --top 20
+
+    python scripts/state_deltas.py diff references/pong_seed0.npz                 # against the current implementation
+    python scripts/state_deltas.py diff old/pong_seed0.npz new/pong_seed0.npz --json diff.json
+"""
+import argparse
+import json
+import re
+import sys
+from functools import partial
+from typing import NamedTuple
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari import registry
+from jaxatari.environment import JAXAtariAction
+
+ACTION_NAMES = {
+    value: name for name, value in vars(JAXAtariAction).items() if isinstance(value, int) and not name.startswith("_")
+}
+
+
+def element_names(state):
+    """Names of the elements of a (single) state, in the order of :func:`flatten_state`."""
+    names = []
+    for path, leaf in jax.tree_util.tree_flatten_with_path(state)[0]:
+        field = jax.tree_util.keystr(path).lstrip(".")
+        shape = np.shape(leaf)
+        if not shape:
+            names.append(field)
+        else:
+            names.extend(f"{field}[{','.join(map(str, index))}]" for index in np.ndindex(shape))
+    return names
+
+
+def flatten_state(state):
+    """All elements of a (single) state as one float32 vector."""
+    return jnp.concatenate([jnp.ravel(leaf).astype(jnp.float32) for leaf in jax.tree_util.tree_leaves(state)])
+
+
+class DeltaStats(NamedTuple):
+    """Sums over the transitions of a chunk of steps, F is the number of state elements and A the number of actions."""
+    transitions: jnp.ndarray      # ()
+    episodes: jnp.ndarray         # ()
+    changed: jnp.ndarray          # (F,) number of transitions that changed the element
+    delta_sum: jnp.ndarray        # (F,)
+    delta_sq: jnp.ndarray         # (F,)
+    minimum: jnp.ndarray          # (F,)
+    maximum: jnp.ndarray          # (F,)
+    action_count: jnp.ndarray     # (A,)
+    action_changed: jnp.ndarray   # (A, F)
+    action_delta: jnp.ndarray     # (A, F)
+    delta_outer: jnp.ndarray      # (F, F)
+
+
+def transition_stats(before, after, action_index, done, num_actions):
+    """The sums of one batched transition, ``before`` and ``after`` are flattened states (envs, F)."""
+    delta = after - before
+    changed = (delta != 0).astype(jnp.float32)
+    one_hot = jax.nn.one_hot(action_index, num_actions, dtype=jnp.float32)
+    return DeltaStats(
+        transitions=jnp.float32(delta.shape[0]),
+        episodes=jnp.sum(done, dtype=jnp.float32),
+        changed=changed.sum(0),
+        delta_sum=delta.sum(0),
+        delta_sq=jnp.square(delta).sum(0),
+        minimum=after.min(0),
+        maximum=after.max(0),
+        action_count=one_hot.sum(0),
+        action_changed=one_hot.T @ changed,
+        action_delta=one_hot.T @ delta,
+        delta_outer=delta.T @ delta,
+    )
+
+
+def combine(a, b):
+    """Combine the sums of two chunks."""
+    return DeltaStats(*(
+        np.minimum(x, y) if name == "minimum" else np.maximum(x, y) if name == "maximum" else x + y
+        for name, x, y in zip(DeltaStats._fields, a, b)
+    ))
+
+
+def make_runner(env, num_envs, hold):
+    """
+    Build the functions that reset ``num_envs`` environments and step them for a chunk of steps.
+    Returns:
+        ``reset(key) -> states`` and the jitted ``run(initial, carry, t0, length) -> carry, DeltaStats``,
+        which steps ``length`` (static) steps
+    """
+    action_set = jnp.asarray(env.get_action_space())
+    num_actions = action_set.shape[0]
+
+    def reset(key):
+        _, states = jax.vmap(env.reset)(jax.random.split(key, num_envs))
+        # the stepped states can have different dtypes than the reset states
+        stepped = jax.eval_shape(jax.vmap(env.step), states, jnp.zeros(num_envs, jnp.int32))[1]
+        return jax.tree.map(lambda leaf, like: leaf.astype(like.dtype), states, stepped)
+
+    def step(initial, carry, t):
+        states, action_index, key = carry
+        key, action_key = jax.random.split(key)
+        # a new random action every ``hold`` steps
+        new_actions = jax.random.randint(action_key, (num_envs,), 0, num_actions)
+        action_index = jnp.where(t % hold == 0, new_actions, action_index)
+        _, stepped, _, done, _ = jax.vmap(env.step)(states, action_set[action_index])
+        stats = transition_stats(
+            jax.vmap(flatten_state)(states), jax.vmap(flatten_state)(stepped), action_index, done, num_actions
+        )
+        mask = done.reshape(-1)
+        stepped = jax.tree.map(
+            lambda a, b: jnp.where(mask.reshape(mask.shape + (1,) * (a.ndim - 1)), a, b), initial, stepped
+        )
+        return (stepped, action_index, key), stats
+
+    @partial(jax.jit, static_argnums=(3,))
+    def run(initial, carry, t0, length):
+        carry, stats = jax.lax.scan(partial(step, initial), carry, t0 + jnp.arange(length))
+        return carry, DeltaStats(
+            *(
+                s.min(0) if name == "minimum" else s.max(0) if name == "maximum" else s.sum(0)
+                for name, s in zip(DeltaStats._fields, stats)
+            )
+        )
+
+    return reset, run
+
+
+def collect_stats(env, num_envs, steps, seed, hold, chunk):
+    """
+    Step the game and return the summed :class:`DeltaStats` (float64 NumPy) and the element names.
+    The steps are run in chunks of ``chunk`` steps and a final shorter chunk for the remainder.
+    """
+    reset, run = make_runner(env, num_envs, hold)
+    key, reset_key = jax.random.split(jax.random.PRNGKey(seed))
+    initial = reset(reset_key)
+    names = element_names(jax.tree.map(lambda leaf: leaf[0], initial))
+    carry = (initial, jnp.zeros(num_envs, jnp.int32), key)
+    total = None
+    for t0 in range(0, steps, chunk):
+        carry, stats = run(initial, carry, t0, min(chunk, steps - t0))
+        stats = DeltaStats(*(np.asarray(s, dtype=np.float64) for s in stats))
+        total = stats if total is None else combine(total, stats)
+    return total, names
+
+
+def correlation(covariance, std_a, std_b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = covariance / (std_a * std_b)
+    return np.where(np.isfinite(r), r, 0.0)
+
+
+def stats_report(stats, names, action_set, field_pattern=None, top=10):
+    """Turn the summed statistics into a JSON-serializable report."""
+    n = stats.transitions
+    mean = stats.delta_sum / n
+    std = np.sqrt(np.maximum(stats.delta_sq / n - mean ** 2, 0.0))
+    action_p = stats.action_count / n
+    action_std = np.sqrt(action_p * (1 - action_p))
+    # correlation between the delta of an element and the indicator of an action, (A, F)
+    action_r = correlation(stats.action_delta / n - action_p[:, None] * mean[None], action_std[:, None], std[None])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        action_change_rate = np.where(
+            stats.action_count[:, None] > 0, stats.action_changed / stats.action_count[:, None], 0.0
+        )
+        action_mean = np.where(stats.action_count[:, None] > 0, stats.action_delta / stats.action_count[:, None], 0.0)
+    field_r = correlation(stats.delta_outer / n - np.outer(mean, mean), std[:, None], std[None])
+
+    selected = [i for i, name in enumerate(names) if field_pattern is None or re.search(field_pattern, name)]
+    action_labels = [ACTION_NAMES.get(int(a), str(int(a))) for a in action_set]
+    fields = []
+    for i in selected:
+        fields.append({
+            "field": names[i],
+            "min": stats.minimum[i],
+            "max": stats.maximum[i],
+            "change_rate": stats.changed[i] / n,
+            "mean_delta": mean[i],
+            "std_delta": std[i],
+            "action_change_rate": dict(zip(action_labels, action_change_rate[:, i])),
+            "action_mean_delta": dict(zip(action_labels, action_mean[:, i])),
+            "action_correlation": dict(zip(action_labels, action_r[:, i])),
+        })
+
+    action_pairs = sorted(
+        ((abs(action_r[a, i]), names[i], action_labels[a], action_r[a, i]) for i in selected for a in range(len(action_labels)) if action_r[a, i] != 0),
+        reverse=True,
+    )[:top]
+    selected_set = set(selected)
+    field_pairs = sorted(
+        (
+            (abs(field_r[i, j]), names[i], names[j], field_r[i, j])
+            for i in selected for j in range(len(names))
+            if j != i and (j not in selected_set or j > i) and field_r[i, j] != 0
+        ),
+        reverse=True,
+    )[:top]
+    return {
+        "transitions": n,
+        "episodes": stats.episodes,
+        "fields": fields,
+        "action_correlations": [{"field": f, "action": a, "r": r} for _, f, a, r in action_pairs],
+        "field_correlations": [{"field": f, "other": o, "r": r} for _, f, o, r in field_pairs],
+    }
+
+
+def print_stats(report):
+    print(
+        f"{report['game']}: {report['num_envs']} envs x {report['steps']} steps, {report['transitions']:.0f} transitions, "
+        f"{report['episodes']:.0f} finished episodes"
+    )
+    changing = [field for field in report["fields"] if field["change_rate"] > 0]
+    constant = [field["field"] for field in report["fields"] if field["change_rate"] == 0]
+    print(f"\n{len(changing)} changing fields:")
+    print(f"  {'changes':>8} {'min':>11} {'max':>11} {'mean d':>9} {'std d':>9}  {'strongest action':<22} field")
+    for field in sorted(changing, key=lambda f: f["change_rate"], reverse=True):
+        action, r = max(field["action_correlation"].items(), key=lambda item: abs(item[1]))
+        print(
+            f"  {field['change_rate']:8.1%} {field['min']:11.4g} {field['max']:11.4g} "
+            f"{field['mean_delta']:9.3g} {field['std_delta']:9.3g}  {f'{action} (r={r:+.2f})':<22} {field['field']}"
+        )
+    if constant:
+        print(f"\n{len(constant)} constant fields: {', '.join(constant)}")
+    print("\nstrongest action correlations:")
+    for entry in report["action_correlations"]:
+        print(f"  {entry['r']:+.3f}  {entry['action']:<14} {entry['field']}")
+    print("\nstrongest field correlations:")
+    for entry in report["field_correlations"]:
+        print(f"  {entry['r']:+.3f}  {entry['field']}  ~  {entry['other']}")
+
+
+def stats_command(args):
+    env = registry.make(args.game)
+    stats, names = collect_stats(env, args.num_envs, args.steps, args.seed, args.hold, args.chunk)
+    report = stats_report(stats, names, np.asarray(env.get_action_space()), args.fields, args.top)
+    report = {"game": args.game, "num_envs": args.num_envs, "steps": args.steps, "seed": args.seed, **report}
+    print_stats(report)
+    if args.json:
+        write_json(args.json, report)
+
+
+def load_trajectory(path):
+    """Load a ``step_equivalence.py`` reference, returns its settings, actions and ``{field: (steps, envs, ...)}``."""
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        fields = {name[len("state"):].lstrip("."): data[name] for name in data.files if name.startswith("state")}
+        return meta, data["actions"], fields
+
+
+def current_trajectory(meta, actions):
+    """Replay the actions of a reference with the current implementation (like ``step_equivalence.py``)."""
+    env = registry.make(meta["game"])
+    keys = jax.random.split(jax.random.PRNGKey(meta["seed"]), actions.shape[1])
+    _, state = jax.vmap(env.reset)(keys)
+
+    def step(state, action):
+        _, state, _, _, _ = jax.vmap(env.step)(state, action)
+        return state, state
+
+    states = jax.jit(lambda s, a: jax.lax.scan(step, s, a)[1])(state, jnp.asarray(actions, dtype=jnp.int32))
+    return {
+        jax.tree_util.keystr(path).lstrip("."): np.asarray(leaf)
+        for path, leaf in jax.tree_util.tree_flatten_with_path(states)[0]
+    }
+
+
+def diff_fields(reference, current):
+    """Field-level differences of two trajectories, sorted by the step of their first divergence."""
+    diffs, missing = [], []
+    for field in sorted(set(reference) | set(current)):
+        if field not in reference or field not in current:
+            missing.append(field)
+            continue
+        ref, cur = reference[field], current[field]
+        if ref.shape != cur.shape:
+            diffs.append({"field": field, "shape": [list(ref.shape), list(cur.shape)]})
+            continue
+        mismatch = ref != cur
+        if not mismatch.any():
+            continue
+        step, env, *element = (int(i) for i in np.argwhere(mismatch)[0])
+        index = (step, env, *element)
+        ref_values, cur_values = ref.astype(np.float64), cur.astype(np.float64)
+        diffs.append({
+            "field": field + (f"[{','.join(map(str, element))}]" if element else ""),
+            "first_step": step,
+            "env": env,
+            "reference": ref[index].item(),
+            "current": cur[index].item(),
+            "differing_values": int(np.count_nonzero(mismatch)),
+            "differing_steps": int(np.count_nonzero(mismatch.reshape(mismatch.shape[0], -1).any(1))),
+            "max_abs_difference": float(np.max(np.abs(ref_values - cur_values)[mismatch])),
+        })
+    diffs.sort(key=lambda d: (d.get("first_step", -1), d["field"]))
+    return diffs, missing
+
+
+def diff_command(args):
+    meta, actions, reference = load_trajectory(args.reference)
+    if args.current:
+        current_meta, current_actions, current = load_trajectory(args.current)
+        if current_meta["game"] != meta["game"] or not np.array_equal(current_actions, actions):
+            print("the trajectories were recorded with different games or actions")
+            return 1
+    else:
+        current = current_trajectory(meta, actions)
+
+    diffs, missing = diff_fields(reference, current)
+    print(f"{meta['game']}: {actions.shape[1]} envs x {actions.shape[0]} steps, {len(diffs)} fields differ")
+    for field in missing:
+        print(f"  {field}: only in one trajectory")
+    if diffs:
+        print(f"  {'first step':>10} {'env':>4} {'reference':>12} {'current':>12} {'steps':>7} {'max |d|':>10}  field")
+    for d in diffs[:args.top]:
+        if "shape" in d:
+            print(f"  {'':>10} {'':>4} {'':>12} {'':>12} {'':>7} {'':>10}  {d['field']}: shape {d['shape'][0]} != {d['shape'][1]}")
+            continue
+        print(
+            f"  {d['first_step']:10d} {d['env']:4d} {d['reference']:12.6g} {d['current']:12.6g} "
+            f"{d['differing_steps']:7d} {d['max_abs_difference']:10.4g}  {d['field']}"
+        )
+    if len(diffs) > args.top:
+        print(f"  ... {len(diffs) - args.top} more")
+    if args.json:
+        write_json(args.json, {"game": meta["game"], "differences": diffs, "missing": missing})
+    return 1 if diffs or missing else 0
+
+
+def write_json(path, report):
+    def default(value):
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f"{type(value)} is not JSON serializable")
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=default)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline analysis of the state changes of a game.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="per-field change statistics and correlations")
+    stats_parser.add_argument("--game", choices=registry.list_games(), required=True)
+    stats_parser.add_argument("--num-envs", type=int, default=128)
+    stats_parser.add_argument("--steps", type=int, default=2000)
+    stats_parser.add_argument("--seed", type=int, default=0)
+    stats_parser.add_argument("--hold", type=int, default=4, help="number of steps each random action is held")
+    stats_parser.add_argument("--chunk", type=int, default=250, help="steps per jitted scan")
+    stats_parser.add_argument("--fields", help="only report fields matching this regular expression")
+    stats_parser.add_argument("--top", type=int, default=10, help="number of correlations to list")
+    stats_parser.add_argument("--json", metavar="FILE", help="also write the report to a JSON file")
+
+    diff_parser = subparsers.add_parser("diff", help="field-level differences between two trajectories")
+    diff_parser.add_argument("reference", help="a trajectory recorded with step_equivalence.py record")
+    diff_parser.add_argument("current", nargs="?", help="a second trajectory, defaults to the current implementation")
+    diff_parser.add_argument("--top", type=int, default=30, help="number of fields to list")
+    diff_parser.add_argument("--json", metavar="FILE", help="also write the report to a JSON file")
+
+    args = parser.parse_args()
+    if args.command == "stats":
+        stats_command(args)
+    else:
+        sys.exit(diff_command(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Step-equivalence harness for the game implementations.
+
+Records reference trajectories (state pytrees, rewards, dones and rendered frames) of a
+game for a fixed seed and action sequence, and verifies that the current implementation
+reproduces a recorded reference bit for bit. All environments of a reference are
+stepped in batched mode (``vmap`` inside a ``lax.scan``), which is how the games are
+used for training.
+
+References are stored as compressed ``.npz`` archives that also contain the actions
+and the settings used to record them, so verifying only needs the file.
+
+Usage:
+    # record references with the current implementation
+    python scripts/step_equivalence.py record --games pong freeway seaquest kangaroo --out-dir references
+
+    # after changing a game, check that it still produces the same trajectories
+    python scripts/step_equivalence.py verify references/*.npz
+"""
+import argparse
+import json
+import os
+import sys
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari import registry
+
+# number of rendered time steps per rendering call, bounds the memory used for frames
+RENDER_CHUNK = 16
+
+
+def load_game(game):
+    return registry.make(game), registry.make_renderer(game)
+
+
+def make_actions(env, num_envs, steps, seed, hold):
+    """Random actions from the action set of the game, each held for ``hold`` steps."""
+    action_set = np.asarray(env.get_action_space())
+    rng = np.random.default_rng(seed)
+    choices = rng.integers(0, len(action_set), (-(-steps // hold), num_envs))
+    return np.repeat(action_set[choices], hold, axis=0)[:steps].astype(np.uint8)
+
+
+def rollout(env, actions, seed):
+    """Step ``actions.shape[1]`` environments through ``actions`` and stack every state."""
+    keys = jax.random.split(jax.random.PRNGKey(seed), actions.shape[1])
+    _, state = jax.vmap(env.reset)(keys)
+
+    def step(state, action):
+        _, state, reward, done, _ = jax.vmap(env.step)(state, action)
+        return state, (state, reward, done)
+
+    @jax.jit
+    def run(state, actions):
+        return jax.lax.scan(step, state, actions)[1]
+
+    return run(state, jnp.asarray(actions, dtype=jnp.int32))
+
+
+def render_frames(renderer, states, render_every):
+    """Render every ``render_every``-th step of stacked ``(steps, envs)`` states."""
+    steps = jax.tree_util.tree_leaves(states)[0].shape[0]
+    indices = np.arange(render_every - 1, steps, render_every)
+    render = jax.jit(jax.vmap(jax.vmap(renderer.render)))
+    chunks = []
+    for start in range(0, len(indices), RENDER_CHUNK):
+        chunk = indices[start:start + RENDER_CHUNK]
+        chunks.append(np.asarray(render(jax.tree_util.tree_map(lambda leaf: leaf[chunk], states))))
+    return np.concatenate(chunks) if chunks else None
+
+
+def flatten_states(states):
+    """Map the stacked state pytree to ``{field path: array}``."""
+    leaves, _ = jax.tree_util.tree_flatten_with_path(states)
+    return {
+        "state" + jax.tree_util.keystr(path): np.asarray(leaf) for path, leaf in leaves
+    }
+
+
+def trajectory(game, num_envs, steps, seed, hold, render_every, actions=None):
+    """Run a game and collect all recorded arrays keyed by their archive name."""
+    env, renderer = load_game(game)
+    if actions is None:
+        actions = make_actions(env, num_envs, steps, seed, hold)
+    states, rewards, dones = rollout(env, actions, seed)
+    arrays = flatten_states(states)
+    arrays["actions"] = actions
+    arrays["rewards"] = np.asarray(rewards)
+    arrays["dones"] = np.asarray(dones)
+    if render_every:
+        arrays["frames"] = render_frames(renderer, states, render_every)
+    return arrays
+
+
+def record(args):
+    os.makedirs(args.out_dir, exist_ok=True)
+    for game in args.games:
+        arrays = trajectory(
+            game, args.num_envs, args.steps, args.seed, args.hold, args.render_every
+        )
+        meta = {
+            "game": game,
+            "num_envs": args.num_envs,
+            "steps": args.steps,
+            "seed": args.seed,
+            "hold": args.hold,
+            "render_every": args.render_every,
+            "jax_version": jax.__version__,
+            "backend": jax.default_backend(),
+        }
+        path = os.path.join(args.out_dir, f"{game}_seed{args.seed}.npz")
+        np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+        print(f"{game}: recorded {len(arrays)} arrays to {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+def compare(reference, current):
+    """Return a list of human readable differences between two sets of arrays."""
+    problems = []
+    for name in sorted(set(reference) | set(current)):
+        if name not in current:
+            problems.append(f"{name}: missing in current implementation")
+            continue
+        if name not in reference:
+            problems.append(f"{name}: not in reference")
+            continue
+        ref, cur = reference[name], current[name]
+        if ref.shape != cur.shape or ref.dtype != cur.dtype:
+            problems.append(f"{name}: {ref.dtype}{list(ref.shape)} != {cur.dtype}{list(cur.shape)}")
+        elif not np.array_equal(ref, cur):
+            mismatch = ref != cur
+            index, env = np.argwhere(mismatch)[0][:2]
+            axis = "frame" if name == "frames" else "step"
+            problems.append(
+                f"{name}: {np.count_nonzero(mismatch)} values differ, "
+                f"first at {axis} {index} env {env}"
+            )
+    return problems
+
+
+def verify(args):
+    failed = False
+    for path in args.references:
+        with np.load(path) as data:
+            reference = {name: data[name] for name in data.files}
+        meta = json.loads(str(reference.pop("meta")))
+        if (meta["jax_version"], meta["backend"]) != (jax.__version__, jax.default_backend()):
+            print(
+                f"{path}: recorded with jax {meta['jax_version']} on {meta['backend']}, "
+                f"verifying with jax {jax.__version__} on {jax.default_backend()}; "
+                "floating point results may legitimately differ"
+            )
+        current = trajectory(
+            meta["game"],
+            meta["num_envs"],
+            meta["steps"],
+            meta["seed"],
+            meta["hold"],
+            meta["render_every"],
+            actions=reference["actions"],
+        )
+        problems = compare(reference, current)
+        if problems:
+            failed = True
+            print(f"{path}: FAILED")
+            for problem in problems:
+                print(f"  {problem}")
+        else:
+            print(f"{path}: OK ({meta['game']}, {meta['num_envs']} envs x {meta['steps']} steps)")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and verify reference game trajectories.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="record reference trajectories")
+    record_parser.add_argument("--games", nargs="+", choices=registry.list_games(), default=registry.list_games())
+    record_parser.add_argument("--out-dir", default="references")
+    record_parser.add_argument("--num-envs", type=int, default=16)
+    record_parser.add_argument("--steps", type=int, default=2000)
+    record_parser.add_argument("--seed", type=int, default=0)
+    record_parser.add_argument("--hold", type=int, default=4, help="number of steps each random action is held")
+    record_parser.add_argument("--render-every", type=int, default=50, help="render every n-th step, 0 disables frames")
+
+    verify_parser = subparsers.add_parser("verify", help="verify the current implementation against references")
+    verify_parser.add_argument("references", nargs="+")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+    else:
+        sys.exit(verify(args))
+
+
+if __name__ == "__main__":
+    main()
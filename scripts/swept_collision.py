@@ -0,0 +1,101 @@
+"""
+Behaviour check of the swept collision test of jaxatari.physics and its use in Seaquest.
+
+A fast box that tunnels through a thin box within one step is missed by the overlap test
+at the start and end positions and must be found by ``physics.swept_overlap``, with the
+time of first contact. Slow or parallel boxes must not be reported.
+
+In Seaquest, at the highest difficulty a shark moves far enough in one frame to pass
+through the player missile between two checks; it must be destroyed and scored. At the
+lowest difficulty the same shark only reaches the missile and is left to the next check.
+
+Usage:
+    python scripts/swept_collision.py
+"""
+import sys
+
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari import physics
+from jaxatari.games import jax_seaquest as seaquest
+
+
+def check_kernel():
+    """Names of the failed kernel checks."""
+    thin_wall = physics.make_boxes(20, 0, 2, 10)
+    box = physics.make_boxes(0, 2, 4, 4)
+    # (name, velocity, expected hit, expected time of first contact)
+    cases = [
+        ("tunnelling through a thin box", (40, 0), True, (20 - 4) / 40),
+        ("moving away from the box", (-40, 0), False, 1.0),
+        ("stopping short of the box", (10, 0), False, 1.0),
+        ("ending in the box", (18, 0), True, (20 - 4) / 18),
+        ("passing below the box", (40, 20), False, 1.0),
+        ("tunnelling diagonally", (40, 1), True, (20 - 4) / 40),
+    ]
+    failures = []
+    for name, velocity, expected_hit, expected_time in cases:
+        end = box.at[:2].add(jnp.asarray(velocity))
+        hit, time = physics.swept_overlap(box, jnp.asarray(velocity, dtype=jnp.float32), thin_wall)
+        if bool(hit) != expected_hit or not np.isclose(float(time), expected_time):
+            failures.append(name)
+        missed_by_overlap = not (physics.overlap(box, thin_wall) or physics.overlap(end, thin_wall))
+        if name.startswith("tunnelling") and not missed_by_overlap:
+            failures.append(f"{name} (found by the overlap test)")
+
+    # a box moving vertically through a thin floor, in a batch with a static box next to it
+    floor = physics.make_boxes(0, 50, 100, 1)
+    boxes = physics.make_boxes(jnp.array([10, 120]), 0, 8, 8)
+    hit, time = physics.swept_overlap(boxes, jnp.array([[0, 100], [0, 0]]), floor)
+    if not (np.array_equal(hit, [True, False]) and np.allclose(time, [(50 - 8) / 100, 1.0])):
+        failures.append("batched vertical tunnelling")
+    return failures
+
+
+def shark_passing_missile(difficulty):
+    """Score and shark positions after the missile check with a shark right of the missile that swims left."""
+    _, state = seaquest.JaxSeaquest().reset()
+    missile = jnp.array([60, 80, 1])
+    # the shark touches the right edge of the missile and is centred on it vertically
+    sharks = jnp.zeros_like(state.shark_positions).at[0].set(jnp.array([60 + seaquest.MISSILE_SIZE[0], 77, -1]))
+    spawn_state = state.spawn_state._replace(difficulty=jnp.asarray(difficulty, dtype=state.spawn_state.difficulty.dtype))
+    _, sharks, _, score, _, _ = seaquest.check_missile_collisions(
+        missile,
+        sharks,
+        state.sub_positions,
+        state.score,
+        state.successful_rescues,
+        spawn_state,
+        state.step_counter,
+        state.rng_key,
+    )
+    return int(score), sharks
+
+
+def check_seaquest():
+    """Names of the failed Seaquest checks."""
+    failures = []
+    speed = int(seaquest.calculate_movement_speed(0, 255))
+    if speed < seaquest.MISSILE_SIZE[0] + seaquest.SHARK_SIZE[0]:
+        failures.append(f"sharks at the highest difficulty only move {speed} pixels per frame")
+    score, sharks = shark_passing_missile(255)
+    if score == 0 or np.any(sharks[0] != 0):
+        failures.append("shark passing through the missile not hit")
+    score, sharks = shark_passing_missile(0)
+    if score != 0 or np.all(sharks[0] == 0):
+        failures.append("slow shark hit before it reaches the missile")
+    return failures
+
+
+def main():
+    failed = False
+    for name, check in (("physics.swept_overlap", check_kernel), ("seaquest missile", check_seaquest)):
+        failures = check()
+        print(f"{name}: {'ok' if not failures else 'FAILED ' + ', '.join(failures)}")
+        failed |= bool(failures)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
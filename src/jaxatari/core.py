@@ -1,32 +1,16 @@
 import json
+import warnings
+
 import jax
 
+from jaxatari import registry, snapshot
 from jaxatari.environment import JaxEnvironment
-from jaxatari.games.jax_pong import JaxPong, PongRenderer
-from jaxatari.games.jax_seaquest import JaxSeaquest, SeaquestRenderer
-from jaxatari.games.jax_kangaroo import JaxKangaroo, KangarooRenderer
-from jaxatari.games.jax_freeway import JaxFreeway, FreewayRenderer
 
 class JAXAtari:
     def __init__(self, game_name):
-        renderer = None
-        match game_name:
-            case "pong":
-                env = JaxPong()
-                renderer = PongRenderer()
-            case "seaquest":
-                env = JaxSeaquest()
-                renderer = SeaquestRenderer()
-            case "kangaroo":
-                env = JaxKangaroo()
-                renderer = KangarooRenderer()
-            case "freeway":
-                env = JaxFreeway()
-                renderer = FreewayRenderer()
-            case _:
-                raise NotImplementedError(f"The game {game_name} does not exist")
-        self.env: JaxEnvironment = env
-        self.renderer = renderer
+        # only the requested game is imported, see jaxatari.registry
+        self.env: JaxEnvironment = registry.make(game_name)
+        self.renderer = registry.make_renderer(game_name)
 
     def reset(self, key=None):
         fn = jax.jit(self.env.reset)
@@ -59,15 +43,30 @@ class JAXAtari:
         fn = jax.jit(self.env.render)
         fn(state)
 
+    def save_state(self, state, path, compress=False, batched=False):
+        """Save a state as a binary snapshot. With batched=True, state is a batch of states (e.g. from a vmapped reset)."""
+        if batched:
+            snapshot.save_states(path, state, compress=compress)
+        else:
+            snapshot.save_state(path, state, compress=compress)
+
+    def load_state(self, path):
+        """Load a state or a batch of states saved with save_state."""
+        _, template = jax.eval_shape(self.env.reset)
+        return snapshot.load_state(path, like=template)
+
     def save_state_as_json(self, state, path):
-        state_dict = state._asdict()
-        for item in state_dict:
-            state_dict[item] = state_dict[item].tolist()
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(state_dict, f, ensure_ascii=False, indent=4)
+        """Deprecated, use save_state. Saves a binary snapshot, not JSON."""
+        warnings.warn("save_state_as_json is deprecated, use save_state", DeprecationWarning, stacklevel=2)
+        self.save_state(state, path)
 
     def load_state_from_json(self, curr_state, path):
+        """Deprecated, use load_state. Also reads the JSON files written by earlier versions."""
+        warnings.warn("load_state_from_json is deprecated, use load_state", DeprecationWarning, stacklevel=2)
+        with open(path, "rb") as f:
+            is_snapshot = f.read(len(snapshot.MAGIC)) == snapshot.MAGIC
+        if is_snapshot:
+            return snapshot.load_state(path, like=curr_state)
         with open(path, "r", encoding="utf-8") as f:
             state = json.load(f)
-        new_state = curr_state.__class__(**state)
-        return new_state
\ No newline at end of file
+        return curr_state.__class__(**state)
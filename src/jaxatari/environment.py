@@ -101,6 +101,17 @@ class JaxEnvironment(Generic[EnvState, EnvObs, EnvInfo]):
         """
         raise NotImplementedError("Abstract method")
 
+    def get_observation(self, state: EnvState) -> EnvObs:
+        """
+        Returns the observation of an environment state, e.g. of a state restored from a snapshot.
+        Args:
+            state: The environment state.
+
+        Returns: observation
+
+        """
+        return self._get_observation(state)
+
     def _get_observation(self, state: EnvState) -> EnvObs:
         """
         Converts the environment state to the observation by filtering out non-relevant information.
@@ -1,12 +1,13 @@
 import os
 from functools import partial
-import pygame
 import chex
 import jax
 import jax.numpy as jnp
+import numpy as np
 from dataclasses import dataclass
 from typing import Tuple, NamedTuple, List, Dict, Optional, Any
 
+from jaxatari import physics
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
 
 @dataclass
@@ -186,22 +187,20 @@ class JaxFreeway(JaxEnvironment[GameState, FreewayObservation, FreewayInfo]):
 
             new_cars = new_cars.at[lane, 0].set(new_x)
 
-        # Check for collisions
-        def check_collision(car_pos):
-            car_x, car_y = car_pos
-            return jnp.logical_and(
-                self.config.chicken_x < car_x + self.config.car_width,
-                jnp.logical_and(
-                    self.config.chicken_x + self.config.chicken_width > car_x,
-                    jnp.logical_and(
-                        state.chicken_y - self.config.chicken_height < car_y,
-                        state.chicken_y > car_y - self.config.car_height,
-                    ),
-                ),
-            )
-
-        # Check collisions for all cars
-        collisions = jax.vmap(check_collision)(new_cars)
+        # Check collisions for all cars (chicken and car y coordinates are bottom edges)
+        chicken_box = physics.make_boxes(
+            self.config.chicken_x,
+            state.chicken_y - self.config.chicken_height,
+            self.config.chicken_width,
+            self.config.chicken_height,
+        )
+        car_boxes = physics.make_boxes(
+            new_cars[:, 0],
+            new_cars[:, 1] - self.config.car_height,
+            self.config.car_width,
+            self.config.car_height,
+        )
+        collisions = physics.overlap(chicken_box, car_boxes)
         any_collision = jnp.any(collisions)
         any_collision = jax.lax.cond(
             state.cooldown > 0, lambda _: False, lambda _: any_collision, operand=None
@@ -301,10 +300,28 @@ import jaxatari.rendering.atraJaxis as aj
 
 class FreewayRenderer(AtraJaxisRenderer):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, viewport=None):
+        super().__init__(viewport)
         self.sprites = self._load_sprites()
         self.game_config = GameConfig()
+        # the background and the fixed 2nd chicken never change, so they are composited once
+        self.background_layer = aj.sample_layer(
+            aj.composite_layer(
+                160,
+                210,
+                [
+                    (0, 0, self.sprites['background'][0]),
+                    (110, self.game_config.bottom_border + self.game_config.chicken_height - 1, self.sprites['player_idle'][0]),
+                ],
+                dtype=np.uint8,
+            ),
+            viewport,
+        )
+        # the chicken sprite is selected by computing its index into the sprite bank (idle, walk, hit)
+        self.chicken_bank = aj.sprite_bank([np.asarray(self.sprites[name][0]) for name in ('player_idle', 'player_walk', 'player_hit')])
+        # the scores are gathered from glyph cells and drawn in a single blit each
+        self.score_glyphs = aj.glyph_strip(self.sprites['score'][0], 8)
+        self.binary_alpha = aj.has_binary_alpha(*self.sprites.values())
 
     def _load_sprites(self):
         """Load all sprites required for Freeway rendering."""
@@ -358,193 +375,85 @@ class FreewayRenderer(AtraJaxisRenderer):
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
         """Render the game state to a raster image."""
-        raster = jnp.zeros((160, 210, 3), dtype=jnp.uint8)
-
-        # draw the background
-        background = aj.get_sprite_frame(self.sprites['background'], 0)
-
-        raster = aj.render_at(raster,0, 0, background)
-
-        # draw fixed 2nd chicken at x=110 and y=self.config.bottom_border + self.config.chicken_height - 1
-        chicken_idle = aj.get_sprite_frame(self.sprites['player_idle'], 0)
-        chicken_walk = aj.get_sprite_frame(self.sprites['player_walk'], 0)
-        chicken_hit = aj.get_sprite_frame(self.sprites['player_hit'], 0)
-        raster = aj.render_at(raster, 110, self.game_config.bottom_border + self.game_config.chicken_height - 1, chicken_idle)
-
-        # select a frame based on the walking frames (0-3 for walk, 4-7 for idle, repeat)
-        use_idle = state.walking_frames < 4
-        chicken = jax.lax.cond(
-            use_idle,
-            lambda: chicken_idle,
-            lambda: chicken_walk,
-        )
+        # start from the cached background layer, which already contains the fixed 2nd chicken
+        # at x=110 and y=self.config.bottom_border + self.config.chicken_height - 1
+        raster = aj.start_frame(self.background_layer, self.viewport)
 
         is_hit = state.cooldown > 0
 
-        chicken = jax.lax.cond(
-            jnp.logical_and(is_hit, jnp.logical_or((state.cooldown % 8) < 4, state.cooldown < 30)), # check if the cooldown is either in the alternating 4 frame window or in the stun phase
-            lambda: chicken_hit,
-            lambda: chicken
+        # select a frame based on the walking frames (0-3 for walk, 4-7 for idle, repeat), the hit
+        # frame is shown if the cooldown is either in the alternating 4 frame window or in the stun phase
+        chicken_idx = aj.select_index(
+            [
+                (jnp.logical_and(is_hit, jnp.logical_or((state.cooldown % 8) < 4, state.cooldown < 30)), 2),
+                (state.walking_frames >= 4, 1),
+            ],
+            default=0,
         )
+        chicken = aj.get_sprite_frame(self.chicken_bank, chicken_idx)
 
-        raster = aj.render_at(raster, self.game_config.chicken_x, state.chicken_y, chicken)
+        raster = aj.render_at(raster, self.game_config.chicken_x, state.chicken_y, chicken, binary_alpha=self.binary_alpha)
 
         # render the cars in the correct color (starting from the top: dark red, light green, dark green, light red, blue, brown, light blue, red, green, yellow)
         dark_red = aj.get_sprite_frame(self.sprites['car_dark_red'], 0)
-        raster = aj.render_at(raster, state.cars[0, 0], state.cars[0, 1], dark_red)
+        raster = aj.render_at(raster, state.cars[0, 0], state.cars[0, 1], dark_red, binary_alpha=self.binary_alpha)
 
         light_green = aj.get_sprite_frame(self.sprites['car_light_green'], 0)
-        raster = aj.render_at(raster, state.cars[1, 0], state.cars[1, 1], light_green)
+        raster = aj.render_at(raster, state.cars[1, 0], state.cars[1, 1], light_green, binary_alpha=self.binary_alpha)
 
         dark_green = aj.get_sprite_frame(self.sprites['car_dark_green'], 0)
-        raster = aj.render_at(raster, state.cars[2, 0], state.cars[2, 1], dark_green)
+        raster = aj.render_at(raster, state.cars[2, 0], state.cars[2, 1], dark_green, binary_alpha=self.binary_alpha)
 
         light_red = aj.get_sprite_frame(self.sprites['car_light_red'], 0)
-        raster = aj.render_at(raster, state.cars[3, 0], state.cars[3, 1], light_red)
+        raster = aj.render_at(raster, state.cars[3, 0], state.cars[3, 1], light_red, binary_alpha=self.binary_alpha)
 
         blue = aj.get_sprite_frame(self.sprites['car_blue'], 0)
-        raster = aj.render_at(raster, state.cars[4, 0], state.cars[4, 1], blue)
+        raster = aj.render_at(raster, state.cars[4, 0], state.cars[4, 1], blue, binary_alpha=self.binary_alpha)
 
         brown = aj.get_sprite_frame(self.sprites['car_brown'], 0)
-        raster = aj.render_at(raster, state.cars[5, 0], state.cars[5, 1], brown)
+        raster = aj.render_at(raster, state.cars[5, 0], state.cars[5, 1], brown, binary_alpha=self.binary_alpha)
 
         light_blue = aj.get_sprite_frame(self.sprites['car_light_blue'], 0)
-        raster = aj.render_at(raster, state.cars[6, 0], state.cars[6, 1], light_blue)
+        raster = aj.render_at(raster, state.cars[6, 0], state.cars[6, 1], light_blue, binary_alpha=self.binary_alpha)
 
         red = aj.get_sprite_frame(self.sprites['car_red'], 0)
-        raster = aj.render_at(raster, state.cars[7, 0], state.cars[7, 1], red)
+        raster = aj.render_at(raster, state.cars[7, 0], state.cars[7, 1], red, binary_alpha=self.binary_alpha)
 
         green = aj.get_sprite_frame(self.sprites['car_green'], 0)
-        raster = aj.render_at(raster, state.cars[8, 0], state.cars[8, 1], green)
+        raster = aj.render_at(raster, state.cars[8, 0], state.cars[8, 1], green, binary_alpha=self.binary_alpha)
 
         yellow = aj.get_sprite_frame(self.sprites['car_yellow'], 0)
-        raster = aj.render_at(raster, state.cars[9, 0], state.cars[9, 1], yellow)
+        raster = aj.render_at(raster, state.cars[9, 0], state.cars[9, 1], yellow, binary_alpha=self.binary_alpha)
 
         # ----------- SCORE -------------
-        # Define score positions and spacing
-        player_score_rightmost_digit_x = 49  # X position for the START of the player's rightmost digit (or single digit)
-        enemy_score_rightmost_digit_x = 114  # X position for the START of the enemy's single '0' digit
+        # The player's score (up to 2 digits) is right aligned so its last digit starts at x=49,
+        # the right player is not playable, so the enemy score is always a single '0' at x=114
         score_y = 5
         score_spacing = 8  # Spacing between digits (should match digit width ideally)
-        max_score_digits = 2
-
-        # Get digit sprites
-        digit_sprites = self.sprites.get('score', None)
-
-        # Define the function to render scores if sprites are available
-        def render_scores(raster_to_update):
-            # --- Player Score (Left) ---
-            # Convert score to digit indices (always 2, e.g., 0 -> [0,0], 10 -> [1,0])
-            player_score_digits_indices = aj.int_to_digits(state.score, max_digits=max_score_digits)
-
-            # Determine parameters based on score magnitude
-            is_player_single_digit = state.score < 10
-
-            # Start index in player_score_digits_indices:
-            # - If single digit (e.g., score=5 -> indices=[0,5]), start reading at index 1 to get the '5'.
-            # - If double digit (e.g., score=12 -> indices=[1,2]), start reading at index 0 to get '1' then '2'.
-            player_start_index = jax.lax.select(is_player_single_digit, 1, 0)
-
-            # Number of digits to render: 1 for single, 2 for double
-            player_num_to_render = jax.lax.select(is_player_single_digit, 1, 2)
-
-            # Calculate the starting X position for rendering:
-            # - If single digit, render starts at player_score_rightmost_digit_x.
-            # - If double digit, render starts score_spacing pixels *before* player_score_rightmost_digit_x,
-            #   so the second digit ('0' in '10') aligns correctly at player_score_rightmost_digit_x.
-            player_render_x = jax.lax.select(is_player_single_digit,
-                                             player_score_rightmost_digit_x,
-                                             player_score_rightmost_digit_x - score_spacing)
-
-            # Render player score using selective rendering
-            raster_updated = aj.render_label_selective(raster_to_update, player_render_x, score_y,
-                                                       player_score_digits_indices, digit_sprites[0],
-                                                       player_start_index, player_num_to_render,
-                                                       spacing=score_spacing)
-
-            # --- Enemy Score (Right - rendering a Dummy '0' since the right player is not playable) ---
-            enemy_score = 0
-            enemy_score_digits_indices = aj.int_to_digits(enemy_score, max_digits=max_score_digits)  # [0, 0]
-            # Parameters for single digit '0'
-            enemy_start_index = 1  # Read the second '0' from indices [0, 0]
-            enemy_num_to_render = 1  # Render only one digit
-            # Render the enemy '0' starting at its designated rightmost position
-            enemy_render_x = enemy_score_rightmost_digit_x
-
-            # Render enemy score using selective rendering
-            raster_final = aj.render_label_selective(raster_updated, enemy_render_x, score_y,
-                                                     enemy_score_digits_indices, digit_sprites[0],
-                                                     enemy_start_index, enemy_num_to_render,
-                                                     spacing=score_spacing)  # Spacing doesn't matter here
-            return raster_final
-
-        # Render scores conditionally
-        raster = jax.lax.cond(
-            digit_sprites is not None,
-            render_scores,
-            lambda r: r,
-            raster
-        )
+        raster = aj.render_number(raster, 49 - score_spacing, score_y, state.score, self.score_glyphs,
+                                  max_digits=2, align="right", leading_zeros=False, binary_alpha=self.binary_alpha)
+        raster = aj.render_number(raster, 114, score_y, 0, self.score_glyphs, max_digits=1, binary_alpha=self.binary_alpha)
 
         # Force the first 8 columns (x=0 to x=7) to be black (KEEP THIS PART)
         bar_width = 8
-        raster = raster.at[0:bar_width, :, :].set(0)
+        raster = aj.fill_rect(raster, 0, 0, bar_width, 210, 0)
 
-        return raster
+        return aj.finish_frame(raster)
 
 def main():
-    pygame.init()
-
-    # Initialize game and renderer
-    game = JaxFreeway()
-    renderer = FreewayRenderer()
-    scaling = 4
-
-    screen = pygame.display.set_mode((160 * scaling, 210 * scaling))
-    pygame.display.set_caption("Freeway")
-
-    jitted_step = jax.jit(game.step)
-    jitted_render = jax.jit(renderer.render)
-    jitted_reset = jax.jit(game.reset)
-
-    init_obs, state = jitted_reset()
+    import pygame
 
-    # Setup game loop
-    clock = pygame.time.Clock()
-    running = True
-    done = False
+    from jaxatari import interactive
 
-    while running and not done:
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        # Handle input
+    def get_action():
         keys = pygame.key.get_pressed()
         if keys[pygame.K_w]:
-            action = Action.UP
+            return Action.UP
         elif keys[pygame.K_s]:
-            action = Action.DOWN
-        else:
-            action = Action.NOOP
-
-        # Update game state
-        obs, state, reward, done, info = (jitted_step(state, action))
-
-        # Render
-        frame = jitted_render(state)
-
-        aj.update_pygame(screen, frame, scaling, 160, 210)
-
-        # Cap at 60 FPS
-        clock.tick(30)
-
-    # If game over, wait before closing
-    if done:
-        pygame.time.wait(2000)
+            return Action.DOWN
+        return Action.NOOP
 
-    pygame.quit()
+    interactive.run(JaxFreeway(), FreewayRenderer(), get_action, fps=60, scale=4, caption="Freeway", quit_when_done=True)
 
 if __name__ == "__main__":
     main()
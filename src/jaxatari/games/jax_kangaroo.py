@@ -1,14 +1,17 @@
 import os
 from functools import partial
-from typing import NamedTuple, Tuple, Dict, Any, Optional
+from typing import TYPE_CHECKING, NamedTuple, Tuple, Dict, Any, Optional
 import jax
 import jax.numpy as jnp
+import numpy as np
 import chex
-import pygame
 from jax import Array
-from gymnax.environments import spaces
+from jaxatari import physics
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
 
+if TYPE_CHECKING:
+    from gymnax.environments import spaces
+
 from jaxatari.games.kangaroo_levels import (
     LevelConstants,
     Kangaroo_Level_1,
@@ -189,9 +192,9 @@ class KangarooInfo(NamedTuple):
     all_rewards: chex.Array
 
 # Level Constants
-LADDER_HEIGHT = jnp.array(35)
-LADDER_WIDTH = jnp.array(8)
-P_HEIGHT = jnp.array(4)
+LADDER_HEIGHT = 35
+LADDER_WIDTH = 8
+P_HEIGHT = 4
 
 LEVEL_1 = Kangaroo_Level_1
 LEVEL_2 = Kangaroo_Level_2
@@ -200,6 +203,8 @@ LEVEL_3 = Kangaroo_Level_3
 
 # -------- Keyboard Inputs --------
 def get_human_action() -> chex.Array:
+    import pygame
+
     keys = pygame.key.get_pressed()
     up = keys[pygame.K_w] or keys[pygame.K_UP]
     down = keys[pygame.K_s] or keys[pygame.K_DOWN]
@@ -325,22 +330,11 @@ def entities_collide_with_threshold(
     threshold: chex.Array,
 ) -> chex.Array:
     """Returns True if rectangles overlap by at least threshold fraction. This only Checks for overlap in the x dimension."""
-    overlap_start_x = jnp.maximum(e1_x, e2_x)
-    overlap_end_x = jnp.minimum(e1_x + e1_w, e2_x + e2_w)
-    overlap_start_y = jnp.maximum(e1_y, e2_y)
-    overlap_end_y = jnp.minimum(e1_y + e1_h, e2_y + e2_h)
-
-    # Calculate dimensions of overlap region
-    overlap_width = overlap_end_x - overlap_start_x
-    overlap_height = overlap_end_y - overlap_start_y
-
-    # Calculate minimum required overlap area based on threshold
-    min_required_overlap = e1_w * threshold
-
-    # Check if overlap exceeds required threshold
-    meets_threshold = overlap_width >= min_required_overlap
-
-    return jnp.where((overlap_width < 0) | (overlap_height < 0), False, meets_threshold)
+    return physics.overlaps_by(
+        physics.make_boxes(e1_x, e1_y, e1_w, e1_h),
+        physics.make_boxes(e2_x, e2_y, e2_w, e2_h),
+        threshold,
+    )
 
 
 @partial(jax.jit, static_argnums=())
@@ -1705,13 +1699,17 @@ class JaxKangaroo(JaxEnvironment[KangarooState, KangarooObservation, KangarooInf
         obs_flat= jnp.concatenate([jnp.ravel(leaf) for leaf in obs_leaves])
         return obs_flat
 
-    def action_space(self) -> spaces.Discrete:
+    def action_space(self) -> "spaces.Discrete":
+        from gymnax.environments import spaces
+
         return spaces.Discrete(len(self.action_set))
 
     def get_action_space(self) -> jnp.ndarray:
         return jnp.array(self.action_set)
 
-    def observation_space(self) -> spaces.Box:
+    def observation_space(self) -> "spaces.Box":
+        from gymnax.environments import spaces
+
         return spaces.Box(
             low=0,
             high=255,
@@ -2071,20 +2069,50 @@ class KangarooRenderer(AtraJaxisRenderer):
     # Type hint for sprites dictionary
     sprites: Dict[str, Any]
 
-    def __init__(self):
+    # sprites chosen by an animation state are stacked into sprite banks in this order
+    PLAYER_SPRITES = ('kangaroo', 'kangaroo_walk', 'kangaroo_jump', 'kangaroo_jump_high',
+                      'kangaroo_ducking', 'kangaroo_climb', 'kangaroo_boxing', 'kangaroo_dead')
+    MONKEY_SPRITES = ('ape_standing', 'ape_climb_left', 'ape_moving', 'throwing_ape', 'ape_climb_right')
+    # monkey sprite per monkey state:
+    # 0: non-existent, 1: moving down, 2: moving left, 3: throwing, 4: moving right, 5: moving up
+    MONKEY_STATE_SPRITES = np.array([0, 1, 2, 3, 2, 4])
+    BELL_SPRITES = ('bell', 'ringing_bell')
+    CHILD_SPRITES = ('child', 'child_jump')
+
+    def __init__(self, viewport: Optional[aj.Viewport] = None):
         """
         Initializes the renderer by loading sprites, including level backgrounds.
 
         Args:
-            sprite_path: Path to the directory containing sprite .npy files.
+            viewport: Viewport to render reduced resolution, cropped or grayscale frames, None for the full screen.
         """
+        super().__init__(viewport)
         self.sprite_path = f"{os.path.dirname(os.path.abspath(__file__))}/sprites/kangaroo"
         self.sprites = self._load_sprites()
         # Store background sprites directly for use in render function
         self.background_0 = self.sprites.get('background_0')
         self.background_1 = self.sprites.get('background_1')
         self.background_2 = self.sprites.get('background_2')
-
+        # the level backgrounds are static, so they are composited once per level (levels 1-3)
+        # instead of blended every frame
+        self.background_layers = np.stack([
+            aj.sample_layer(aj.composite_layer(SCREEN_WIDTH, SCREEN_HEIGHT, [(0, 0, background[0])], dtype=np.uint8), viewport)
+            for background in (self.background_0, self.background_1, self.background_2)
+        ])
+        # the sprite of an entity is selected by computing its index into its sprite bank
+        self.player_bank = self._sprite_bank(self.PLAYER_SPRITES)
+        self.monkey_bank = self._sprite_bank(self.MONKEY_SPRITES)
+        self.bell_bank = self._sprite_bank(self.BELL_SPRITES)
+        self.child_bank = self._sprite_bank(self.CHILD_SPRITES)
+        # the score and the timer are gathered from glyph cells and drawn in a single blit each
+        self.score_glyphs = aj.glyph_strip(self.sprites['digits'][0], 8)
+        self.timer_glyphs = aj.glyph_strip(self.sprites['time_digits'][0], 4)
+        self.binary_alpha = aj.has_binary_alpha(*self.sprites.values())
+
+
+    def _sprite_bank(self, names) -> np.ndarray:
+        """Stacks the (single frame) sprites of the given names into a padded sprite bank."""
+        return aj.sprite_bank([np.asarray(self.sprites[name][0]) for name in names])
 
     def _load_sprites(self) -> dict[str, Any]:
         """Loads all necessary sprites from .npy files."""
@@ -2094,8 +2122,8 @@ class KangarooRenderer(AtraJaxisRenderer):
         def _load_sprite_frame(name: str) -> Optional[chex.Array]:
             path = os.path.join(self.sprite_path, f'{name}.npy')
             frame = aj.loadFrame(path)
-            if isinstance(frame, jnp.ndarray) and frame.ndim >= 2:
-                return frame.astype(jnp.uint8)
+            if frame.ndim >= 2:
+                return frame.astype(np.uint8)
 
 
         # --- Load Sprites ---
@@ -2174,30 +2202,20 @@ class KangarooRenderer(AtraJaxisRenderer):
         Returns:
             A JAX array representing the rendered game screen (HEIGHT, WIDTH, 3), dtype=uint8.
         """
+        # --- Start from the cached Background Layer of the level ---
+        raster = aj.start_frame(jnp.asarray(self.background_layers)[self._background_index(state)], self.viewport)
+        return aj.finish_frame(self._draw(raster, state))
 
-        # --- Select and Render Background ---
-        # Initialize raster (optional, could directly use background if it covers all)
-        # Starting with zeros allows transparency in dynamic sprites if they use it.
-        raster = jnp.zeros((SCREEN_WIDTH, SCREEN_HEIGHT, 3), dtype=jnp.uint8)
-
-        # Get the current level index (ensure it's integer and within bounds 0-2)
+    def _background_index(self, state: KangarooState) -> chex.Array:
+        """Index of the cached background layer of the current level."""
+        # Get the current level index (ensure it's integer and within bounds 1-3)
         level_idx = state.current_level.astype(int)
         # Clamp index to be safe, although state should ideally be valid
         level_idx = jnp.clip(level_idx, 1, 3)
+        return level_idx - 1
 
-        selected_background = jax.lax.switch(
-            level_idx,
-            [
-                lambda: jnp.zeros(self.background_0.shape, dtype=self.background_0.dtype),  # Level 0 (empty)
-                lambda: self.background_0,  # Level 1
-                lambda: self.background_1,  # Level 2
-                lambda: self.background_2,  # Level 3
-            ]
-        )
-        selected_background = aj.get_sprite_frame(selected_background, 0)
-
-        raster = aj.render_at(raster, 0, 0, selected_background)
-
+    def _draw(self, raster: chex.Array, state: KangarooState) -> chex.Array:
+        """Draws the sprites and the UI of the current game state onto the background."""
         # --- Removed Wall Rendering ---
         # --- Removed Platform Rendering Loop ---
         # --- Removed Ladder Rendering Loop ---
@@ -2210,9 +2228,7 @@ class KangarooRenderer(AtraJaxisRenderer):
         def _draw_fruit(i, current_raster):
             should_draw = jnp.logical_and(fruit_actives[i], fruit_sprite is not None)
             pos = fruit_positions[i]
-            def render_fruit_sprite(raster_to_update):
-                return aj.render_at(raster_to_update, pos[0].astype(int), pos[1].astype(int), aj.get_sprite_frame(fruit_sprite, 0))
-            return jax.lax.cond(should_draw, render_fruit_sprite, lambda r: r, current_raster)
+            return aj.render_at(current_raster, pos[0].astype(int), pos[1].astype(int), aj.get_sprite_frame(fruit_sprite, 0), visible=should_draw, binary_alpha=self.binary_alpha)
 
         num_fruits_to_draw = fruit_positions.shape[0]
         raster = jax.lax.fori_loop(0, num_fruits_to_draw, _draw_fruit, raster)
@@ -2229,21 +2245,15 @@ class KangarooRenderer(AtraJaxisRenderer):
             jnp.logical_and(state.level.bell_animation <= 47, state.level.bell_animation >= 32)
         )
 
-        bell_sprite = jax.lax.cond(
-            jnp.logical_or(bell_in_range_left, bell_in_range_right),
-            lambda: self.sprites.get('ringing_bell'),
-            lambda: self.sprites.get('bell')
-        )
+        bell_ringing = jnp.logical_or(bell_in_range_left, bell_in_range_right)
+        bell_sprite = aj.get_sprite_frame(self.bell_bank, bell_ringing.astype(jnp.int32))
 
         bell_pos = state.level.bell_position
         not_all_fruits_collected = ~jnp.any(state.level.fruit_stages == 3)
         bell_pos_valid = bell_pos[0] != -1
-        sprite_is_valid = bell_sprite is not None
-        should_draw_bell = jnp.logical_and(jnp.logical_and(not_all_fruits_collected, bell_pos_valid), sprite_is_valid)
+        should_draw_bell = jnp.logical_and(not_all_fruits_collected, bell_pos_valid)
 
-        def draw_bell_func(current_raster):
-            return aj.render_at(current_raster, bell_pos[0].astype(int), bell_pos[1].astype(int), aj.get_sprite_frame(bell_sprite, 0), flip_horizontal=bell_in_range_left)
-        raster = jax.lax.cond(should_draw_bell, draw_bell_func, lambda r: r, raster)
+        raster = aj.render_at(raster, bell_pos[0].astype(int), bell_pos[1].astype(int), bell_sprite, flip_horizontal=bell_in_range_left, visible=should_draw_bell, binary_alpha=self.binary_alpha)
 
         # --- Draw monkeys (Apes) ---
         monkey_positions = state.level.monkey_positions
@@ -2253,43 +2263,21 @@ class KangarooRenderer(AtraJaxisRenderer):
             state_idx = monkey_states[i].astype(int)
             pos = monkey_positions[i]
             should_draw = state_idx != 0
-            """
-            - 0: non-existent
-            - 1: moving down
-            - 2: moving left
-            - 3: throwing
-            - 4: moving right
-            - 5: moving up
-            """
-            monkey_sprite = jax.lax.switch(
-                state_idx,
-                [
-                    lambda: self.sprites.get('ape_standing'), # Case 0
-                    lambda: self.sprites.get('ape_climb_left'),    # Case 1
-                    lambda: self.sprites.get('ape_moving'),    # Case 2
-                    lambda: self.sprites.get('throwing_ape'),  # Case 3
-                    lambda: self.sprites.get('ape_moving'),    # Case 4
-                    lambda: self.sprites.get('ape_climb_right'),# Case 5
-                ]
-            )
+            monkey_sprite_idx = jnp.asarray(self.MONKEY_STATE_SPRITES)[state_idx]
 
             # in case its state_idx 2 or 4 and the counter is % 16, use standing instead of moving
-            monkey_sprite = jax.lax.cond(
+            monkey_sprite_idx = jnp.where(
                 jnp.logical_and(
                     (state.level.step_counter % 32) < 16,
                     jnp.logical_or(state_idx == 2, state_idx == 4)
                 ),
-                lambda: self.sprites.get('ape_standing'),
-                lambda: monkey_sprite
+                self.MONKEY_SPRITES.index('ape_standing'),
+                monkey_sprite_idx
             )
 
             is_moving_left = (state_idx == 4)
             flip_h = is_moving_left
-            sprite_is_valid = monkey_sprite is not None
-            should_draw = jnp.logical_and(should_draw, sprite_is_valid)
-            def render_monkey_sprite(raster_to_update):
-                return aj.render_at(raster_to_update, pos[0].astype(int), pos[1].astype(int), aj.get_sprite_frame(monkey_sprite, 0), flip_horizontal=flip_h)
-            return jax.lax.cond(should_draw, render_monkey_sprite, lambda r: r, current_raster)
+            return aj.render_at(current_raster, pos[0].astype(int), pos[1].astype(int), aj.get_sprite_frame(self.monkey_bank, monkey_sprite_idx), flip_horizontal=flip_h, visible=should_draw, binary_alpha=self.binary_alpha)
 
         num_monkeys_to_draw = monkey_positions.shape[0]
         raster = jax.lax.fori_loop(0, num_monkeys_to_draw, _draw_monkey, raster)
@@ -2299,24 +2287,6 @@ class KangarooRenderer(AtraJaxisRenderer):
         player_pos_y = state.player.y
         player_orientation = state.player.orientation
         flip_player = player_orientation < 0
-        sprite_lambda = jax.lax.cond(
-            state.player.is_crashing, lambda: self.sprites.get('kangaroo_dead'),
-            lambda: jax.lax.cond(
-                state.player.is_climbing, lambda: self.sprites.get('kangaroo_climb'),
-                lambda: jax.lax.cond(
-                    state.player.is_crouching, lambda: self.sprites.get('kangaroo_ducking'),
-                    lambda: jax.lax.cond(
-                        state.player.is_jumping, lambda: self.sprites.get('kangaroo_jump'),
-                        lambda: jax.lax.cond(
-                            state.player.punch_left | state.player.punch_right,
-                            lambda: self.sprites.get('kangaroo_boxing'),
-                            lambda: self.sprites.get('kangaroo')
-                        )
-                    )
-                )
-            )
-        )
-
         # check if player.walk_animation is between 6 and 16 in which range the kangaroo has a different animation
         player_walking_animation = jnp.logical_and(state.player.walk_animation > 6, state.player.walk_animation < 16)
 
@@ -2327,46 +2297,38 @@ class KangarooRenderer(AtraJaxisRenderer):
             player_pos_y
         )
 
-        sprite_lambda = jax.lax.cond(
-            player_walking_animation,
-            lambda: self.sprites.get('kangaroo_walk'),
-            lambda: sprite_lambda
-        )
-
-        # in case the player_animation is between 17 and 25, use high jump
-        sprite_lambda = jax.lax.cond(
-            jnp.logical_and(state.player.jump_counter > 16, state.player.jump_counter < 25),
-            lambda: self.sprites.get('kangaroo_jump_high'),
-            lambda: sprite_lambda
+        # the first matching animation state selects the sprite
+        player_sprite = self.PLAYER_SPRITES.index
+        player_sprite_idx = aj.select_index(
+            [
+                # in case the player_animation is between 17 and 25, use high jump
+                (jnp.logical_and(state.player.jump_counter > 16, state.player.jump_counter < 25), player_sprite('kangaroo_jump_high')),
+                (player_walking_animation, player_sprite('kangaroo_walk')),
+                (state.player.is_crashing, player_sprite('kangaroo_dead')),
+                (state.player.is_climbing, player_sprite('kangaroo_climb')),
+                (state.player.is_crouching, player_sprite('kangaroo_ducking')),
+                (state.player.is_jumping, player_sprite('kangaroo_jump')),
+                (state.player.punch_left | state.player.punch_right, player_sprite('kangaroo_boxing')),
+            ],
+            default=player_sprite('kangaroo'),
         )
 
-        player_sprite = sprite_lambda
-        sprite_is_valid = player_sprite is not None
-        def render_player_sprite(raster_to_update):
-             return aj.render_at(raster_to_update, player_pos_x.astype(int), player_pos_y.astype(int), aj.get_sprite_frame(player_sprite, 0), flip_horizontal=flip_player)
-        raster = jax.lax.cond(sprite_is_valid, render_player_sprite, lambda r: r, raster)
+        raster = aj.render_at(raster, player_pos_x.astype(int), player_pos_y.astype(int), aj.get_sprite_frame(self.player_bank, player_sprite_idx), flip_horizontal=flip_player, binary_alpha=self.binary_alpha)
 
         # --- Draw Child ---
         child_pos = state.level.child_position
         is_jumping = (state.level.step_counter % 32) < 16
         # if the velocity is negative, flip horizontal
         child_flip = state.level.child_velocity > 0
-        child_sprite_lambda = jax.lax.cond(
-            is_jumping, lambda: self.sprites.get('child_jump'), lambda: self.sprites.get('child')
-        )
-        child_sprite = child_sprite_lambda
-        should_draw_child = jnp.logical_and(child_pos[0] != -1, child_sprite is not None)
-        def draw_child_func(current_raster):
-            return aj.render_at(current_raster, child_pos[0].astype(int), child_pos[1].astype(int), aj.get_sprite_frame(child_sprite, 0), child_flip)
-        raster = jax.lax.cond(should_draw_child, draw_child_func, lambda r: r, raster)
+        child_sprite = aj.get_sprite_frame(self.child_bank, is_jumping.astype(jnp.int32))
+        should_draw_child = child_pos[0] != -1
+        raster = aj.render_at(raster, child_pos[0].astype(int), child_pos[1].astype(int), child_sprite, child_flip, visible=should_draw_child, binary_alpha=self.binary_alpha)
 
         # --- Draw falling coconut ---
         falling_coco_pos = state.level.falling_coco_position
         coco_sprite = self.sprites.get('thrown_coconut', None)
         should_draw_falling_coco = jnp.logical_and(falling_coco_pos[1] != -1, coco_sprite is not None)
-        def draw_falling_coco_func(current_raster):
-            return aj.render_at(current_raster, falling_coco_pos[0].astype(int), falling_coco_pos[1].astype(int), aj.get_sprite_frame(coco_sprite, 0))
-        raster = jax.lax.cond(should_draw_falling_coco, draw_falling_coco_func, lambda r: r, raster)
+        raster = aj.render_at(raster, falling_coco_pos[0].astype(int), falling_coco_pos[1].astype(int), aj.get_sprite_frame(coco_sprite, 0), visible=should_draw_falling_coco, binary_alpha=self.binary_alpha)
 
         # --- Draw thrown coconuts ---
         coco_positions = state.level.coco_positions
@@ -2375,77 +2337,28 @@ class KangarooRenderer(AtraJaxisRenderer):
         def _draw_coco(i, current_raster):
             should_draw = jnp.logical_and(coco_states[i] != 0, coco_sprite is not None)
             pos = coco_positions[i]
-            def render_coco_sprite(raster_to_update):
-                return aj.render_at(raster_to_update, pos[0].astype(int), pos[1].astype(int), aj.get_sprite_frame(coco_sprite, 0))
-            return jax.lax.cond(should_draw, render_coco_sprite, lambda r: r, current_raster)
+            return aj.render_at(current_raster, pos[0].astype(int), pos[1].astype(int), aj.get_sprite_frame(coco_sprite, 0), visible=should_draw, binary_alpha=self.binary_alpha)
         num_cocos_to_draw = coco_positions.shape[0]
         raster = jax.lax.fori_loop(0, num_cocos_to_draw, _draw_coco, raster)
 
         # --- Draw UI ---
         # Score
-        digit_sprites = self.sprites.get('digits', None)
-        score_digits_indices = aj.int_to_digits(state.score, max_digits=6)
-        raster = aj.render_label(raster, 105, 182, score_digits_indices, digit_sprites[0], spacing=8)
+        raster = aj.render_number(raster, 105, 182, state.score, self.score_glyphs, max_digits=6, binary_alpha=self.binary_alpha)
 
         # Lives
         life_sprite = self.sprites.get('kangaroo_lives', None)
         lives_count = jnp.maximum(state.lives.astype(int) - 1, 0)
-        raster = aj.render_indicator(raster, 15, 182, lives_count, life_sprite[0], spacing=8)
+        raster = aj.render_indicator(raster, 15, 182, lives_count, life_sprite[0], spacing=8, binary_alpha=self.binary_alpha)
 
         # Timer
-        time_digit_sprites = self.sprites.get('time_digits', None)
         timer_val = jnp.maximum(state.level.timer.astype(int), 0)
-        timer_digits_indices = aj.int_to_digits(timer_val, max_digits=4)
-        raster = aj.render_label(raster, 80, 190, timer_digits_indices, time_digit_sprites[0], spacing=4)
+        raster = aj.render_number(raster, 80, 190, timer_val, self.timer_glyphs, max_digits=4, binary_alpha=self.binary_alpha)
 
-        # Ensure the final raster has the correct dtype
-        return raster.astype(jnp.uint8)
+        # the raster keeps the dtype of the background layers (uint8)
+        return raster
 
 if __name__ == "__main__":
-    pygame.init()
-    game = JaxKangaroo()
+    from jaxatari import interactive
 
-    scaling = 4
-
-    screen = pygame.display.set_mode((SCREEN_WIDTH * scaling, SCREEN_HEIGHT * scaling))
-    pygame.display.set_caption("Kangaroo")
-    clock = pygame.time.Clock()
-
-    renderer = KangarooRenderer()
-    jitted_step = jax.jit(game.step)
-    jitted_reset = jax.jit(game.reset)
-    (_, curr_state) = jitted_reset()
-    running = True
-    frame_by_frame = False
-    frameskip = game.frameskip
-    counter = 1
-
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_f:
-                    frame_by_frame = not frame_by_frame
-            elif event.type == pygame.KEYDOWN or (
-                event.type == pygame.KEYUP and event.key == pygame.K_n
-            ):
-                if event.key == pygame.K_n and frame_by_frame:
-                    if counter % frameskip == 0:
-                        action = get_human_action()
-                        (_, curr_state, _, _, _) = jitted_step(curr_state, action)
-
-        if not frame_by_frame:
-            if counter % frameskip == 0:
-                action = get_human_action()
-                (_, curr_state, _, _, _) = jitted_step(curr_state, action)
-
-        # Render and display
-        raster = renderer.render(curr_state)
-
-        aj.update_pygame(screen, raster, scaling, SCREEN_WIDTH, SCREEN_HEIGHT)
-
-        counter += 1
-        pygame.time.Clock().tick(60)
-
-    pygame.quit()
\ No newline at end of file
+    game = JaxKangaroo()
+    interactive.run(game, KangarooRenderer(), get_human_action, fps=60, frameskip=game.frameskip, scale=4, caption="Kangaroo")
@@ -1,19 +1,22 @@
 import os
 from functools import partial
-from typing import NamedTuple, Tuple
+from typing import TYPE_CHECKING, NamedTuple, Tuple
 import jax.lax
 import jax.numpy as jnp
 import chex
-import pygame
-from gymnax.environments import spaces
+import numpy as np
 
 from jaxatari.renderers import AtraJaxisRenderer
 from jaxatari.rendering import atraJaxis as aj
+from jaxatari import physics
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
 
+if TYPE_CHECKING:
+    from gymnax.environments import spaces
+
 # Constants for game environment
 MAX_SPEED = 12
-BALL_SPEED = jnp.array([-1, 1])  # Ball speed in x and y direction
+BALL_SPEED = np.array([-1, 1])  # Ball speed in x and y direction
 ENEMY_STEP_SIZE = 2
 WIDTH = 160
 HEIGHT = 210
@@ -25,10 +28,10 @@ BALL_MAX_SPEED = 4  # Maximum ball speed cap
 # constants for paddle speed influence
 MIN_BALL_SPEED = 1
 
-PLAYER_ACCELERATION = jnp.array([6, 3, 1, -1, 1, -1, 0, 0, 1, 0, -1, 0, 1])
+PLAYER_ACCELERATION = np.array([6, 3, 1, -1, 1, -1, 0, 0, 1, 0, -1, 0, 1])
 
-BALL_START_X = jnp.array(78)
-BALL_START_Y = jnp.array(115)
+BALL_START_X = np.array(78)
+BALL_START_Y = np.array(115)
 
 # Background color and object colors
 BACKGROUND_COLOR = 144, 72, 17
@@ -81,6 +84,8 @@ def get_human_action() -> chex.Array:
     Returns:
         action: int, action taken by the player (LEFT, RIGHT, FIRE, LEFTFIRE, RIGHTFIRE, NOOP).
     """
+    import pygame
+
     keys = pygame.key.get_pressed()
     if keys[pygame.K_a] and keys[pygame.K_SPACE]:
         return jnp.array(Action.LEFTFIRE)
@@ -141,7 +146,7 @@ def player_step(
     down = jnp.logical_or(action == Action.RIGHT, action == Action.RIGHTFIRE)
 
     # get the current acceleration
-    acceleration = PLAYER_ACCELERATION[acceleration_counter]
+    acceleration = jnp.asarray(PLAYER_ACCELERATION)[acceleration_counter]
 
     # perform the deceleration checks first, since in the base game
     # on a direction switch the player is first decelerated and then accelerated in the new direction
@@ -151,63 +156,35 @@ def player_step(
         state_player_y + PLAYER_SIZE[1] > WALL_BOTTOM_Y,
     )
 
-    player_speed = state_player_speed
+    moving = jnp.logical_or(up, down)
 
     # if no button was clicked OR the paddle touched a wall and there is a speed, apply deceleration (halfing the speed every tick)
-    player_speed = jax.lax.cond(
-        jnp.logical_or(jnp.logical_not(jnp.logical_or(up, down)), touches_wall),
-        lambda s: jnp.round(s / 2).astype(jnp.int32),
-        lambda s: s,
-        operand=player_speed,
+    player_speed = jnp.where(
+        jnp.logical_or(jnp.logical_not(moving), touches_wall),
+        jnp.round(state_player_speed / 2).astype(jnp.int32),
+        state_player_speed,
     )
 
-    direction_change_up = jnp.logical_and(up, state_player_speed > 0)
     # also apply deceleration if the direction is changed
-    player_speed = jax.lax.cond(
-        direction_change_up,
-        lambda s: 0,
-        lambda s: s,
-        operand=player_speed,
-    )
+    direction_change_up = jnp.logical_and(up, state_player_speed > 0)
     direction_change_down = jnp.logical_and(down, state_player_speed < 0)
-
-    player_speed = jax.lax.cond(
-        direction_change_down,
-        lambda s: 0,
-        lambda s: s,
-        operand=player_speed,
-    )
+    direction_change = jnp.logical_or(direction_change_up, direction_change_down)
+    player_speed = jnp.where(direction_change, 0, player_speed)
 
     # reset the acceleration counter on a direction change
-    direction_change = jnp.logical_or(direction_change_up, direction_change_down)
-    acceleration_counter = jax.lax.cond(
-        direction_change,
-        lambda _: 0,
-        lambda s: s,
-        operand=acceleration_counter,
-    )
+    acceleration_counter = jnp.where(direction_change, 0, acceleration_counter)
 
     # add the current acceleration to the speed (positive if up, negative if down)
-    player_speed = jax.lax.cond(
-        up,
-        lambda s: jnp.maximum(s - acceleration, -MAX_SPEED),
-        lambda s: s,
-        operand=player_speed,
+    player_speed = jnp.where(
+        up, jnp.maximum(player_speed - acceleration, -MAX_SPEED), player_speed
     )
-
-    player_speed = jax.lax.cond(
-        down,
-        lambda s: jnp.minimum(s + acceleration, MAX_SPEED),
-        lambda s: s,
-        operand=player_speed,
+    player_speed = jnp.where(
+        down, jnp.minimum(player_speed + acceleration, MAX_SPEED), player_speed
     )
 
-    # reset or increment the acceleration counter here
-    new_acceleration_counter = jax.lax.cond(
-        jnp.logical_or(up, down),  # If moving in either direction
-        lambda s: jnp.minimum(s + 1, 15),  # Increment counter
-        lambda s: 0,  # Reset if no movement
-        operand=acceleration_counter,
+    # increment the acceleration counter while moving in either direction, reset it otherwise
+    new_acceleration_counter = jnp.where(
+        moving, jnp.minimum(acceleration_counter + 1, 15), 0
     )
 
     # calculate the new player position
@@ -234,32 +211,19 @@ def ball_step(
     # calculate bounces on top and bottom walls
     ball_vel_y = jnp.where(wall_bounce, -state.ball_vel_y, state.ball_vel_y)
 
-    # Calculate paddle hits
-    player_paddle_hit = jnp.logical_and(
-        jnp.logical_and(PLAYER_X <= ball_x, ball_x <= PLAYER_X + PLAYER_SIZE[0]),
-        state.ball_vel_x > 0,
+    # Calculate paddle hits: the ball position is tested as a point against the hit zone
+    # of each paddle, which extends by one ball height above and below the paddle
+    paddle_zones = physics.make_boxes(
+        jnp.array([PLAYER_X, ENEMY_X]),
+        jnp.stack([state.player_y, state.enemy_y]) - BALL_SIZE[1],
+        jnp.array([PLAYER_SIZE[0], ENEMY_SIZE[0] - 1]),
+        jnp.array([PLAYER_SIZE[1], ENEMY_SIZE[1]]) + 2 * BALL_SIZE[1],
     )
-
-    player_paddle_hit = jnp.logical_and(
-        player_paddle_hit,
-        jnp.logical_and(
-            state.player_y - BALL_SIZE[1] <= ball_y,
-            ball_y <= state.player_y + PLAYER_SIZE[1] + BALL_SIZE[1],
-        ),
-    )
-
-    enemy_paddle_hit = jnp.logical_and(
-        jnp.logical_and(ENEMY_X <= ball_x, ball_x <= ENEMY_X + ENEMY_SIZE[0] - 1),
-        state.ball_vel_x < 0,
-    )
-
-    enemy_paddle_hit = jnp.logical_and(
-        enemy_paddle_hit,
-        jnp.logical_and(
-            state.enemy_y - BALL_SIZE[1] <= ball_y,
-            ball_y <= state.enemy_y + ENEMY_SIZE[1] + BALL_SIZE[1],
-        ),
+    zone_hits = physics.overlap(
+        physics.make_boxes(ball_x, ball_y, 0, 0), paddle_zones, inclusive=True
     )
+    player_paddle_hit = jnp.logical_and(zone_hits[0], state.ball_vel_x > 0)
+    enemy_paddle_hit = jnp.logical_and(zone_hits[1], state.ball_vel_x < 0)
 
     paddle_hit = jnp.logical_or(player_paddle_hit, enemy_paddle_hit)
 
@@ -364,9 +328,7 @@ def enemy_step(state, step_counter, ball_y, ball_speed_y):
     # Calculate new position
     new_y = state.enemy_y + (direction * ENEMY_STEP_SIZE).astype(jnp.int32)
     # Return either new position or current position based on should_move
-    return jax.lax.cond(
-        should_move, lambda _: new_y, lambda _: state.enemy_y, operand=None
-    )
+    return jnp.where(should_move, new_y, state.enemy_y)
 
 @jax.jit
 def _reset_ball_after_goal(
@@ -394,8 +356,8 @@ def _reset_ball_after_goal(
     ).astype(jnp.int32)
 
     return (
-        BALL_START_X.astype(jnp.int32),
-        BALL_START_Y.astype(jnp.int32),
+        jnp.array(BALL_START_X, dtype=jnp.int32),
+        jnp.array(BALL_START_Y, dtype=jnp.int32),
         ball_vel_x.astype(jnp.int32),
         ball_vel_y.astype(jnp.int32),
     )
@@ -431,8 +393,8 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo]):
             ball_y=jnp.array(115).astype(jnp.int32),
             enemy_y=jnp.array(115).astype(jnp.int32),
             enemy_speed=jnp.array(0.0).astype(jnp.int32),
-            ball_vel_x=BALL_SPEED[0].astype(jnp.int32),
-            ball_vel_y=BALL_SPEED[1].astype(jnp.int32),
+            ball_vel_x=jnp.array(BALL_SPEED[0], dtype=jnp.int32),
+            ball_vel_y=jnp.array(BALL_SPEED[1], dtype=jnp.int32),
             player_score=jnp.array(0).astype(jnp.int32),
             enemy_score=jnp.array(0).astype(jnp.int32),
             step_counter=jnp.array(0).astype(jnp.int32),
@@ -451,19 +413,14 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo]):
             state.player_y, state.player_speed, state.acceleration_counter, action
         )
 
-        new_player_y, player_speed, new_acceleration_counter = jax.lax.cond(
-            state.step_counter % 2 == 0,
-            lambda _: (new_player_y, player_speed_b, new_acceleration_counter),
-            lambda _: (state.player_y, state.player_speed, state.acceleration_counter),
-            operand=None,
+        is_player_step = state.step_counter % 2 == 0
+        new_player_y = jnp.where(is_player_step, new_player_y, state.player_y)
+        player_speed = jnp.where(is_player_step, player_speed_b, state.player_speed)
+        new_acceleration_counter = jnp.where(
+            is_player_step, new_acceleration_counter, state.acceleration_counter
         )
 
-        buffer = jax.lax.cond(
-            jax.lax.eq(state.buffer, state.player_y),
-            lambda _: new_player_y,
-            lambda _: state.buffer,
-            operand=None,
-        )
+        buffer = jnp.where(state.buffer == state.player_y, new_player_y, state.buffer)
         player_y = state.buffer
 
         enemy_y = enemy_step(state, state.step_counter, state.ball_y, state.ball_y)
@@ -477,64 +434,30 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo]):
         ball_reset = jnp.logical_or(enemy_goal, player_goal)
 
         # Step 4: Update scores
-        player_score = jax.lax.cond(
-            player_goal,
-            lambda s: s + 1,
-            lambda s: s,
-            operand=state.player_score,
-        )
-        enemy_score = jax.lax.cond(
-            enemy_goal,
-            lambda s: s + 1,
-            lambda s: s,
-            operand=state.enemy_score,
-        )
+        player_score = state.player_score + player_goal.astype(jnp.int32)
+        enemy_score = state.enemy_score + enemy_goal.astype(jnp.int32)
 
         # Step 5: Reset ball if goal was scored
-        current_values = (
-            ball_x.astype(jnp.int32),
-            ball_y.astype(jnp.int32),
-            ball_vel_x.astype(jnp.int32),
-            ball_vel_y.astype(jnp.int32),
-        )
-        ball_x_final, ball_y_final, ball_vel_x_final, ball_vel_y_final = jax.lax.cond(
-            ball_reset,
-            lambda x: _reset_ball_after_goal((state, enemy_goal)),
-            lambda x: x,
-            operand=current_values,
+        reset_x, reset_y, reset_vel_x, reset_vel_y = _reset_ball_after_goal(
+            (state, enemy_goal)
         )
+        ball_x_final = jnp.where(ball_reset, reset_x, ball_x.astype(jnp.int32))
+        ball_y_final = jnp.where(ball_reset, reset_y, ball_y.astype(jnp.int32))
+        ball_vel_x_final = jnp.where(ball_reset, reset_vel_x, ball_vel_x.astype(jnp.int32))
+        ball_vel_y_final = jnp.where(ball_reset, reset_vel_y, ball_vel_y.astype(jnp.int32))
 
         # Step 6: Update step counter for game freeze after goal
-        step_counter = jax.lax.cond(
-            ball_reset,
-            lambda s: jnp.array(0),
-            lambda s: s + 1,
-            operand=state.step_counter,
-        )
+        step_counter = jnp.where(ball_reset, 0, state.step_counter + 1)
 
         # Step 7: Update enemy position and speed
 
         # Step 8: Reset enemy position on goal
-        enemy_y_final = jax.lax.cond(
-            ball_reset,
-            lambda s: BALL_START_Y.astype(jnp.int32),
-            lambda s: enemy_y.astype(jnp.int32),
-            operand=None,
-        )
+        enemy_y_final = jnp.where(ball_reset, BALL_START_Y, enemy_y).astype(jnp.int32)
 
         # Step 9: Handle ball position during game freeze
-        ball_x_final = jax.lax.cond(
-            step_counter < 60,
-            lambda s: BALL_START_X.astype(jnp.int32),
-            lambda s: s,
-            operand=ball_x_final,
-        )
-        ball_y_final = jax.lax.cond(
-            step_counter < 60,
-            lambda s: BALL_START_Y.astype(jnp.int32),
-            lambda s: s,
-            operand=ball_y_final,
-        )
+        game_frozen = step_counter < 60
+        ball_x_final = jnp.where(game_frozen, BALL_START_X, ball_x_final).astype(jnp.int32)
+        ball_y_final = jnp.where(game_frozen, BALL_START_Y, ball_y_final).astype(jnp.int32)
 
         new_state = PongState(
             player_y=player_y,
@@ -612,13 +535,17 @@ class JaxPong(JaxEnvironment[PongState, PongObservation, PongInfo]):
             ]
            )
 
-    def action_space(self) -> spaces.Discrete:
+    def action_space(self) -> "spaces.Discrete":
+        from gymnax.environments import spaces
+
         return spaces.Discrete(len(self.action_set))
 
     def get_action_space(self) -> jnp.ndarray:
         return jnp.array(self.action_set)
 
-    def observation_space(self) -> spaces.Box:
+    def observation_space(self) -> "spaces.Box":
+        from gymnax.environments import spaces
+
         return spaces.Box(
             low=0,
             high=255,
@@ -694,7 +621,8 @@ def load_sprites():
 class PongRenderer(AtraJaxisRenderer):
     """JAX-based Pong game renderer, optimized with JIT compilation."""
 
-    def __init__(self):
+    def __init__(self, viewport=None):
+        super().__init__(viewport)
         (
             self.SPRITE_BG,
             self.SPRITE_PLAYER,
@@ -703,6 +631,14 @@ class PongRenderer(AtraJaxisRenderer):
             self.PLAYER_DIGIT_SPRITES,
             self.ENEMY_DIGIT_SPRITES,
         ) = load_sprites()
+        # the background is static, so it is composited once instead of blended every frame
+        self.BACKGROUND_LAYER = aj.sample_layer(aj.composite_layer(WIDTH, HEIGHT, [(0, 0, self.SPRITE_BG[0])]), viewport)
+        # the scores are gathered from glyph cells and drawn in a single blit each
+        self.PLAYER_SCORE_GLYPHS = aj.glyph_strip(self.PLAYER_DIGIT_SPRITES, 16)
+        self.ENEMY_SCORE_GLYPHS = aj.glyph_strip(self.ENEMY_DIGIT_SPRITES, 16)
+        self.binary_alpha = aj.has_binary_alpha(
+            self.SPRITE_PLAYER, self.SPRITE_ENEMY, self.SPRITE_BALL, self.PLAYER_DIGIT_SPRITES, self.ENEMY_DIGIT_SPRITES
+        )
 
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
@@ -715,127 +651,43 @@ class PongRenderer(AtraJaxisRenderer):
         Returns:
             A JAX array representing the rendered frame.
         """
-        # Create empty raster with CORRECT orientation for atraJaxis framework
+        # Start from the cached background layer with CORRECT orientation for atraJaxis framework
         # Note: For pygame, the raster is expected to be (width, height, channels)
         # where width corresponds to the horizontal dimension of the screen
-        raster = jnp.zeros((WIDTH, HEIGHT, 3))
-
-        # Render background - (0, 0) is top-left corner
-        frame_bg = aj.get_sprite_frame(self.SPRITE_BG, 0)
-        raster = aj.render_at(raster, 0, 0, frame_bg)
+        raster = aj.start_frame(self.BACKGROUND_LAYER, self.viewport, dtype=jnp.float32)
 
         # Render player paddle - IMPORTANT: Swap x and y coordinates
         # render_at takes (raster, y, x, sprite) but we need to swap them due to transposition
         frame_player = aj.get_sprite_frame(self.SPRITE_PLAYER, 0)
-        raster = aj.render_at(raster, PLAYER_X, state.player_y, frame_player)
+        raster = aj.render_at(raster, PLAYER_X, state.player_y, frame_player, binary_alpha=self.binary_alpha)
 
         # Render enemy paddle - same swap needed
         frame_enemy = aj.get_sprite_frame(self.SPRITE_ENEMY, 0)
-        raster = aj.render_at(raster, ENEMY_X,state.enemy_y, frame_enemy)
+        raster = aj.render_at(raster, ENEMY_X,state.enemy_y, frame_enemy, binary_alpha=self.binary_alpha)
 
         # Render ball - ball position is (ball_x, ball_y) but needs to be swapped
         frame_ball = aj.get_sprite_frame(self.SPRITE_BALL, 0)
-        raster = aj.render_at(raster, state.ball_x, state.ball_y, frame_ball)
+        raster = aj.render_at(raster, state.ball_x, state.ball_y, frame_ball, binary_alpha=self.binary_alpha)
 
         wall_color = jnp.array(WALL_COLOR, dtype=jnp.uint8)
         # Top Wall: Full width (x=0 to WIDTH), y from WALL_TOP_Y to WALL_TOP_Y + WALL_TOP_HEIGHT
         top_wall_y_start = WALL_TOP_Y
-        top_wall_y_end = WALL_TOP_Y + WALL_TOP_HEIGHT
-        raster = raster.at[:, top_wall_y_start:top_wall_y_end, :].set(wall_color)
+        raster = aj.fill_rect(raster, 0, top_wall_y_start, WIDTH, WALL_TOP_HEIGHT, wall_color)
 
         # Bottom Wall: Full width, y from WALL_BOTTOM_Y to WALL_BOTTOM_Y + WALL_BOTTOM_HEIGHT
         bottom_wall_y_start = WALL_BOTTOM_Y
-        bottom_wall_y_end = WALL_BOTTOM_Y + WALL_BOTTOM_HEIGHT
-        raster = raster.at[:, bottom_wall_y_start:bottom_wall_y_end, :].set(wall_color)
-
-        # 1. Get digit arrays (always 2 digits)
-        player_score_digits = aj.int_to_digits(state.player_score, max_digits=2)
-        enemy_score_digits = aj.int_to_digits(state.enemy_score, max_digits=2)
-
-        # 2. Determine parameters for player score rendering using jax.lax.select
-        is_player_single_digit = state.player_score < 10
-        player_start_index = jax.lax.select(is_player_single_digit, 1, 0) # Start at index 1 if single, 0 if double
-        player_num_to_render = jax.lax.select(is_player_single_digit, 1, 2) # Render 1 digit if single, 2 if double
-        # Adjust X position: If single digit, center it slightly by moving right by half the spacing
-        player_render_x = jax.lax.select(is_player_single_digit,
-                                         120 + 16 // 2,
-                                         120)
-
-        # 3. Render player score using the selective renderer
-        raster = aj.render_label_selective(raster, player_render_x, 3,
-                                            player_score_digits, self.PLAYER_DIGIT_SPRITES,
-                                            player_start_index, player_num_to_render,
-                                            spacing=16)
-
-        # 4. Determine parameters for enemy score rendering
-        is_enemy_single_digit = state.enemy_score < 10
-        enemy_start_index = jax.lax.select(is_enemy_single_digit, 1, 0)
-        enemy_num_to_render = jax.lax.select(is_enemy_single_digit, 1, 2)
-        enemy_render_x = jax.lax.select(is_enemy_single_digit,
-                                        10 + 16 // 2,
-                                        10)
-
-        # 5. Render enemy score
-        raster = aj.render_label_selective(raster, enemy_render_x, 3,
-                                           enemy_score_digits, self.ENEMY_DIGIT_SPRITES,
-                                           enemy_start_index, enemy_num_to_render,
-                                           spacing=16)
-
-        return raster
+        raster = aj.fill_rect(raster, 0, bottom_wall_y_start, WIDTH, WALL_BOTTOM_HEIGHT, wall_color)
+
+        # Render the scores (2 digits), single digits are centered in the 2 digit cells
+        raster = aj.render_number(raster, 120, 3, state.player_score, self.PLAYER_SCORE_GLYPHS,
+                                  max_digits=2, align="center", leading_zeros=False, binary_alpha=self.binary_alpha)
+        raster = aj.render_number(raster, 10, 3, state.enemy_score, self.ENEMY_SCORE_GLYPHS,
+                                  max_digits=2, align="center", leading_zeros=False, binary_alpha=self.binary_alpha)
+
+        return aj.finish_frame(raster)
 
 
 if __name__ == "__main__":
-    # Initialize Pygame
-    pygame.init()
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("Pong Game")
-    clock = pygame.time.Clock()
-
-    game = JaxPong()
-
-    # Create the JAX renderer
-    renderer = PongRenderer()
-
-    # Get jitted functions
-    jitted_step = jax.jit(game.step)
-    jitted_reset = jax.jit(game.reset)
-
-    obs, curr_state = jitted_reset()
-
-    # Game loop
-    running = True
-    frame_by_frame = False
-    frameskip = 1
-    counter = 1
-
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_f:
-                    frame_by_frame = not frame_by_frame
-            elif event.type == pygame.KEYDOWN or (
-                    event.type == pygame.KEYUP and event.key == pygame.K_n
-            ):
-                if event.key == pygame.K_n and frame_by_frame:
-                    if counter % frameskip == 0:
-                        action = get_human_action()
-                        obs, curr_state, reward, done, info = jitted_step(
-                            curr_state, action
-                        )
-
-        if not frame_by_frame:
-            if counter % frameskip == 0:
-                action = get_human_action()
-                obs, curr_state, reward, done, info = jitted_step(curr_state, action)
-
-        # Render and display
-        raster = renderer.render(curr_state)
-
-        aj.update_pygame(screen, raster, 3, WIDTH, HEIGHT)
-
-        counter += 1
-        clock.tick(60)
-
-    pygame.quit()
\ No newline at end of file
+    from jaxatari import interactive
+
+    interactive.run(JaxPong(), PongRenderer(), get_human_action, fps=60, scale=WINDOW_WIDTH // WIDTH, caption="Pong Game")
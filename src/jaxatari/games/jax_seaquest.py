@@ -1,16 +1,18 @@
 import os
 from functools import partial
-from typing import Tuple, NamedTuple
+from typing import TYPE_CHECKING, Tuple, NamedTuple
 import jax
 import jax.numpy as jnp
 import chex
-import pygame
 import jaxatari.rendering.atraJaxis as aj
 import numpy as np
-from gymnax.environments import spaces
 
+from jaxatari import physics
 from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
 
+if TYPE_CHECKING:
+    from gymnax.environments import spaces
+
 # TODO: surface submarine at 6 divers collected + difficulty 1
 # Game Constants
 WINDOW_WIDTH = 160 * 3
@@ -24,7 +26,7 @@ SCALING_FACTOR = 3
 BACKGROUND_COLOR = (0, 0, 139)  # Dark blue for water
 PLAYER_COLOR = (187, 187, 53)  # Yellow for player sub
 DIVER_COLOR = (66, 72, 200)  # Pink for divers
-SHARK_DIFFICULTY_COLORS = jnp.array(
+SHARK_DIFFICULTY_COLORS = np.array(
     [
         [92, 186, 92],  # Level 0: Base green
         [213, 130, 74],  # Level 1: Orange (adjusted from original ROM)
@@ -68,15 +70,15 @@ MAX_COLLECTED_DIVERS = 6
 FACE_LEFT = -1
 FACE_RIGHT = 1
 
-SPAWN_POSITIONS_Y = jnp.array([71, 95, 119, 139])  # submarines at y=69?
+SPAWN_POSITIONS_Y = np.array([71, 95, 119, 139])  # submarines at y=69?
 SUBMARINE_Y_OFFSET = 2
-ENEMY_MISSILE_Y = jnp.array([73, 97, 121, 141])  # missile x = submarine.x + 4
-DIVER_SPAWN_POSITIONS = jnp.array([69, 93, 117, 141])
+ENEMY_MISSILE_Y = np.array([73, 97, 121, 141])  # missile x = submarine.x + 4
+DIVER_SPAWN_POSITIONS = np.array([69, 93, 117, 141])
 
-MISSILE_SPAWN_POSITIONS = jnp.array([39, 126])  # Right, Left
+MISSILE_SPAWN_POSITIONS = np.array([39, 126])  # Right, Left
 
 # First wave directions from original code
-FIRST_WAVE_DIRS = jnp.array([False, False, False, True])
+FIRST_WAVE_DIRS = np.array([False, False, False, True])
 
 class SpawnState(NamedTuple):
     difficulty: chex.Array  # Current difficulty level (0-7)
@@ -115,7 +117,7 @@ def initialize_spawn_state() -> SpawnState:
             [277, 277, 277, 277 + 60], dtype=jnp.int32
         ),  # All lanes start with same timer
         diver_array=jnp.array([1, 1, 0, 0], dtype=jnp.int32),
-        lane_directions=FIRST_WAVE_DIRS.astype(jnp.int32),  # First wave directions
+        lane_directions=jnp.array(FIRST_WAVE_DIRS, dtype=jnp.int32),  # First wave directions
     )
 
 
@@ -193,6 +195,116 @@ class CarryState(NamedTuple):
     score: chex.Array
 
 
+# Enemy entity table
+NUM_LANES = 4
+SLOTS_PER_LANE = 3
+ENEMY_TYPE_SHARK = 0
+ENEMY_TYPE_SUB = 1
+ENEMY_TYPE_DIVER = 2
+ENEMY_TYPE_MISSILE = 3
+
+# static row layout of the table: all sharks and all subs (lane-major), followed by the
+# diver and the enemy missile of every lane
+ENEMY_TYPES = np.repeat(
+    np.array([ENEMY_TYPE_SHARK, ENEMY_TYPE_SUB, ENEMY_TYPE_DIVER, ENEMY_TYPE_MISSILE]),
+    [MAX_SHARKS, MAX_SUBS, MAX_DIVERS, MAX_ENEMY_MISSILES],
+)
+ENEMY_LANES = np.concatenate(
+    [np.tile(np.repeat(np.arange(NUM_LANES), SLOTS_PER_LANE), 2), np.tile(np.arange(NUM_LANES), 2)]
+)
+ENEMY_SLOTS = np.concatenate([np.tile(np.arange(SLOTS_PER_LANE), 2 * NUM_LANES), np.zeros(2 * NUM_LANES, dtype=int)])
+# first row of every type, the rows of a type end where the next type starts
+ENEMY_TYPE_ROWS = np.searchsorted(ENEMY_TYPES, np.arange(ENEMY_TYPE_MISSILE + 2))
+# collision size of every type
+ENEMY_TYPE_SIZES = np.array([SHARK_SIZE, ENEMY_SUB_SIZE, DIVER_SIZE, MISSILE_SIZE])
+# rows of the sharks and submarines of the first lane, add lane * SLOTS_PER_LANE for the others
+ENEMY_LANE_ROWS = np.concatenate([np.arange(SLOTS_PER_LANE), MAX_SHARKS + np.arange(SLOTS_PER_LANE)])
+
+
+class EnemyTable(NamedTuple):
+    """Structure-of-arrays view of every lane entity (sharks, submarines, divers and enemy missiles).
+
+    Rows 0-11 are the shark slots and rows 12-23 the submarine slots, both ordered lane
+    by lane with 3 slots per lane, so reshaping the first 24 rows of a field to
+    (2, NUM_LANES, SLOTS_PER_LANE) yields a (type, lane, slot) grid. Rows 24-27 are the
+    divers and rows 28-31 the enemy missiles of the four lanes. Kernels that only handle
+    sharks and submarines work on tables of the first 24 rows.
+    """
+    type: chex.Array  # ENEMY_TYPE_SHARK, ENEMY_TYPE_SUB, ENEMY_TYPE_DIVER or ENEMY_TYPE_MISSILE
+    lane: chex.Array
+    slot: chex.Array
+    x: chex.Array
+    y: chex.Array
+    dir: chex.Array  # -1 = left, 1 = right, 0 = free slot
+    alive: chex.Array
+
+
+def to_enemy_table(
+    shark_positions: chex.Array,
+    sub_positions: chex.Array,
+    diver_positions: chex.Array = None,
+    enemy_missile_positions: chex.Array = None,
+) -> EnemyTable:
+    """Pack the (N, 3) entity arrays into a single entity table.
+
+    The diver and enemy missile rows are optional, without them the table only holds the
+    24 shark and submarine rows.
+    """
+    positions = jnp.concatenate(
+        [p for p in (shark_positions, sub_positions, diver_positions, enemy_missile_positions) if p is not None]
+    )
+    rows = positions.shape[0]
+    return EnemyTable(
+        type=jnp.asarray(ENEMY_TYPES[:rows]),
+        lane=jnp.asarray(ENEMY_LANES[:rows]),
+        slot=jnp.asarray(ENEMY_SLOTS[:rows]),
+        x=positions[:, 0],
+        y=positions[:, 1],
+        dir=positions[:, 2],
+        alive=positions[:, 2] != 0,
+    )
+
+
+def table_positions(table: EnemyTable, enemy_type: int) -> chex.Array:
+    """The (N, 3) array of the entities of one type in a table."""
+    start, end = ENEMY_TYPE_ROWS[enemy_type], ENEMY_TYPE_ROWS[enemy_type + 1]
+    return jnp.stack([table.x[start:end], table.y[start:end], table.dir[start:end]], axis=1)
+
+
+def from_enemy_table(table: EnemyTable) -> Tuple[chex.Array, chex.Array]:
+    """Unpack an entity table into the (12, 3) shark and submarine arrays."""
+    return table_positions(table, ENEMY_TYPE_SHARK), table_positions(table, ENEMY_TYPE_SUB)
+
+
+def lane_grid(positions: chex.Array) -> chex.Array:
+    """Reshape a (12, 3) enemy array into a (lane, slot, xyd) grid."""
+    return positions.reshape(NUM_LANES, SLOTS_PER_LANE, 3)
+
+
+def lanes_empty(shark_positions: chex.Array, sub_positions: chex.Array) -> chex.Array:
+    """Per lane, whether all shark and submarine slots are free. Shape (4,)."""
+    sharks_free = lane_grid(shark_positions)[..., 2] == 0
+    subs_free = lane_grid(sub_positions)[..., 2] == 0
+    return jnp.all(jnp.logical_and(sharks_free, subs_free), axis=1)
+
+
+def lane_front_direction(lane_directions: chex.Array) -> chex.Array:
+    """Direction of the first occupied slot in each lane (0 if the lane is empty).
+
+    Args:
+        lane_directions: (..., 3) direction values of the slots of each lane
+    """
+    return jnp.where(
+        lane_directions[..., 0] == 0,
+        jnp.where(
+            lane_directions[..., 1] == 0,
+            lane_directions[..., 2],
+            lane_directions[..., 1],
+        ),
+        lane_directions[..., 0],
+    )
+
+
 # RENDER CONSTANTS
 def load_sprites():
     MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -230,39 +342,39 @@ def load_sprites():
     en_torp_sprites = [en_torp]
 
     # Background sprite (no padding needed)
-    SPRITE_BG = jnp.expand_dims(bg1, axis=0)
+    SPRITE_BG = np.expand_dims(bg1, axis=0)
 
     # Player submarine sprites
-    SPRITE_PL_SUB = jnp.concatenate(
+    SPRITE_PL_SUB = np.concatenate(
         [
-            jnp.repeat(pl_sub_sprites[0][None], 4, axis=0),
-            jnp.repeat(pl_sub_sprites[1][None], 4, axis=0),
-            jnp.repeat(pl_sub_sprites[2][None], 4, axis=0),
+            np.repeat(pl_sub_sprites[0][None], 4, axis=0),
+            np.repeat(pl_sub_sprites[1][None], 4, axis=0),
+            np.repeat(pl_sub_sprites[2][None], 4, axis=0),
         ]
     )
 
     # Diver sprites
-    SPRITE_DIVER = jnp.concatenate(
+    SPRITE_DIVER = np.concatenate(
         [
-            jnp.repeat(diver_sprites[0][None], 16, axis=0),
-            jnp.repeat(diver_sprites[1][None], 4, axis=0),
+            np.repeat(diver_sprites[0][None], 16, axis=0),
+            np.repeat(diver_sprites[1][None], 4, axis=0),
         ]
     )
 
     # Shark sprites
-    SPRITE_SHARK = jnp.concatenate(
+    SPRITE_SHARK = np.concatenate(
         [
-            jnp.repeat(shark_sprites[0][None], 16, axis=0),
-            jnp.repeat(shark_sprites[1][None], 8, axis=0),
+            np.repeat(shark_sprites[0][None], 16, axis=0),
+            np.repeat(shark_sprites[1][None], 8, axis=0),
         ]
     )
 
     # Enemy submarine sprites
-    SPRITE_ENEMY_SUB = jnp.concatenate(
+    SPRITE_ENEMY_SUB = np.concatenate(
         [
-            jnp.repeat(enemy_sub_sprites[0][None], 4, axis=0),
-            jnp.repeat(enemy_sub_sprites[1][None], 4, axis=0),
-            jnp.repeat(enemy_sub_sprites[2][None], 4, axis=0),
+            np.repeat(enemy_sub_sprites[0][None], 4, axis=0),
+            np.repeat(enemy_sub_sprites[1][None], 4, axis=0),
+            np.repeat(enemy_sub_sprites[2][None], 4, axis=0),
         ]
     )
 
@@ -271,10 +383,10 @@ def load_sprites():
     DIVER_INDICATOR = aj.loadFrame(os.path.join(MODULE_DIR, "./sprites/seaquest/diver_indicator/1.npy"))
 
     # Player torpedo sprites
-    SPRITE_PL_TORP = jnp.repeat(pl_torp_sprites[0][None], 1, axis=0)
+    SPRITE_PL_TORP = np.repeat(pl_torp_sprites[0][None], 1, axis=0)
 
     # Enemy torpedo sprites
-    SPRITE_EN_TORP = jnp.repeat(en_torp_sprites[0][None], 1, axis=0)
+    SPRITE_EN_TORP = np.repeat(en_torp_sprites[0][None], 1, axis=0)
 
     return (
         SPRITE_BG,
@@ -304,65 +416,43 @@ def load_sprites():
     DIVER_INDICATOR,
 ) = load_sprites()
 
+# the background is static, so it is composited once instead of blended every frame
+BACKGROUND_LAYER = aj.composite_layer(WIDTH, HEIGHT, [(0, 0, SPRITE_BG[0])])
+# the 8-digit score is gathered from glyph cells and drawn in a single blit
+SCORE_DIGITS = 8
+SCORE_SPACING = 7
+SCORE_GLYPHS = aj.glyph_strip(DIGITS, SCORE_SPACING)
+
 @jax.jit
 def check_collision_single(pos1, size1, pos2, size2):
     """Check collision between two single entities"""
-    # Calculate edges for rectangle 1
-    rect1_left = pos1[0]
-    rect1_right = pos1[0] + size1[0]
-    rect1_top = pos1[1]
-    rect1_bottom = pos1[1] + size1[1]
-
-    # Calculate edges for rectangle 2
-    rect2_left = pos2[0]
-    rect2_right = pos2[0] + size2[0]
-    rect2_top = pos2[1]
-    rect2_bottom = pos2[1] + size2[1]
-
-    # Check overlap
-    horizontal_overlap = jnp.logical_and(
-        rect1_left < rect2_right,
-        rect1_right > rect2_left
-    )
-
-    vertical_overlap = jnp.logical_and(
-        rect1_top < rect2_bottom,
-        rect1_bottom > rect2_top
-    )
-
-    return jnp.logical_and(horizontal_overlap, vertical_overlap)
+    return physics.overlap(physics.pack_boxes(pos1, size1), physics.pack_boxes(pos2, size2))
 
 @jax.jit
 def check_collision_batch(pos1, size1, pos2_array, size2):
     """Check collision between one entity and an array of entities"""
-    # Calculate edges for rectangle 1
-    rect1_left = pos1[0]
-    rect1_right = pos1[0] + size1[0]
-    rect1_top = pos1[1]
-    rect1_bottom = pos1[1] + size1[1]
-
-    # Calculate edges for all rectangles in pos2_array
-    rect2_left = pos2_array[:, 0]
-    rect2_right = pos2_array[:, 0] + size2[0]
-    rect2_top = pos2_array[:, 1]
-    rect2_bottom = pos2_array[:, 1] + size2[1]
-
-    # Check overlap for all entities
-    horizontal_overlaps = jnp.logical_and(
-        rect1_left < rect2_right,
-        rect1_right > rect2_left
+    return jnp.any(
+        physics.overlap(physics.pack_boxes(pos1, size1), physics.pack_boxes(pos2_array, size2))
     )
 
-    vertical_overlaps = jnp.logical_and(
-        rect1_top < rect2_bottom,
-        rect1_bottom > rect2_top
-    )
+@jax.jit
+def check_collision_matrix(pos1, size1, pos2, size2):
+    """Check collisions between every entity of one group and every entity of another.
 
-    # Combine checks for each entity
-    collisions = jnp.logical_and(horizontal_overlaps, vertical_overlaps)
+    Args:
+        pos1: (N, 2) top-left positions of the first group
+        size1: (2,) size shared by the first group or (N, 2) per-entity sizes
+        pos2: (M, 2) top-left positions of the second group
+        size2: (2,) size shared by the second group or (M, 2) per-entity sizes
+
+    Returns:
+        (N, M) boolean collision matrix
+    """
+    return physics.overlap_matrix(physics.pack_boxes(pos1, size1), physics.pack_boxes(pos2, size2))
 
-    # Return true if any collision detected
-    return jnp.any(collisions)
+def enemy_sizes(table: EnemyTable) -> chex.Array:
+    """(N, 2) collision sizes of the rows of an entity table."""
+    return jnp.asarray(ENEMY_TYPE_SIZES)[table.type]
 
 @jax.jit
 def check_missile_collisions(
@@ -372,119 +462,78 @@ def check_missile_collisions(
     score: chex.Array,
     successful_rescues: chex.Array,
     spawn_state: SpawnState,
+    step_counter: chex.Array,
     rng_key: chex.PRNGKey,
 ) -> tuple[chex.Array, chex.Array, chex.Array, chex.Array, SpawnState, chex.PRNGKey]:
-    """Check for collisions between player missile and enemies"""
-    # Create missile position array for collision check
-    missile_rect_pos = jnp.array([missile_pos[0], missile_pos[1]])
+    """Check for collisions between player missile and enemies.
+
+    The missile is tested against all sharks and submarines at once. Every enemy
+    slot that is hit is destroyed and scores once, and the missile is removed if it
+    hit anything.
+
+    At high difficulties the enemies move by more than the width of the missile and an
+    enemy together in one frame, so an enemy can pass through the missile between two
+    checks. The missile is also swept against the move of the enemies that follows this
+    check, and an enemy that it passes through entirely is hit as well.
+    """
     missile_active = missile_pos[2] != 0
 
     # Split RNG for collision detection and direction randomization
     rng_key, direction_rng = jax.random.split(rng_key)
 
-    def check_enemy_collisions(enemy_idx, carry):
-        # Unpack carry state
-        missile_pos, shark_positions, sub_positions, score, spawn_state = carry
-
-        # Check shark collisions - only if missile is active
-        shark_collision = jnp.logical_and(
-            missile_active,
-            check_collision_single(  # Use single version
-                missile_rect_pos, MISSILE_SIZE,
-                shark_positions[enemy_idx], SHARK_SIZE
-            )
-        )
-
-        # Check submarine collisions - only if missile is active
-        sub_collision = jnp.logical_and(
-            missile_active,
-            check_collision_single(  # Use single version
-                missile_rect_pos, MISSILE_SIZE,
-                sub_positions[enemy_idx], ENEMY_SUB_SIZE
-            )
-        )
-
-        # Update positions and score - use where instead of if statements
-        new_shark_pos = jnp.where(
-            shark_collision,
-            jnp.zeros_like(shark_positions[enemy_idx]),
-            shark_positions[enemy_idx],
-        )
-
-        new_sub_pos = jnp.where(
-            sub_collision,
-            jnp.zeros_like(sub_positions[enemy_idx]),
-            sub_positions[enemy_idx],
-        )
-
-        # Update score
-        score_increase = jnp.where(
-            shark_collision,
-            calculate_kill_points(successful_rescues),
-            jnp.where(sub_collision, calculate_kill_points(successful_rescues), 0),
-        )
-
-        # Remove missile if it hit anything
-        new_missile_pos = jnp.where(
-            jnp.logical_or(shark_collision, sub_collision),
-            jnp.array([0, 0, 0]),
-            missile_pos,
-        )
-
-        # Update the kill tracking in spawn state
-        any_collision = jnp.logical_or(shark_collision, sub_collision)
-        new_survived = spawn_state.survived.at[enemy_idx].set(
-            jnp.where(
-                any_collision,
-                0,  # Set to False when destroyed by missile
-                spawn_state.survived[enemy_idx],
-            )
-        )
+    table = to_enemy_table(shark_positions, sub_positions)
+    missile_box = physics.pack_boxes(missile_pos[:2], MISSILE_SIZE)
+    enemy_boxes = physics.pack_boxes(jnp.stack([table.x, table.y], axis=1), enemy_sizes(table))
+
+    # The missile is one pixel high, so it can only pass through the enemies of the lane
+    # closest to it (sharks bob between 4 above and 10 below their lane, lanes are 20 apart)
+    lane = jnp.argmin(jnp.abs(jnp.asarray(SPAWN_POSITIONS_Y) + 3 - missile_pos[1]))
+    lane_rows = jnp.asarray(ENEMY_LANE_ROWS) + lane * SLOTS_PER_LANE
+    lane_boxes = enemy_boxes[lane_rows]
+
+    # horizontal move of the enemies after this check (see move_enemies), relative to the missile
+    movement_speed = calculate_movement_speed(step_counter, spawn_state.difficulty)
+    enemy_velocity = jnp.where(table.dir[lane_rows] < 0, -movement_speed, movement_speed)
+    relative_velocity = jnp.stack([-enemy_velocity, jnp.zeros_like(enemy_velocity)], axis=1)
+    swept_hits, _ = physics.swept_overlap(missile_box, relative_velocity, lane_boxes)
+    # enemies that still overlap the missile after their move are left to the next check
+    moved_boxes = lane_boxes.at[:, 0].add(enemy_velocity)
+    passed_through = jnp.zeros(table.type.shape, dtype=bool).at[lane_rows].set(
+        jnp.logical_and(swept_hits, jnp.logical_not(physics.overlap(missile_box, moved_boxes)))
+    )
 
-        # Update spawn timers when enemy destroyed
-        lane_idx = (enemy_idx // 3).astype(int)
-        new_spawn_timers = spawn_state.spawn_timers.at[lane_idx].set(
-            jnp.where(
-                any_collision, 200, spawn_state.spawn_timers[lane_idx].astype(int)
-            )
-        )
+    hits = jnp.logical_and(
+        missile_active,
+        jnp.logical_or(physics.overlap(missile_box, enemy_boxes), passed_through),
+    )
 
-        new_lane_directions = spawn_state.lane_directions
-        # if survived is true, also randomize the lane direction for the next spawn cycle -> this might lead to some unnecessary randomization, but the impact on performance should be negligible
-        new_lane_directions = jnp.where(
-            any_collision,
-            new_lane_directions.at[enemy_idx // 3].set(
-                jax.random.bernoulli(direction_rng, 0.5)
-            ),
-            new_lane_directions,
-        )
+    # (type, slot) hits -> per slot and per lane kills
+    type_hits = hits.reshape(2, MAX_SHARKS)
+    slot_hits = jnp.any(type_hits, axis=0)
+    lane_hits = jnp.any(slot_hits.reshape(NUM_LANES, SLOTS_PER_LANE), axis=1)
 
-        # Create updated spawn state (including lane_directions field)
-        new_spawn_state = SpawnState(
-            difficulty=spawn_state.difficulty,
-            lane_dependent_pattern=spawn_state.lane_dependent_pattern,
-            to_be_spawned=spawn_state.to_be_spawned,
-            spawn_timers=new_spawn_timers,
-            prev_sub=spawn_state.prev_sub,
-            survived=new_survived,
-            diver_array=spawn_state.diver_array,
-            lane_directions=new_lane_directions,
-        )
+    # Remove destroyed enemies
+    shark_positions = jnp.where(type_hits[ENEMY_TYPE_SHARK][:, None], 0, shark_positions)
+    sub_positions = jnp.where(type_hits[ENEMY_TYPE_SUB][:, None], 0, sub_positions)
 
-        return (
-            new_missile_pos,
-            shark_positions.at[enemy_idx].set(new_shark_pos),
-            sub_positions.at[enemy_idx].set(new_sub_pos),
-            score + score_increase,
-            new_spawn_state,
-        )
+    # every destroyed slot scores once
+    score = score + jnp.sum(
+        jnp.where(slot_hits, calculate_kill_points(successful_rescues), 0)
+    )
 
-    # Run collision detection for each possible enemy
-    missile_pos, shark_positions, sub_positions, score, spawn_state = jax.lax.fori_loop(
-        0,
-        shark_positions.shape[0],
-        check_enemy_collisions,
-        (missile_pos, shark_positions, sub_positions, score, spawn_state),
+    # Remove missile if it hit anything
+    missile_pos = jnp.where(jnp.any(slot_hits), jnp.array([0, 0, 0]), missile_pos)
+
+    # Update the kill tracking in spawn state: destroyed slots did not survive, the lane
+    # spawn timer restarts and the lane direction of the next spawn cycle is randomized
+    spawn_state = spawn_state._replace(
+        survived=jnp.where(slot_hits, 0, spawn_state.survived),
+        spawn_timers=jnp.where(lane_hits, 200, spawn_state.spawn_timers),
+        lane_directions=jnp.where(
+            lane_hits,
+            jax.random.bernoulli(direction_rng, 0.5),
+            spawn_state.lane_directions,
+        ),
     )
 
     return (
@@ -500,82 +549,44 @@ def check_missile_collisions(
 def check_player_collision(
     player_x,
     player_y,
-    submarine_list,
-    shark_list,
+    table: EnemyTable,
     surface_sub_pos,
-    enemy_projectile_list,
     score,
     successful_rescues,
 ) -> Tuple[chex.Array, chex.Array]:
-    # check if the player has collided with any of the three given lists
-    # the player is a 16x11 rectangle
-    # the submarine is a 8x11 rectangle
-    # the shark is a 8x7 rectangle
-    # the missile is a 8x1 rectangle
-    # the surface submarine is 8x11 as well
-
-    # check if the player has collided with any of the submarines
-    submarine_collisions = jnp.any(
-        check_collision_batch(
-            jnp.array([player_x, player_y]), PLAYER_SIZE, submarine_list, ENEMY_SUB_SIZE
-        )
-    )
+    """Check if the player has collided with an enemy.
 
-    # check if the player has collided with any of the sharks
-    shark_collisions = jnp.any(
-        check_collision_batch(
-            jnp.array([player_x, player_y]), PLAYER_SIZE, shark_list, SHARK_SIZE
-        )
-    )
-
-    # check if the player collided with the surface submarine
-    surface_collision = check_collision_single(
-        jnp.array([player_x, player_y]),
-        PLAYER_SIZE,
-        surface_sub_pos,
-        ENEMY_SUB_SIZE
-    )
+    Args:
+        player_x, player_y: Player position
+        table: Entity table of all sharks, submarines, divers and enemy missiles
+        surface_sub_pos: Surface submarine position
+        score: Current score
+        successful_rescues: Number of successful rescues
 
-    # check if the player has collided with any of the enemy projectiles
-    missile_collisions = jnp.any(
-        check_collision_batch(
-            jnp.array([player_x, player_y]),
-            PLAYER_SIZE,
-            enemy_projectile_list,
-            MISSILE_SIZE
-        )
-    )
+    Returns:
+        Whether the player collided and the points scored by the collision
+    """
+    # the player box against every row of the table and the surface submarine, divers are
+    # collected instead (see step_diver_movement)
+    player_box = physics.pack_boxes(jnp.array([player_x, player_y]), PLAYER_SIZE)
+    enemy_boxes = physics.pack_boxes(jnp.stack([table.x, table.y], axis=1), enemy_sizes(table))
+    collisions = jnp.logical_and(physics.overlap(player_box, enemy_boxes), table.type != ENEMY_TYPE_DIVER)
+    surface_collision = physics.overlap(player_box, physics.pack_boxes(surface_sub_pos[:2], ENEMY_SUB_SIZE))
 
-    # Calculate points for collisions.
     # When colliding with a shark or submarine the player gains points similar to killing the object
+    scoring = jnp.logical_and(collisions, table.type != ENEMY_TYPE_MISSILE)
     collision_points = jnp.where(
-        shark_collisions,
+        jnp.logical_or(jnp.any(scoring), surface_collision),
         calculate_kill_points(successful_rescues),
-        jnp.where(
-            submarine_collisions,
-            calculate_kill_points(successful_rescues),
-            jnp.where(surface_collision, calculate_kill_points(successful_rescues), 0),
-        ),
+        0,
     )
 
-    return (
-        jnp.any(
-            jnp.array(
-                [
-                    submarine_collisions,
-                    shark_collisions,
-                    missile_collisions,
-                    surface_collision,
-                ]
-            )
-        ),
-        collision_points,
-    )
+    return jnp.logical_or(jnp.any(collisions), surface_collision), collision_points
 
 @jax.jit
 def get_spawn_position(moving_left: chex.Array, slot: chex.Array) -> chex.Array:
     """Get spawn position based on movement direction and slot number"""
-    base_y = jnp.array(SPAWN_POSITIONS_Y[slot])
+    base_y = jnp.asarray(SPAWN_POSITIONS_Y)[slot]
     x_pos = jnp.where(
         moving_left,
         jnp.array(165, dtype=jnp.int32),  # Start right if moving left
@@ -628,6 +639,11 @@ def get_front_entity(i, lane_positions):
 
     return front_entity
 
+@jax.jit
+def get_front_entities(positions: chex.Array) -> chex.Array:
+    """Vectorized get_front_entity: the front entity of every lane, shape (4, 3)."""
+    return jax.vmap(get_front_entity)(jnp.arange(NUM_LANES), lane_grid(positions))
+
 @jax.jit
 def get_pattern_for_difficulty(
     current_pattern: chex.Array, moving_left: chex.Array
@@ -665,6 +681,10 @@ def update_enemy_spawns(
     rng: chex.PRNGKey = None,
 ) -> Tuple[SpawnState, chex.Array, chex.Array, chex.PRNGKey]:
     """Update enemy spawns using pattern-based system matching original game.
+
+    All four lanes are processed at once: every lane either continues its current
+    spawn cycle, initializes a new one or stays unchanged.
+
     Args:
         spawn_state: Current spawn state
         shark_positions: Current shark positions
@@ -676,6 +696,9 @@ def update_enemy_spawns(
     Returns:
         Tuple of updated spawn state, shark positions, sub positions, and updated RNG key
     """
+    rng = rng if rng is not None else jax.random.PRNGKey(42)
+    lanes = jnp.arange(NUM_LANES)
+    slots = jnp.arange(SLOTS_PER_LANE)
 
     # count down the spawn timers
     new_spawn_timers = jnp.where(
@@ -684,334 +707,348 @@ def update_enemy_spawns(
         spawn_state.spawn_timers,
     )
 
-    new_state = spawn_state._replace(spawn_timers=new_spawn_timers)
-
-    # Define a function for jax.lax.scan to process each lane
-    def scan_lanes(carry, lane_idx):
-        curr_state, curr_shark_positions, curr_sub_positions, curr_diver_positions, curr_rng = carry
-
-        # Check if this lane needs an update
-        needs_update = lane_needs_update(lane_idx, curr_state, curr_shark_positions, curr_sub_positions)
-
-        # Process the lane if needed
-        new_carry = jax.lax.cond(
-            needs_update,
-            lambda x: process_lane(lane_idx, x),
-            lambda x: x,
-            (curr_state, curr_shark_positions, curr_sub_positions, curr_diver_positions, curr_rng),
-        )
-
-        return new_carry, None  # None for outputs as we only care about final state
-
-    def initialize_new_spawn_cycle(i, carry):
-        spawn_state, shark_positions, sub_positions, diver_positions, rng = carry
-
-        # Split RNG key for this lane
-        rng, lane_rng = jax.random.split(rng)
-
-        # Get survived status for this lane (3 slots)
-        lane_survived = jax.lax.dynamic_slice(spawn_state.survived, (i * 3,), (3,))
+    lane_to_be_spawned = spawn_state.to_be_spawned.reshape(NUM_LANES, SLOTS_PER_LANE)
+    lane_survived = spawn_state.survived.reshape(NUM_LANES, SLOTS_PER_LANE)
+    shark_grid = lane_grid(shark_positions)
+    sub_grid = lane_grid(sub_positions)
+
+    # if there are still entities missing in the lane keep spawning, otherwise a new
+    # cycle may only be initialized once the lane is empty and its timer ran out
+    keep_spawning = jnp.any(lane_to_be_spawned, axis=1)
+    initialize = jnp.logical_and(
+        jnp.logical_not(keep_spawning),
+        jnp.logical_and(spawn_state.spawn_timers == 0, lanes_empty(shark_positions, sub_positions)),
+    )
 
-        # Update the difficulty patterns for this lane
-        left_over = jnp.any(lane_survived)
-        clipped_difficulty = spawn_state.difficulty % 8
-        # Update spawn state
-        lane_specific_pattern = jnp.where(
-            jnp.logical_not(left_over),  # Only update if all destroyed
+    # --- initialize a new spawn cycle ---
+    # Update the difficulty patterns (only if everything in the lane was destroyed)
+    left_over = jnp.any(lane_survived, axis=1)
+    clipped_difficulty = spawn_state.difficulty % 8
+    lane_specific_pattern = jnp.where(
+        jnp.logical_not(left_over),
+        jnp.where(
+            clipped_difficulty < 2,
+            0,
             jnp.where(
-                clipped_difficulty < 2,
-                0,
+                clipped_difficulty < 4,
+                1,
                 jnp.where(
-                    clipped_difficulty < 4,
-                    1,
-                    jnp.where(
-                        clipped_difficulty < 6,
-                        2,
-                        jnp.where(clipped_difficulty < 8, 3, 0),
-                    ),
+                    clipped_difficulty < 6,
+                    2,
+                    jnp.where(clipped_difficulty < 8, 3, 0),
                 ),
             ),
-            spawn_state.lane_dependent_pattern[i],
-        )
-
-        # Check if there's an active diver in this lane
-        active_diver = diver_positions[i][2] != 0
-        diver_direction = diver_positions[i][2]
-
-        # If there's an active diver, use its direction, otherwise randomize
-        moving_left = jnp.where(
-            active_diver,
-            diver_direction == -1,  # Use diver's direction if active
-            spawn_state.lane_directions[i] == 1  # Otherwise use current lane direction
-        )
-
-        # get the spawn pattern for this lane
-        # Check if this slot had something survive last time (if yes, we have to overwrite the current_pattern)
-        current_pattern = jnp.where(
-            left_over,
-            lane_survived,
-            get_pattern_for_difficulty(lane_specific_pattern, moving_left),
-        )
-
-        # make sure that in the current pattern all entries are positive (i.e. abs() on all values)
-        current_pattern = jnp.abs(current_pattern)
+        ),
+        spawn_state.lane_dependent_pattern,
+    )
 
-        # in case we are going left, flip the pattern
-        current_pattern = jnp.where(
-            moving_left, -jnp.flip(current_pattern), current_pattern
-        )
+    # If there's an active diver in a lane, use its direction, otherwise use the lane direction
+    moving_left = jnp.where(
+        diver_positions[:, 2] != 0,
+        diver_positions[:, 2] == -1,
+        spawn_state.lane_directions == 1,
+    )
 
-        # check if this should be a submarine or a shark
-        is_sub = jnp.logical_and(left_over, jnp.logical_not(spawn_state.prev_sub[i]))
+    # Check if something survived last time (if yes, we have to overwrite the current_pattern)
+    current_pattern = jnp.where(
+        left_over[:, None],
+        lane_survived,
+        jax.vmap(get_pattern_for_difficulty)(lane_specific_pattern, moving_left),
+    )
+    current_pattern = jnp.abs(current_pattern)
+    # in case we are going left, flip the pattern
+    current_pattern = jnp.where(
+        moving_left[:, None], -jnp.flip(current_pattern, axis=1), current_pattern
+    )
 
-        # set the positions for the first enemy in the wave (dependent on the direction this is either the first or the last slot)
-        first_slot = jnp.where(moving_left, 0, 2)
+    # check if this should be a submarine or a shark
+    is_sub = jnp.logical_and(left_over, jnp.logical_not(spawn_state.prev_sub))
+
+    # the first enemy of the wave is placed in the first or the last slot (depending on the direction)
+    first_slot = jnp.where(moving_left, 0, 2)
+    is_first_slot = (slots[None, :] == first_slot[:, None])[..., None]
+    base_pos = jax.vmap(get_spawn_position)(moving_left, lanes)[:, None, :]
+    init_shark_grid = jnp.where(
+        jnp.logical_and(is_first_slot, jnp.logical_not(is_sub)[:, None, None]),
+        base_pos,
+        shark_grid,
+    )
+    init_sub_grid = jnp.where(
+        jnp.logical_and(is_first_slot, is_sub[:, None, None]), base_pos, sub_grid
+    )
+    init_to_be_spawned = jnp.where(is_first_slot[..., 0], 0, current_pattern)
+
+    # --- continue the current spawn cycle ---
+    # check in which direction we are moving by finding the first non-zero value
+    cycle_moving_left = lane_front_direction(lane_to_be_spawned) == -1
+
+    # spawn the missing entity closest to the already spawned ones
+    missing = lane_to_be_spawned != 0
+    first_missing = jnp.where(missing[:, 0], 0, jnp.where(missing[:, 1], 1, jnp.where(missing[:, 2], 2, -1)))
+    last_missing = jnp.where(missing[:, 2], 2, jnp.where(missing[:, 1], 1, jnp.where(missing[:, 0], 0, -1)))
+    spawn_idx = jnp.where(cycle_moving_left, last_missing, first_missing).astype(jnp.int32)
+
+    # Reference x position from the neighbouring entity (and the one after that for the 1 0 1 pattern).
+    # These are global slot indices and may point into a neighbouring lane.
+    step = jnp.where(cycle_moving_left, -1, 1)
+    reference_idx = lanes * SLOTS_PER_LANE + spawn_idx + step
+    edge_case_reference_idx = lanes * SLOTS_PER_LANE + spawn_idx + 2 * step
+
+    base_spawn_pos = jax.vmap(get_spawn_position)(cycle_moving_left, lanes)
+    spawn_slot = slots[None, :] == spawn_idx[:, None]
+    spawn_shark = jnp.logical_and(spawn_slot, jnp.logical_not(spawn_state.prev_sub)[:, None])
+    spawn_sub = jnp.logical_and(spawn_slot, (spawn_state.prev_sub != 0)[:, None])
+
+    def spawn_lane(lane, grids):
+        """Final slots of one lane: continue its spawn cycle, initialize a new one or leave it unchanged."""
+        shark_grid, sub_grid, to_be_spawned = grids
+
+        def reference_x(idx):
+            shark_x = shark_grid.reshape(-1, 3)[idx, 0]
+            return jnp.where(shark_x != 0, shark_x, sub_grid.reshape(-1, 3)[idx, 0])
+
+        ref_x = reference_x(reference_idx[lane])
+        edge_case = ref_x == 0
+        ref_x = jnp.where(edge_case, reference_x(edge_case_reference_idx[lane]), ref_x)
+
+        # spawn once the reference entity is 16 / 32 pixels away from the spawn position
+        offset = jnp.where(edge_case, 32, 16)
+        should_spawn = jnp.abs(base_spawn_pos[lane, 0] - ref_x) >= offset
+        # in case reference_x is still 0 (the player destroyed the first entity in the wave), spawn instantly
+        should_spawn = jnp.where(ref_x == 0, True, should_spawn)
+        spawn_pos = jnp.where(should_spawn, base_spawn_pos[lane], jnp.zeros(3))
 
-        base_pos = get_spawn_position(moving_left, jnp.array(i))
-        # spawn the first enemy in the wave
-        new_shark_positions = jnp.where(
-            is_sub,
-            shark_positions,
-            shark_positions.at[(i * 3 + first_slot)].set(base_pos),
-        )
+        def lane_update(continued, initialized, unchanged):
+            return jnp.where(keep_spawning[lane], continued, jnp.where(initialize[lane], initialized, unchanged))
 
-        new_sub_positions = jnp.where(
-            is_sub, sub_positions.at[(i * 3 + first_slot)].set(base_pos), sub_positions
+        lane_sharks = lane_update(
+            jnp.where(spawn_shark[lane][:, None], spawn_pos, shark_grid[lane]), init_shark_grid[lane], shark_grid[lane]
         )
-
-        # wipe the survived status for this lane (since we are starting a new wave)
-        indices = jnp.array([i * 3, i * 3 + 1, i * 3 + 2])
-        new_survived_full = spawn_state.survived.at[indices].set(
-            jnp.zeros(3, dtype=jnp.int32)
+        lane_subs = lane_update(
+            jnp.where(spawn_sub[lane][:, None], spawn_pos, sub_grid[lane]), init_sub_grid[lane], sub_grid[lane]
         )
-
-        # Set moving_left to the opposite of moving_left when determining which slot to clear in to_be_spawned
-        new_to_be_spawned = current_pattern.at[jnp.where(moving_left, 0, 2)].set(0)
-
-        # Update the full to_be_spawned array for this lane
-        new_full_to_be_spawned = spawn_state.to_be_spawned.at[indices].set(
-            new_to_be_spawned
+        lane_to_be_spawned = lane_update(
+            jnp.where(jnp.logical_and(spawn_slot[lane], should_spawn), 0, to_be_spawned[lane]),
+            init_to_be_spawned[lane],
+            to_be_spawned[lane],
         )
-
-        new_spawn_state = SpawnState(
-            difficulty=spawn_state.difficulty,
-            lane_dependent_pattern=spawn_state.lane_dependent_pattern.at[i].set(
-                lane_specific_pattern
-            ),
-            to_be_spawned=new_full_to_be_spawned,
-            survived=new_survived_full,
-            prev_sub=spawn_state.prev_sub.at[i].set(is_sub),
-            spawn_timers=spawn_state.spawn_timers.at[i].set(200),
-            diver_array=spawn_state.diver_array,
-            lane_directions=spawn_state.lane_directions,
+        return (
+            shark_grid.at[lane].set(lane_sharks.astype(shark_grid.dtype)),
+            sub_grid.at[lane].set(lane_subs.astype(sub_grid.dtype)),
+            to_be_spawned.at[lane].set(lane_to_be_spawned.astype(to_be_spawned.dtype)),
         )
 
-        return new_spawn_state, new_shark_positions, new_sub_positions, diver_positions, rng
-
-    # Modified continue_spawn_cycle to handle RNG
-    def continue_spawn_cycle(i: int, carry):
-        spawn_state, shark_positions, sub_positions, diver_positions, rng = carry
-
-        # Rest of function remains the same, just pass along the RNG
-        # get the relevant missing entities for this lane from the to_be_spawned array
-        relevant_to_be_spawned = jax.lax.dynamic_slice(
-            spawn_state.to_be_spawned, (i * 3,), (3,)
-        )
+    # The lanes are updated one after another, so a lane reads the reference positions of the
+    # already updated lanes before it and of the not yet updated lanes after it
+    grid_dtype = jnp.result_type(shark_grid, init_shark_grid, jnp.zeros(3))
+    new_shark_grid, new_sub_grid, new_to_be_spawned = jax.lax.fori_loop(
+        0,
+        NUM_LANES,
+        spawn_lane,
+        (
+            shark_grid.astype(grid_dtype),
+            sub_grid.astype(grid_dtype),
+            lane_to_be_spawned.astype(jnp.result_type(lane_to_be_spawned, init_to_be_spawned)),
+        ),
+    )
+    new_shark_positions = new_shark_grid.reshape(shark_positions.shape)
+    new_sub_positions = new_sub_grid.reshape(sub_positions.shape)
 
-        # check in which direction we are moving by finding the first non-zero value in the missing_entities array
-        moving_left = jnp.where(
-            relevant_to_be_spawned[0] == 0,
-            jnp.where(
-                relevant_to_be_spawned[1] == 0,
-                jnp.where(relevant_to_be_spawned[2] == -1, True, False),
-                jnp.where(relevant_to_be_spawned[1] == -1, True, False),
-            ),
-            jnp.where(relevant_to_be_spawned[0] == -1, True, False),
-        )
+    # every initialized lane consumes one split of the rng key (in lane order)
+    new_rng = jax.lax.fori_loop(0, jnp.sum(initialize), lambda _, key: jax.random.split(key)[0], rng)
 
-        # Find the index of the first non-zero value based on direction
-        def scan_right_to_left(j, val):
-            return jnp.where(relevant_to_be_spawned[2 - j] != 0, 2 - j, val)
+    new_spawn_state = spawn_state._replace(
+        lane_dependent_pattern=jnp.where(
+            initialize, lane_specific_pattern, spawn_state.lane_dependent_pattern
+        ),
+        to_be_spawned=new_to_be_spawned.reshape(spawn_state.to_be_spawned.shape),
+        survived=jnp.where(initialize[:, None], 0, lane_survived).reshape(spawn_state.survived.shape),
+        prev_sub=jnp.where(initialize, is_sub, spawn_state.prev_sub),
+        spawn_timers=jnp.where(initialize, 200, new_spawn_timers),
+    )
 
-        def scan_left_to_right(j, val):
-            return jnp.where(relevant_to_be_spawned[j] != 0, j, val)
+    return new_spawn_state, new_shark_positions, new_sub_positions, new_rng
 
-        # Use fori_loop to scan array in appropriate direction
-        spawn_idx = jax.lax.cond(
-            moving_left,
-            lambda _: jax.lax.fori_loop(0, 3, scan_left_to_right, -1),
-            lambda _: jax.lax.fori_loop(0, 3, scan_right_to_left, -1),
-            operand=None,
-        )
+@jax.jit
+def get_shark_offset(
+    step_counter,
+):  # shark offset should be constant over the difficulty levels..
+    phase = step_counter // 4
+    cycle_position = phase % 32
+
+    raw_offset = jnp.where(
+        cycle_position < 16,
+        cycle_position // 2,  # 0->7
+        7 - (cycle_position - 16) // 2,  # 7->0
+    )
 
-        spawn_idx = spawn_idx.astype(jnp.int32)
+    return raw_offset - 4
 
-        # Get reference x position from neighboring entity
-        # For moving right, look at entity to the right (spawn_idx + 1)
-        # For moving left, look at entity to the left (spawn_idx - 1)
-        reference_idx = jnp.where(moving_left, spawn_idx - 1, spawn_idx + 1)
-        reference_idx = reference_idx.astype(jnp.int32)
-        base_idx = i * 3  # Base index for this lane's entities
+@jax.jit
+def calculate_movement_speed(step_counter, difficulty):
+    """Calculate movement speed with JIT-compatible operations.
+    Uses array indexing and jnp.select for cleaner, switch-case-like behavior.
 
-        # Get position from either shark or sub position arrays
-        # We'll need to check both since we don't know which type exists
-        reference_shark_pos = shark_positions[base_idx + reference_idx]
-        reference_sub_pos = sub_positions[base_idx + reference_idx]
+    Args:
+        step_counter: Current step counter
+        difficulty: Current difficulty level (0-255)
 
-        # Use whichever position is non-zero (active)
-        reference_x = jnp.where(
-            reference_shark_pos[0] != 0, reference_shark_pos[0], reference_sub_pos[0]
-        )
+    Returns:
+        Movement speed for the current frame
+    """
+    cycle_pos = step_counter % 12
 
-        edge_case = reference_x == 0
-        # Edge Case: third option exists for the pattern 1 0 1, then check the next entity
-        edge_case_reference_idx = jnp.where(moving_left, spawn_idx - 2, spawn_idx + 2)
+    # Handling difficulties 0-9 using array lookup
 
-        edge_case_reference_idx = edge_case_reference_idx.astype(jnp.int32)
+    # Ensure difficulty is non-negative (safety check)
+    safe_difficulty = jnp.maximum(0, difficulty)
 
-        reference_x = jnp.where(
-            edge_case,
-            jnp.where(
-                shark_positions[base_idx + edge_case_reference_idx][0] != 0,
-                shark_positions[base_idx + edge_case_reference_idx][0],
-                sub_positions[base_idx + edge_case_reference_idx][0],
-            ),
-            reference_x,
-        )
+    # Create a boolean array for each difficulty bracket (0-9)
+    diff_brackets = jnp.array(
+        [
+            safe_difficulty == 0,  # Difficulty 0
+            jnp.logical_and(
+                safe_difficulty >= 1, safe_difficulty <= 2
+            ),  # Difficulty 1-2
+            jnp.logical_and(
+                safe_difficulty >= 3, safe_difficulty <= 4
+            ),  # Difficulty 3-4
+            jnp.logical_and(
+                safe_difficulty >= 5, safe_difficulty <= 6
+            ),  # Difficulty 5-6
+            jnp.logical_and(
+                safe_difficulty >= 7, safe_difficulty <= 8
+            ),  # Difficulty 7-8
+            safe_difficulty == 9,  # Difficulty 9
+        ]
+    )
 
-        # Get base spawn position for this lane
-        base_spawn_pos = get_spawn_position(moving_left, jnp.array(i))
+    # Create an array of movement patterns
+    should_move_patterns = jnp.array(
+        [
+            (cycle_pos % 3) == 0,  # Difficulty 0: 33% movement (1 in 3 frames)
+            (cycle_pos % 2) == 0,  # Difficulty 1-2: 50% movement (1 in 2 frames)
+            (cycle_pos % 3) != 2,  # Difficulty 3-4: 67% movement (2 in 3 frames)
+            (cycle_pos % 4) != 3,  # Difficulty 5-6: 75% movement (3 in 4 frames)
+            (cycle_pos % 6) != 5,  # Difficulty 7-8: 83% movement (5 in 6 frames)
+            cycle_pos != 11,  # Difficulty 9: 92% movement (11 in 12 frames)
+        ]
+    )
 
-        # check if the base spawn position x is 16 / 32 pixels away from the reference x position (depending on the edge case pattern)
-        # if yes, spawn the entity, if no, do nothing
-        offset = jnp.where(edge_case, 32, 16)
-        should_spawn = jnp.abs(base_spawn_pos[0] - reference_x) >= offset
+    # Use jnp.select to choose the correct movement pattern (like a switch-case)
+    # Default to False to ensure predictable behavior for unexpected difficulty values
+    should_move = jnp.select(diff_brackets, should_move_patterns, default=False)
 
-        # in case reference_x is still 0 (happens in case the player destroyed the first entity in the wave), we just instantly spawn the entity
-        should_spawn = jnp.where(reference_x == 0, True, should_spawn)
+    # For difficulties 0-9, return 1 if should move, 0 otherwise
+    speed_for_diff_0_9 = jnp.where(should_move, 1, 0)
 
-        spawn_pos = jnp.where(should_spawn, base_spawn_pos, jnp.zeros(3))
+    # For difficulty 10+
+    # Handle wrapping at difficulty 255
+    adjusted_difficulty = difficulty % 256
 
-        # Update positions based on enemy type
-        new_shark_positions = shark_positions.at[base_idx + spawn_idx].set(
-            jnp.where(
-                jnp.logical_not(spawn_state.prev_sub[i]),
-                spawn_pos,
-                shark_positions[base_idx + spawn_idx],
-            )
-        )
-        new_sub_positions = sub_positions.at[base_idx + spawn_idx].set(
-            jnp.where(
-                spawn_state.prev_sub[i], spawn_pos, sub_positions[base_idx + spawn_idx]
-            )
-        )
+    # Handle difficulty 10+ with tier-based speeds
+    # For difficulties < 10, these calculations aren't used
+    diff_above_threshold = jnp.maximum(0, adjusted_difficulty - 10)
 
-        # Update the to_be_spawned array
-        new_to_be_spawned = spawn_state.to_be_spawned.at[base_idx + spawn_idx].set(
-            jnp.where(
-                should_spawn,
-                jnp.array(0),  # Single value
-                spawn_state.to_be_spawned[base_idx + spawn_idx],
-            )
-        )
+    # Base speed calculation (tier-based)
+    # Difficulty 10-25: Base speed 1
+    # Difficulty 26-41: Base speed 2, etc.
+    base_speed = 1 + (diff_above_threshold // 16)
 
-        # Then create the new spawn state with the updated array
-        new_spawn_state = SpawnState(
-            difficulty=spawn_state.difficulty,
-            lane_dependent_pattern=spawn_state.lane_dependent_pattern,
-            to_be_spawned=new_to_be_spawned,
-            survived=spawn_state.survived,
-            prev_sub=spawn_state.prev_sub,
-            spawn_timers=spawn_state.spawn_timers,
-            diver_array=spawn_state.diver_array,
-            lane_directions=spawn_state.lane_directions,
-        )
+    # Calculate position within the current tier (0-15)
+    position_in_tier = diff_above_threshold % 16
 
-        return new_spawn_state, new_shark_positions, new_sub_positions, diver_positions, rng
+    # Create position bracket array (much cleaner than nested where statements)
+    pos_brackets = jnp.array(
+        [
+            position_in_tier == 0,  # Position 0
+            jnp.logical_and(
+                position_in_tier >= 1, position_in_tier <= 3
+            ),  # Position 1-3
+            jnp.logical_and(
+                position_in_tier >= 4, position_in_tier <= 6
+            ),  # Position 4-6
+            jnp.logical_and(
+                position_in_tier >= 7, position_in_tier <= 9
+            ),  # Position 7-9
+            jnp.logical_and(
+                position_in_tier >= 10, position_in_tier <= 12
+            ),  # Position 10-12
+            jnp.logical_and(
+                position_in_tier >= 13, position_in_tier <= 14
+            ),  # Position 13-14
+            position_in_tier == 15,  # Position 15
+        ]
+    )
 
-    # Modified process_lane to handle RNG
-    def process_lane(i, carry):
-        loc_spawn_state, shark_positions, sub_positions, diver_positions, rng = carry
-        base_idx = i * 3  # Base index for this lane's slots
+    # Create array of higher speed patterns
+    higher_speed_patterns = jnp.array(
+        [
+            (step_counter % 16) == 0,  # Position 0: 1 in 16 frames (6.25%)
+            (step_counter % 8) == 0,  # Position 1-3: 1 in 8 frames (12.5%)
+            (step_counter % 4) == 0,  # Position 4-6: 1 in 4 frames (25%)
+            (step_counter % 2) == 0,  # Position 7-9: 1 in 2 frames (50%)
+            (step_counter % 4) != 0,  # Position 10-12: 3 in 4 frames (75%)
+            (step_counter % 8) != 0,  # Position 13-14: 7 in 8 frames (87.5%)
+            (step_counter % 16) != 0,  # Position 15: 15 in 16 frames (93.75%)
+        ]
+    )
 
-        # determine if we need to initialize a new pattern or keep spawning for the current one
-        # do this by checking in the relevant part of the to_be_spawned array if there are still 1s
-        relevant_to_be_spawned = jax.lax.dynamic_slice(
-            spawn_state.to_be_spawned, (base_idx,), (3,)
-        )
+    # Use jnp.select to choose the pattern (like a switch-case)
+    use_higher_speed = jnp.select(
+        pos_brackets, higher_speed_patterns, default=False
+    )
 
-        # if there are still 1s in the relevant part of the to_be_spawned array, keep spawning
-        keep_spawning = jnp.any(relevant_to_be_spawned)
-
-        # check the lane spawn timer
-        lane_timer = spawn_state.spawn_timers[i]
-
-        lane_empty = jnp.all(
-            jnp.array(
-                [
-                    jnp.logical_and(
-                        is_slot_empty(shark_positions[base_idx + j]),
-                        is_slot_empty(sub_positions[base_idx + j]),
-                    )
-                    for j in range(3)
-                ]
-            )
-        )
+    # Higher speed is base_speed + 1
+    higher_speed = base_speed + 1
 
-        # if the lane timer is unequal to 0, continue_spawn_cycle may still be called but initialize_new_spawn_cycle should not be called
-        allow_new_initialization = jnp.logical_and(lane_timer == 0, lane_empty)
+    # Speed for difficulty 10+: either base_speed or higher_speed
+    speed_for_diff_10_plus = jnp.where(use_higher_speed, higher_speed, base_speed)
 
-        def handle_no_spawning(x):
-            spawn_state, shark_positions, sub_positions, diver_positions, rng = x
-            return jax.lax.cond(
-                allow_new_initialization,
-                lambda y: initialize_new_spawn_cycle(i, y),
-                lambda y: (y[0], y[1], y[2], y[3], y[4]),  # Return unchanged state
-                (spawn_state, shark_positions, sub_positions, diver_positions, rng),
-            )
+    # Return appropriate speed based on difficulty
+    # Use safe_difficulty to ensure consistent behavior with negative inputs
+    return jnp.where(
+        safe_difficulty < 10, speed_for_diff_0_9, speed_for_diff_10_plus
+    )
 
-        new_spawn_state, new_shark_positions, new_sub_positions, new_diver_positions, new_rng = jax.lax.cond(
-            keep_spawning,
-            lambda x: continue_spawn_cycle(i, x),
-            handle_no_spawning,
-            (loc_spawn_state, shark_positions, sub_positions, diver_positions, rng),
-        )
+@jax.jit
+def move_enemies(
+    table: EnemyTable, difficulty: chex.Array, step_counter: chex.Array
+) -> Tuple[EnemyTable, chex.Array]:
+    """Move every enemy of the table by one frame.
 
-        return new_spawn_state, new_shark_positions, new_sub_positions, new_diver_positions, new_rng
-
-    # Modify lane_needs_update to work with the rest of the function
-    def lane_needs_update(i, spawn_state, shark_positions, sub_positions):
-        base_idx = i * 3  # Base index for this lane's slots
-
-        # get how many entities in this lane are inactive
-        lane_empty = jnp.all(
-            jnp.array(
-                [
-                    jnp.logical_and(
-                        is_slot_empty(shark_positions[base_idx + j]),
-                        is_slot_empty(sub_positions[base_idx + j]),
-                    )
-                    for j in range(3)
-                ]
-            )
-        )
+    Args:
+        table: Entity table of all sharks and submarines
+        difficulty: Current difficulty level (0-255)
+        step_counter: Current step counter
 
-        # check if the to_be_spawned array has any 1s in the relevant part
-        relevant_to_be_spawned = jax.lax.dynamic_slice(
-            spawn_state.to_be_spawned, (base_idx,), (3,)
-        )
+    Returns:
+        The updated table and a (24,) mask of the enemies that left the screen
+    """
+    # Calculate movement speed for this frame and apply direction
+    movement_speed = calculate_movement_speed(step_counter, difficulty)
+    velocity_x = jnp.where(table.dir < 0, -movement_speed, movement_speed)
+
+    # Sharks swim up and down around their lane, submarines are 2 pixels higher than their base position
+    base_y = jnp.asarray(SPAWN_POSITIONS_Y)[table.lane]
+    y_position = jnp.where(
+        table.type == ENEMY_TYPE_SHARK,
+        base_y + get_shark_offset(step_counter),
+        base_y - SUBMARINE_Y_OFFSET,
+    )
 
-        return jnp.logical_or(lane_empty, jnp.any(relevant_to_be_spawned))
+    new_x = jnp.where(table.alive, table.x + velocity_x, table.x)
+    new_y = jnp.where(table.alive, y_position, table.y)
 
-    # Replace the manual loop with lax.scan
-    lane_indices = jnp.arange(4)
-    (final_state, final_shark_positions, final_sub_positions, final_diver_positions, final_rng), _ = jax.lax.scan(
-        scan_lanes,
-        (new_state, shark_positions, sub_positions, diver_positions, rng if rng is not None else jax.random.PRNGKey(42)),
-        lane_indices
+    # Check bounds
+    out_of_bounds = jnp.logical_or(new_x <= -8, new_x >= 168)
+    moved = table._replace(
+        x=jnp.where(out_of_bounds, 0, new_x),
+        y=jnp.where(out_of_bounds, 0, new_y),
+        dir=jnp.where(out_of_bounds, 0, table.dir),
+        alive=jnp.logical_and(table.alive, jnp.logical_not(out_of_bounds)),
     )
-
-    return final_state, final_shark_positions, final_sub_positions, final_rng
+    return moved, out_of_bounds
 
 @jax.jit
 def step_enemy_movement(
@@ -1025,425 +1062,74 @@ def step_enemy_movement(
     # Split RNG key for direction randomization
     rng, direction_rng = jax.random.split(rng)
 
-    def get_shark_offset(
-        step_counter,
-    ):  # shark offset should be constant over the difficulty levels..
-        phase = step_counter // 4
-        cycle_position = phase % 32
-
-        raw_offset = jnp.where(
-            cycle_position < 16,
-            cycle_position // 2,  # 0->7
-            7 - (cycle_position - 16) // 2,  # 7->0
-        )
-
-        return raw_offset - 4
-
-    def calculate_movement_speed(step_counter, difficulty):
-        """Calculate movement speed with JIT-compatible operations.
-        Uses array indexing and jnp.select for cleaner, switch-case-like behavior.
-
-        Args:
-            step_counter: Current step counter
-            difficulty: Current difficulty level (0-255)
-
-        Returns:
-            Movement speed for the current frame
-        """
-        cycle_pos = step_counter % 12
-
-        # Handling difficulties 0-9 using array lookup
-
-        # Ensure difficulty is non-negative (safety check)
-        safe_difficulty = jnp.maximum(0, difficulty)
-
-        # Create a boolean array for each difficulty bracket (0-9)
-        diff_brackets = jnp.array(
-            [
-                safe_difficulty == 0,  # Difficulty 0
-                jnp.logical_and(
-                    safe_difficulty >= 1, safe_difficulty <= 2
-                ),  # Difficulty 1-2
-                jnp.logical_and(
-                    safe_difficulty >= 3, safe_difficulty <= 4
-                ),  # Difficulty 3-4
-                jnp.logical_and(
-                    safe_difficulty >= 5, safe_difficulty <= 6
-                ),  # Difficulty 5-6
-                jnp.logical_and(
-                    safe_difficulty >= 7, safe_difficulty <= 8
-                ),  # Difficulty 7-8
-                safe_difficulty == 9,  # Difficulty 9
-            ]
-        )
-
-        # Create an array of movement patterns
-        should_move_patterns = jnp.array(
-            [
-                (cycle_pos % 3) == 0,  # Difficulty 0: 33% movement (1 in 3 frames)
-                (cycle_pos % 2) == 0,  # Difficulty 1-2: 50% movement (1 in 2 frames)
-                (cycle_pos % 3) != 2,  # Difficulty 3-4: 67% movement (2 in 3 frames)
-                (cycle_pos % 4) != 3,  # Difficulty 5-6: 75% movement (3 in 4 frames)
-                (cycle_pos % 6) != 5,  # Difficulty 7-8: 83% movement (5 in 6 frames)
-                cycle_pos != 11,  # Difficulty 9: 92% movement (11 in 12 frames)
-            ]
-        )
-
-        # Use jnp.select to choose the correct movement pattern (like a switch-case)
-        # Default to False to ensure predictable behavior for unexpected difficulty values
-        should_move = jnp.select(diff_brackets, should_move_patterns, default=False)
-
-        # For difficulties 0-9, return 1 if should move, 0 otherwise
-        speed_for_diff_0_9 = jnp.where(should_move, 1, 0)
+    # one key per (type, lane), consumed shark lanes first and then submarine lanes
+    def split_lane_key(key, _):
+        lane_key, key = jax.random.split(key)
+        return key, lane_key
 
-        # For difficulty 10+
-        # Handle wrapping at difficulty 255
-        adjusted_difficulty = difficulty % 256
+    direction_rng, lane_keys = jax.lax.scan(split_lane_key, direction_rng, None, length=2 * NUM_LANES)
+    random_directions = jax.vmap(lambda key: jax.random.bernoulli(key, 0.5))(lane_keys).reshape(2, NUM_LANES)
 
-        # Handle difficulty 10+ with tier-based speeds
-        # For difficulties < 10, these calculations aren't used
-        diff_above_threshold = jnp.maximum(0, adjusted_difficulty - 10)
-
-        # Base speed calculation (tier-based)
-        # Difficulty 10-25: Base speed 1
-        # Difficulty 26-41: Base speed 2, etc.
-        base_speed = 1 + (diff_above_threshold // 16)
-
-        # Calculate position within the current tier (0-15)
-        position_in_tier = diff_above_threshold % 16
-
-        # Create position bracket array (much cleaner than nested where statements)
-        pos_brackets = jnp.array(
-            [
-                position_in_tier == 0,  # Position 0
-                jnp.logical_and(
-                    position_in_tier >= 1, position_in_tier <= 3
-                ),  # Position 1-3
-                jnp.logical_and(
-                    position_in_tier >= 4, position_in_tier <= 6
-                ),  # Position 4-6
-                jnp.logical_and(
-                    position_in_tier >= 7, position_in_tier <= 9
-                ),  # Position 7-9
-                jnp.logical_and(
-                    position_in_tier >= 10, position_in_tier <= 12
-                ),  # Position 10-12
-                jnp.logical_and(
-                    position_in_tier >= 13, position_in_tier <= 14
-                ),  # Position 13-14
-                position_in_tier == 15,  # Position 15
-            ]
-        )
-
-        # Create array of higher speed patterns
-        higher_speed_patterns = jnp.array(
-            [
-                (step_counter % 16) == 0,  # Position 0: 1 in 16 frames (6.25%)
-                (step_counter % 8) == 0,  # Position 1-3: 1 in 8 frames (12.5%)
-                (step_counter % 4) == 0,  # Position 4-6: 1 in 4 frames (25%)
-                (step_counter % 2) == 0,  # Position 7-9: 1 in 2 frames (50%)
-                (step_counter % 4) != 0,  # Position 10-12: 3 in 4 frames (75%)
-                (step_counter % 8) != 0,  # Position 13-14: 7 in 8 frames (87.5%)
-                (step_counter % 16) != 0,  # Position 15: 15 in 16 frames (93.75%)
-            ]
-        )
-
-        # Use jnp.select to choose the pattern (like a switch-case)
-        use_higher_speed = jnp.select(
-            pos_brackets, higher_speed_patterns, default=False
-        )
-
-        # Higher speed is base_speed + 1
-        higher_speed = base_speed + 1
-
-        # Speed for difficulty 10+: either base_speed or higher_speed
-        speed_for_diff_10_plus = jnp.where(use_higher_speed, higher_speed, base_speed)
-
-        # Return appropriate speed based on difficulty
-        # Use safe_difficulty to ensure consistent behavior with negative inputs
-        return jnp.where(
-            safe_difficulty < 10, speed_for_diff_0_9, speed_for_diff_10_plus
-        )
-
-    def move_enemy(pos, is_shark, difficulty, slot_idx, step_counter):
-        """Move enemy based on difficulty and pattern.
-
-        Args:
-            pos: Current position (x, y, direction)
-            is_shark: Boolean indicating if this is a shark
-            difficulty: Current difficulty level (0-255)
-            slot_idx: Slot index (for lane determination)
-            step_counter: Current step counter
-
-        Returns:
-            New position and whether the enemy is out of bounds
-        """
-        is_active = jnp.logical_not(is_slot_empty(pos))
-        moving_left = pos[2] < 0
-
-        # Calculate movement speed for this frame
-        movement_speed = calculate_movement_speed(step_counter, difficulty)
-
-        # Apply direction
-        velocity_x = jnp.where(moving_left, -movement_speed, movement_speed)
-
-        # Base Y position comes from spawn positions
-        base_y = SPAWN_POSITIONS_Y[slot_idx // 3]  # Divide by 3 to get lane index
-
-        # Calculate Y position
-        y_position = jnp.where(
-            is_shark,
-            base_y + get_shark_offset(step_counter),
-            # Submarines are 2 pixels higher than their base position
-            base_y - SUBMARINE_Y_OFFSET,
-        )
-
-        # Apply movements
-        new_pos = jnp.where(
-            is_active, jnp.array([pos[0] + velocity_x, y_position, pos[2]]), pos
-        )
-
-        # Check bounds
-        out_of_bounds = jnp.logical_or(new_pos[0] <= -8, new_pos[0] >= 168)
-        return jnp.where(out_of_bounds, jnp.zeros_like(new_pos), new_pos), out_of_bounds
-
-    new_shark_positions = jnp.zeros_like(shark_positions)
-    new_sub_positions = jnp.zeros_like(sub_positions)
-    new_survived = spawn_state.survived
+    table = to_enemy_table(shark_positions, sub_positions)
+    moved_table, out_of_bounds = move_enemies(table, spawn_state.difficulty, step_counter)
+    new_shark_positions, new_sub_positions = from_enemy_table(moved_table)
 
     survived_dtype = spawn_state.survived.dtype
-    new_lane_directions = spawn_state.lane_directions
+    out_of_bounds = out_of_bounds.reshape(2, NUM_LANES, SLOTS_PER_LANE)
+    front_directions = lane_front_direction(
+        table.dir.reshape(2, NUM_LANES, SLOTS_PER_LANE)
+    ).astype(survived_dtype)
 
-    def process_shark_lane(carry, lane_idx):
-        new_shark_positions, new_survived, new_lane_directions, new_diver_array, new_spawn_timers, direction_rng = carry
-
-        # Static indices relative to lane start
-        base_idx = lane_idx * 3
-        rel_indices = jnp.array([0, 1, 2])  # These are fixed/static
+    old_survived = spawn_state.survived.reshape(NUM_LANES, SLOTS_PER_LANE)
+    new_survived = old_survived
+    new_lane_directions = spawn_state.lane_directions
+    new_diver_array = spawn_state.diver_array
+    new_spawn_timers = spawn_state.spawn_timers
 
-        # Get direction of first shark in lane
-        lane_sharks = jax.lax.dynamic_slice(shark_positions, (base_idx, 0), (3, 3))
+    # sharks first, then submarines (the submarine pass sees the survived state of the shark pass)
+    for enemy_type in (ENEMY_TYPE_SHARK, ENEMY_TYPE_SUB):
+        direction = front_directions[enemy_type]
 
-        direction_of_shark = jnp.where(
-            lane_sharks[0, 2] == 0,
-            jnp.where(
-                lane_sharks[1, 2] == 0,
-                lane_sharks[2, 2],
-                lane_sharks[1, 2]
-            ),
-            lane_sharks[0, 2]
+        # enemies that left the screen survived in the direction of their lane
+        survived_values = jnp.where(
+            out_of_bounds[enemy_type], direction[:, None], new_survived
         ).astype(survived_dtype)
 
-        # Create slot indices by adding base_idx to each relative index
-        slot_indices = base_idx + rel_indices
-
-        # Process all sharks in this lane simultaneously
-        def process_shark(shark_pos, slot_idx):
-            new_pos, survived = move_enemy(
-                shark_pos, True, spawn_state.difficulty, slot_idx, step_counter
-            )
-            survived_value = jnp.where(
-                survived, direction_of_shark, new_survived[slot_idx]
-            ).astype(survived_dtype)
-
-            return new_pos, survived_value
-
-        # Process all sharks in this lane simultaneously
-        new_positions, survived_values = jax.vmap(process_shark)(
-            lane_sharks, slot_indices
-        )
-
-        # Update positions using dynamic_update_slice instead of .at indexing with dynamic indices
-        new_shark_positions = jax.lax.dynamic_update_slice(
-            new_shark_positions, new_positions, (base_idx, 0)
-        )
-
-        # For survived values, we need to reshape to match dimensions
-        # (assuming survived values is a 1D array of length 3)
-        new_survived = jax.lax.dynamic_update_slice(
-            new_survived, survived_values, (base_idx,)
-        )
-
-        # Get survived status for lane
-        lane_survived = survived_values  # We already have this from above
-
-        # Randomize lane direction if any shark survived
-        direction_rng, next_rng = jax.random.split(direction_rng)
+        # Randomize lane direction if any enemy survived
         new_lane_directions = jnp.where(
-            jnp.any(lane_survived != 0),
-            new_lane_directions.at[lane_idx].set(
-                jnp.where(
-                    jax.random.bernoulli(direction_rng, 0.5),
-                    jnp.array(1, dtype=survived_dtype),
-                    jnp.array(-1, dtype=survived_dtype)
-                )
-            ),
-            new_lane_directions
-        )
-
-        # Direction flipping logic
-        new_lane_survived = jnp.where(
-            direction_of_shark == -1,
-            jnp.flip(lane_survived),
-            lane_survived
-        )
-
-        # Update lane survived status
-        new_survived = jax.lax.dynamic_update_slice(
-            new_survived, new_lane_survived, (base_idx,)
-        )
-
-        # Get survived status for lane
-        lane_survived = survived_values  # We already have this from above
-
-        # Check if any shark in the lane survived in THIS frame
-        # Compare new survived values with old ones to detect changes
-        old_survived = jax.lax.dynamic_slice(spawn_state.survived, (base_idx,), (3,))
-        any_new_survived = jnp.any(jnp.logical_and(lane_survived != 0, old_survived == 0))
-
-        # Update diver_array if needed
-        new_diver_array = jnp.where(
-            jnp.logical_and(any_new_survived, new_diver_array[lane_idx] == -1),
-            new_diver_array.at[lane_idx].set(1),
-            new_diver_array
-        )
-
-        # Reset spawn timer only when an enemy survives in this frame
-        new_spawn_timers = new_spawn_timers.at[lane_idx].set(
-            jnp.where(
-                any_new_survived,
-                200,  # Reset to 200 when an enemy survives in this frame
-                new_spawn_timers[lane_idx]
-            )
-        )
-
-        return (new_shark_positions, new_survived, new_lane_directions, new_diver_array, new_spawn_timers, next_rng), None
-
-    # Similar changes for process_sub_lane
-    def process_sub_lane(carry, lane_idx):
-        new_sub_positions, new_survived, new_lane_directions, new_diver_array, new_spawn_timers, direction_rng = carry
-
-        # Static indices relative to lane start
-        base_idx = lane_idx * 3
-        rel_indices = jnp.array([0, 1, 2])  # These are fixed/static
-
-        # Get direction of first sub in lane
-        lane_subs = jax.lax.dynamic_slice(sub_positions, (base_idx, 0), (3, 3))
-
-        direction_of_sub = jnp.where(
-            lane_subs[0, 2] == 0,
+            jnp.any(survived_values != 0, axis=1),
             jnp.where(
-                lane_subs[1, 2] == 0,
-                lane_subs[2, 2],
-                lane_subs[1, 2]
+                random_directions[enemy_type],
+                jnp.array(1, dtype=survived_dtype),
+                jnp.array(-1, dtype=survived_dtype),
             ),
-            lane_subs[0, 2]
-        ).astype(survived_dtype)
-
-        # Create slot indices by adding base_idx to each relative index
-        slot_indices = base_idx + rel_indices
-
-        def process_sub(sub_pos, slot_idx):
-            new_pos, survived = move_enemy(
-                sub_pos, False, spawn_state.difficulty, slot_idx, step_counter
-            )
-            survived_value = jnp.where(
-                survived, direction_of_sub, new_survived[slot_idx]
-            ).astype(survived_dtype)
-
-            return new_pos, survived_value
-
-        # Process all subs in this lane simultaneously
-        new_positions, survived_values = jax.vmap(process_sub)(
-            lane_subs, slot_indices
-        )
-
-        # Update positions using dynamic_update_slice
-        new_sub_positions = jax.lax.dynamic_update_slice(
-            new_sub_positions, new_positions, (base_idx, 0)
-        )
-
-        # For survived values
-        new_survived = jax.lax.dynamic_update_slice(
-            new_survived, survived_values, (base_idx,)
-        )
-
-        # Get survived status for lane
-        lane_survived = survived_values  # We already have this from above
-
-        # Randomize lane direction if any sub survived
-        direction_rng, next_rng = jax.random.split(direction_rng)
-        new_lane_directions = jnp.where(
-            jnp.any(lane_survived != 0),
-            new_lane_directions.at[lane_idx].set(
-                jnp.where(
-                    jax.random.bernoulli(direction_rng, 0.5),
-                    jnp.array(1, dtype=survived_dtype),
-                    jnp.array(-1, dtype=survived_dtype)
-                )
-            ),
-            new_lane_directions
+            new_lane_directions,
         )
 
         # Direction flipping logic
-        new_lane_survived = jnp.where(
-            direction_of_sub == -1,
-            jnp.flip(lane_survived),
-            lane_survived
+        new_survived = jnp.where(
+            (direction == -1)[:, None], jnp.flip(survived_values, axis=1), survived_values
         )
 
-        # Update lane survived status
-        new_survived = jax.lax.dynamic_update_slice(
-            new_survived, new_lane_survived, (base_idx,)
+        # Check if any enemy in the lane survived in THIS frame
+        any_new_survived = jnp.any(
+            jnp.logical_and(survived_values != 0, old_survived == 0), axis=1
         )
 
-        # Get survived status for lane
-        lane_survived = survived_values  # We already have this from above
-
-        # Check if any submarine in the lane survived in THIS frame
-        # Compare new survived values with old ones to detect changes
-        old_survived = jax.lax.dynamic_slice(spawn_state.survived, (base_idx,), (3,))
-        any_new_survived = jnp.any(jnp.logical_and(lane_survived != 0, old_survived == 0))
-
         # Update diver_array if needed
         new_diver_array = jnp.where(
-            jnp.logical_and(any_new_survived, new_diver_array[lane_idx] == -1),
-            new_diver_array.at[lane_idx].set(1),
-            new_diver_array
+            jnp.logical_and(any_new_survived, new_diver_array == -1), 1, new_diver_array
         )
 
         # Reset spawn timer only when an enemy survives in this frame
-        new_spawn_timers = new_spawn_timers.at[lane_idx].set(
-            jnp.where(
-                any_new_survived,
-                200,  # Reset to 200 when an enemy survives in this frame
-                new_spawn_timers[lane_idx]
-            )
-        )
-
-        return (new_sub_positions, new_survived, new_lane_directions, new_diver_array, new_spawn_timers, next_rng), None
-
-    # Replace shark lane for-loop with scan
-    lane_indices = jnp.arange(4)
-    (new_shark_positions, new_survived, new_lane_directions, new_diver_array, new_spawn_timers, direction_rng), _ = jax.lax.scan(
-        process_shark_lane,
-        (new_shark_positions, new_survived, new_lane_directions, spawn_state.diver_array, spawn_state.spawn_timers, direction_rng),
-        lane_indices
-    )
-
-    # Replace submarine lane for-loop with scan
-    (new_sub_positions, new_survived, new_lane_directions, new_diver_array, new_spawn_timers, direction_rng), _ = jax.lax.scan(
-        process_sub_lane,
-        (new_sub_positions, new_survived, new_lane_directions, new_diver_array, new_spawn_timers, direction_rng),
-        lane_indices
-    )
+        new_spawn_timers = jnp.where(any_new_survived, 200, new_spawn_timers)
 
     # Update spawn state with new survived status
     new_spawn_state = spawn_state._replace(
-        survived=new_survived,
+        survived=new_survived.reshape(spawn_state.survived.shape),
         lane_directions=new_lane_directions,
         diver_array=new_diver_array,
-        spawn_timers=new_spawn_timers
+        spawn_timers=new_spawn_timers,
     )
 
     return new_shark_positions, new_sub_positions, new_spawn_state, direction_rng
@@ -1463,6 +1149,8 @@ def spawn_divers(
     2. Divers only spawn in empty lanes (no enemies present)
     3. Divers don't spawn in lanes where submarines will spawn next
 
+    Only lanes whose spawn timer is exactly 60 are processed.
+
     Args:
         spawn_state: Current spawn state containing diver_array
         diver_positions: Current diver positions
@@ -1473,129 +1161,49 @@ def spawn_divers(
     Returns:
         Updated diver positions and updated spawn state
     """
+    diver_array = spawn_state.diver_array
+    lane_ready = spawn_state.spawn_timers == 60
+    lane_empty = lanes_empty(shark_positions, sub_positions)
 
-    def spawn_diver(i, carry):
-        # Unpack carry - (positions_array, diver_array)
-        positions_array, diver_array = carry
-
-        # Get current diver position
-        diver_pos = positions_array[i]
-
-        # Check if a diver exists in this slot
-        diver_exists = diver_pos[2] != 0
-
-        # Base index for this lane's enemies
-        base_idx = i * 3
-
-        # Check if lane has any active enemies
-        lane_empty = jnp.all(
-            jnp.array(
-                [
-                    jnp.logical_and(
-                        is_slot_empty(shark_positions[base_idx + j]),
-                        is_slot_empty(sub_positions[base_idx + j]),
-                    )
-                    for j in range(3)
-                ]
-            )
-        )
-
-        # Check if this lane is marked as available for spawning (1 means spawn allowed)
-        lane_should_spawn = diver_array[i] == 1
-
-        # Combine spawn conditions
-        should_spawn = jnp.logical_and(
-            jnp.logical_not(diver_exists),  # No existing diver
-            jnp.logical_and(lane_should_spawn, lane_empty),
-        )
-
-        # If previous wasn't a sub and something survived, next must be a sub
-        next_entity_is_sub = jnp.logical_and(
-            jnp.logical_not(spawn_state.prev_sub[i]),  # Previous wasn't a sub
-            jnp.any(spawn_state.survived[jnp.array([base_idx, base_idx + 1, base_idx + 2])])  # Something survived
-        )
-
-        # Override the check if previous was a submarine (next will be a shark)
-        next_entity_is_sub = jnp.where(
-            spawn_state.prev_sub[i],  # If previous was a sub
-            False,  # Force to False (allow spawning)
-            next_entity_is_sub  # Otherwise keep original check
-        )
-
-        should_spawn = jnp.logical_and(
-            should_spawn, jnp.logical_not(next_entity_is_sub)
-        )
-
-        # Determine direction based on the to_be_spawned array
-        # Get the relevant to_be_spawned values for this lane
-        lane_to_be_spawned = jax.lax.dynamic_slice(
-            spawn_state.to_be_spawned, (base_idx,), (3,)
-        )
-
-        lane_pattern = spawn_state.lane_dependent_pattern[i]
-
-        # For first wave, use the predefined pattern
-        # For other waves, check the to_be_spawned array for direction info
-        moving_left = spawn_state.lane_directions[i] == 1
-
-        # Set spawn position and direction
-        x_pos = jnp.where(moving_left, 168, 0)
-        direction = jnp.where(moving_left, -1, 1)
-
-        # Spawn diver if conditions are met
-        new_diver = jnp.where(
-            should_spawn,
-            jnp.array([x_pos, DIVER_SPAWN_POSITIONS[i], direction]),
-            diver_pos,
-        )
-
-        # Update the full positions array
-        new_positions_array = positions_array.at[i].set(new_diver)
-
-        # Check for lane ready for next spawn cycle
-        spawn_next_cycle = jnp.logical_and(diver_array[i] == -1, lane_empty)
-
-        # Then apply the next cycle updates to this temporary array
-        final_new_diver_array = diver_array.at[i].set(
-            jnp.where(
-                spawn_next_cycle,
-                jnp.array(1, dtype=jnp.int32),
-                diver_array[i],  # Use direct indexing to get the value
-            )
-        )
-
-        # Return the updated full arrays
-        return new_positions_array, final_new_diver_array
-
-    # Helper function to process a lane only if timer is at 60
-    def process_lane_if_ready(i, carry):
-        positions, diver_array = carry
+    # Only spawn into free diver slots of empty lanes that are marked as available
+    should_spawn = jnp.logical_and(
+        diver_positions[:, 2] == 0,
+        jnp.logical_and(diver_array == 1, lane_empty),
+    )
 
-        # Check if timer for this lane is exactly 60
-        timer_is_60 = spawn_state.spawn_timers[i] == 60
+    # If previous wasn't a sub and something survived, next must be a sub (no diver then)
+    next_entity_is_sub = jnp.logical_and(
+        jnp.logical_not(spawn_state.prev_sub),
+        jnp.any(spawn_state.survived.reshape(NUM_LANES, SLOTS_PER_LANE), axis=1),
+    )
+    next_entity_is_sub = jnp.where(spawn_state.prev_sub, False, next_entity_is_sub)
+    should_spawn = jnp.logical_and(should_spawn, jnp.logical_not(next_entity_is_sub))
 
-        # Run spawn logic only if timer is 60
-        return jax.lax.cond(
-            timer_is_60,
-            lambda c: spawn_diver(i, c),  # Process the lane if timer is 60
-            lambda c: c,  # Skip processing if timer isn't 60
-            (positions, diver_array),
-        )
+    # Set spawn position and direction
+    moving_left = spawn_state.lane_directions == 1
+    new_divers = jnp.stack(
+        [
+            jnp.where(moving_left, 168, 0),
+            jnp.asarray(DIVER_SPAWN_POSITIONS),
+            jnp.where(moving_left, -1, 1),
+        ],
+        axis=1,
+    )
+    new_diver_positions = jnp.where(
+        jnp.logical_and(lane_ready, should_spawn)[:, None], new_divers, diver_positions
+    )
 
-    # Process all lanes, but only execute spawn logic for lanes with timer = 60
-    new_diver_positions, new_diver_array = jax.lax.fori_loop(
-        0,
-        diver_positions.shape[0],
-        process_lane_if_ready,
-        (diver_positions, spawn_state.diver_array),
+    # Check for lanes ready for the next spawn cycle
+    spawn_next_cycle = jnp.logical_and(
+        lane_ready, jnp.logical_and(diver_array == -1, lane_empty)
     )
+    new_diver_array = jnp.where(spawn_next_cycle, jnp.array(1, dtype=jnp.int32), diver_array)
 
     return new_diver_positions, spawn_state._replace(diver_array=new_diver_array)
 
 @jax.jit
 def step_diver_movement(
-    diver_positions: chex.Array,
-    shark_positions: chex.Array,
+    table: EnemyTable,
     state_player_x: chex.Array,
     state_player_y: chex.Array,
     state_divers_collected: chex.Array,
@@ -1604,8 +1212,10 @@ def step_diver_movement(
     rng: chex.PRNGKey,
 ) -> tuple[chex.Array, chex.Array, SpawnState, chex.PRNGKey]:
     """Move divers according to their pattern and handle collisions.
+    The divers and the sharks they meet are read from the entity table.
     Returns updated diver positions, number of collected divers, updated spawn state, and updated RNG key.
     """
+    diver_positions = table_positions(table, ENEMY_TYPE_DIVER)
     new_diver_array = spawn_state.diver_array
 
     def calculate_diver_movement(step_counter, difficulty):
@@ -1825,104 +1435,76 @@ def step_diver_movement(
         # Calculate final speed: higher_speed or base_speed
         return jnp.where(use_higher_speed, higher_speed, base_speed)
 
-    def move_single_diver(i, carry):
-        # Unpack carry state - (positions, collected_count, diver_array)
-        positions, collected, diver_array = carry
-        diver_pos = positions[i]
-
-        # Only process active divers (direction != 0)
-        is_active = diver_pos[2] != 0
-
-        # Check for collision with player first if diver is active
-        player_collision = jnp.logical_and(
-            is_active,
-            check_collision_single(
-                jnp.array([state_player_x, state_player_y]),
-                PLAYER_SIZE,
-                jnp.array([diver_pos[0], diver_pos[1]]),
-                DIVER_SIZE,
-            ),
-        )
+    is_active = diver_positions[:, 2] != 0
+    diver_xy = diver_positions[:, :2]
 
-        # Only collect if we haven't reached max divers
-        can_collect = state_divers_collected < 6
-        should_collect = jnp.logical_and(player_collision, can_collect)
-
-        # Get the three sharks in the lane
-        all_shark_lane_pos = jax.lax.dynamic_slice(shark_positions, (i * 3, 0), (3, 3))
-
-        # Get shark in the same lane for collision check
-        shark_lane_pos = get_front_entity(i, all_shark_lane_pos)
-        shark_collision = jnp.logical_and(
-            is_active,
-            check_collision_single(
-                jnp.array([shark_lane_pos[0], shark_lane_pos[1]]),
-                SHARK_SIZE,
-                jnp.array([diver_pos[0], diver_pos[1]]),
-                DIVER_SIZE,
-            ),
-        )
-
-        # check in which direction the shark is moving and copy the direction to the diver
-        direction_of_shark = jnp.where(
-            shark_lane_pos[2] == 0, diver_pos[2], shark_lane_pos[2]
-        )
-
-        # Calculate movement based on difficulty
-        movement_speed = calculate_diver_movement(step_counter, spawn_state.difficulty)
-        should_move = movement_speed > 0
-
-        # Calculate movement direction (with speed factor)
-        # If colliding with shark, use shark's direction/speed
-        # Otherwise use diver's direction with appropriate speed factor
-        movement_x = jnp.where(
-            shark_collision,
-            shark_lane_pos[2],  # Use shark's direction/speed
-            diver_pos[2] * movement_speed,  # Apply difficulty-based speed
-        )
+    # Check for collision with player first if diver is active
+    player_collision = jnp.logical_and(
+        is_active,
+        check_collision_matrix(
+            jnp.array([[state_player_x, state_player_y]]),
+            PLAYER_SIZE,
+            diver_xy,
+            DIVER_SIZE,
+        )[0],
+    )
 
-        # Calculate new position
-        new_x = jnp.where(
-            shark_collision,
-            diver_pos[0] + movement_x,  # Move with shark
-            jnp.where(
-                should_move,
-                diver_pos[0] + movement_x,  # Move with calculated speed
-                diver_pos[0],  # Stay still
-            ),
-        )
+    # Only collect if we haven't reached max divers
+    can_collect = state_divers_collected < 6
+    should_collect = jnp.logical_and(player_collision, can_collect)
+
+    # Get the front shark of each lane for the collision check
+    shark_lane_pos = get_front_entities(table_positions(table, ENEMY_TYPE_SHARK))
+    shark_collision = jnp.logical_and(
+        is_active,
+        jax.vmap(check_collision_single, in_axes=(0, None, 0, None))(
+            shark_lane_pos[:, :2],
+            SHARK_SIZE,
+            diver_xy,
+            DIVER_SIZE,
+        ),
+    )
 
-        # Check bounds
-        out_of_bounds = jnp.logical_or(new_x <= -8, new_x >= 170)
+    # check in which direction the shark is moving and copy the direction to the diver
+    direction_of_shark = jnp.where(
+        shark_lane_pos[:, 2] == 0, diver_positions[:, 2], shark_lane_pos[:, 2]
+    )
 
-        # Create new position array - handle collection and bounds
-        new_pos = jnp.where(
-            jnp.logical_or(~is_active, jnp.logical_or(out_of_bounds, should_collect)),
-            jnp.zeros(3),  # Reset if out of bounds or collected
-            jnp.array([new_x, DIVER_SPAWN_POSITIONS[i], direction_of_shark]),
-        )
+    # Calculate movement based on difficulty
+    movement_speed = calculate_diver_movement(step_counter, spawn_state.difficulty)
+    should_move = movement_speed > 0
 
-        # Update collection count if collected
-        new_collected = collected + jnp.where(should_collect, 1, 0)
+    # If colliding with shark, move with the shark's direction/speed,
+    # otherwise use the diver's direction with the difficulty-based speed
+    movement_x = jnp.where(
+        shark_collision,
+        shark_lane_pos[:, 2],
+        diver_positions[:, 2] * movement_speed,
+    )
+    new_x = jnp.where(
+        jnp.logical_or(shark_collision, should_move),
+        diver_positions[:, 0] + movement_x,
+        diver_positions[:, 0],
+    )
 
-        # Update diver collection tracking - mark lane as collected when diver is collected
-        updated_diver_array = diver_array.at[i].set(
-            jnp.where(should_collect, 0, diver_array[i])
-        )
+    # Check bounds
+    out_of_bounds = jnp.logical_or(new_x <= -8, new_x >= 170)
 
-        # if the diver went out of bounds set the entry to -1
-        updated_diver_array = updated_diver_array.at[i].set(
-            jnp.where(out_of_bounds, -1, updated_diver_array[i])
-        )
+    # Reset divers that are out of bounds or collected
+    moved_divers = jnp.stack(
+        [new_x, jnp.asarray(DIVER_SPAWN_POSITIONS), direction_of_shark], axis=1
+    )
+    final_positions = jnp.where(
+        jnp.logical_or(~is_active, jnp.logical_or(out_of_bounds, should_collect))[:, None],
+        jnp.zeros(3),
+        moved_divers,
+    )
 
-        # Update the diver position, collection count and diver_array
-        return positions.at[i].set(new_pos), new_collected, updated_diver_array
+    final_collected = state_divers_collected + jnp.sum(should_collect)
 
-    # Update all diver positions and track collections
-    initial_carry = (diver_positions, state_divers_collected, new_diver_array)
-    final_positions, final_collected, final_diver_array = jax.lax.fori_loop(
-        0, diver_positions.shape[0], move_single_diver, initial_carry
-    )
+    # mark lanes as collected when their diver is collected, and as -1 if the diver went out of bounds
+    final_diver_array = jnp.where(should_collect, 0, new_diver_array)
+    final_diver_array = jnp.where(out_of_bounds, -1, final_diver_array)
 
     # Handle case where all divers are collected - set all lanes to -1
     # Apply the reset only if all divers have been collected
@@ -2025,9 +1607,12 @@ def surface_sub_step(state: SeaquestState) -> chex.Array:
     return jnp.where(should_spawn, temp1, temp2)
 
 @jax.jit
-def enemy_missiles_step(
-    curr_sub_positions, curr_enemy_missile_positions, step_counter, difficulty
-) -> chex.Array:
+def enemy_missiles_step(table: EnemyTable, step_counter, difficulty) -> chex.Array:
+    """Spawn and move the enemy missiles of the table.
+
+    Returns:
+        The new (4, 3) enemy missile positions
+    """
 
     def calculate_missile_speed(step_counter, difficulty):
         """JAX-compatible missile speed calculation function"""
@@ -2098,69 +1683,44 @@ def enemy_missiles_step(
             is_diff_0, 1, jnp.where(use_higher_speed, higher_speed, base_speed)
         )
 
-    def single_missile_step(i, carry):
-        # Input i is the loop index, carry is the full array of missile positions
-        # Get current submarine and missile for this index
-        missile_pos = carry[i]
+    # only the front submarine of each lane can shoot
+    sub_pos = get_front_entities(table_positions(table, ENEMY_TYPE_SUB))
+    missile_pos = table_positions(table, ENEMY_TYPE_MISSILE)
 
-        # get the current range of the submarines in the lane
-        range_start = i * 3
-        current_sub_idx = jnp.array([range_start, range_start + 1, range_start + 2])
-        lane_subs = curr_sub_positions[current_sub_idx]
+    # check if the missile is in frame
+    missile_exists = missile_pos[:, 2] != 0
 
-        # get the position of the front submarine (thats the only relevant one)
-        sub_pos = get_front_entity(i, lane_subs)
-
-        # check if the missile is in frame
-        missile_exists = missile_pos[2] != 0
-
-        # check if the missile should be spawned
-        should_spawn = jnp.logical_and(
-            jnp.logical_not(missile_exists),
-            jnp.logical_and(
-                sub_pos[0] >= MISSILE_SPAWN_POSITIONS[0],
-                sub_pos[0] <= MISSILE_SPAWN_POSITIONS[1],
-            ),
-        )
-
-        # Calculate new missile position ( x -/+ 4 (depending on direction), y = 47, direction = sub direction)
-        new_missile_x = jnp.where(  # could be sub_pos[0] + 4 * sub_pos[2] as well, but this is easier to read
-            sub_pos[2] == 1, sub_pos[0] + 4, sub_pos[0] - 4
-        )
-
-        new_missile = jnp.where(
-            should_spawn,
-            jnp.array(
-                [new_missile_x, ENEMY_MISSILE_Y[i], sub_pos[2]]
-            ),  # Use submarine's direction
-            missile_pos,
-        )
-
-        movement_speed = calculate_missile_speed(
-            step_counter, difficulty
-        )
-        velocity = movement_speed * new_missile[2]
+    # check if the missile should be spawned
+    should_spawn = jnp.logical_and(
+        jnp.logical_not(missile_exists),
+        jnp.logical_and(
+            sub_pos[:, 0] >= MISSILE_SPAWN_POSITIONS[0],
+            sub_pos[:, 0] <= MISSILE_SPAWN_POSITIONS[1],
+        ),
+    )
 
-        new_missile = jnp.where(
-            missile_exists,
-            jnp.array([new_missile[0] + velocity, new_missile[1], new_missile[2]]),
-            new_missile,
-        )
+    # Calculate new missile position ( x -/+ 4 (depending on direction), y = lane missile y, direction = sub direction)
+    new_missile_x = jnp.where(sub_pos[:, 2] == 1, sub_pos[:, 0] + 4, sub_pos[:, 0] - 4)
+    new_missile = jnp.where(
+        should_spawn[:, None],
+        jnp.stack([new_missile_x, jnp.asarray(ENEMY_MISSILE_Y), sub_pos[:, 2]], axis=1),
+        missile_pos,
+    )
 
-        # Check bounds
-        new_missile = jnp.where(
-            new_missile[0] < X_BORDERS[0],
-            jnp.array([0, 0, 0]),
-            jnp.where(new_missile[0] > X_BORDERS[1], jnp.array([0, 0, 0]), new_missile),
-        )
+    movement_speed = calculate_missile_speed(step_counter, difficulty)
+    velocity = movement_speed * new_missile[:, 2]
 
-        # Update the missile position in the full array
-        return carry.at[i].set(new_missile)
+    new_missile = jnp.where(
+        missile_exists[:, None],
+        new_missile.at[:, 0].add(velocity),
+        new_missile,
+    )
 
-    # Update all missile positions maintaining the array shape
-    new_missile_positions = jax.lax.fori_loop(
-        0, 4, single_missile_step, curr_enemy_missile_positions
+    # Check bounds
+    out_of_bounds = jnp.logical_or(
+        new_missile[:, 0] < X_BORDERS[0], new_missile[:, 0] > X_BORDERS[1]
     )
+    new_missile_positions = jnp.where(out_of_bounds[:, None], 0, new_missile)
 
     return new_missile_positions
 
@@ -2492,13 +2052,17 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         ])
 
 
-    def action_space(self) -> spaces.Discrete:
+    def action_space(self) -> "spaces.Discrete":
+        from gymnax.environments import spaces
+
         return spaces.Discrete(len(self.action_set))
 
     def get_action_space(self) -> jnp.ndarray:
         return jnp.array(self.action_set)
 
-    def observation_space(self) -> spaces.Box:
+    def observation_space(self) -> "spaces.Box":
+        from gymnax.environments import spaces
+
         return spaces.Box(
             low=0,
             high=255,
@@ -2609,8 +2173,10 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
         return state.lives < 0
 
     @partial(jax.jit, static_argnums=(0,))
-    def reset(self, key: jax.random.PRNGKey = jax.random.PRNGKey(42)) -> Tuple[SeaquestObservation, SeaquestState]:
+    def reset(self, key: jax.random.PRNGKey = None) -> Tuple[SeaquestObservation, SeaquestState]:
         """Initialize game state"""
+        if key is None:
+            key = jax.random.PRNGKey(42)
         reset_state = SeaquestState(
             player_x=jnp.array(PLAYER_START_X),
             player_y=jnp.array(PLAYER_START_Y),
@@ -2807,6 +2373,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
                 state_updated.score,
                 state_updated.successful_rescues,
                 new_spawn_state,
+                state.step_counter,
                 state.rng_key,
             )
 
@@ -2828,8 +2395,7 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
 
             new_diver_positions, new_divers_collected, new_spawn_state, new_rng_key = (
                 step_diver_movement(
-                    new_diver_positions,
-                    new_shark_positions,
+                    to_enemy_table(new_shark_positions, new_sub_positions, new_diver_positions),
                     player_x,
                     player_y,
                     state_updated.divers_collected,
@@ -2843,23 +2409,26 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
 
             state_updated._replace(surface_sub_position=new_surface_sub_pos)
 
-            # update the enemy missile positions
-            new_enemy_missile_positions = enemy_missiles_step(
+            table = to_enemy_table(
+                new_shark_positions,
                 new_sub_positions,
+                new_diver_positions,
                 state_updated.enemy_missile_positions,
+            )
+
+            # update the enemy missile positions
+            new_enemy_missile_positions = enemy_missiles_step(
+                table,
                 state_updated.step_counter,
                 state_updated.spawn_state.difficulty,
             )
 
-            # append the surface submarine to the other submarines for the collision check
-            # check if the player has collided with any of the enemies
+            # check if the player has collided with any of the enemies or their missiles
             player_collision, collision_points = check_player_collision(
                 player_x,
                 player_y,
-                new_sub_positions,
-                new_shark_positions,
+                table,
                 new_surface_sub_pos,
-                state_updated.enemy_missile_positions,
                 new_score,
                 state_updated.successful_rescues,
             )
@@ -3002,14 +2571,21 @@ class JaxSeaquest(JaxEnvironment[SeaquestState, SeaquestObservation, SeaquestInf
 from jaxatari.renderers import AtraJaxisRenderer
 
 class SeaquestRenderer(AtraJaxisRenderer):
+    def __init__(self, viewport=None):
+        super().__init__(viewport)
+        self.background_layer = aj.sample_layer(BACKGROUND_LAYER, viewport)
+        self.binary_alpha = aj.has_binary_alpha(
+            SPRITE_PL_SUB, SPRITE_DIVER, SPRITE_SHARK, SPRITE_ENEMY_SUB, SPRITE_PL_TORP, SPRITE_EN_TORP,
+            DIGITS, LIFE_INDICATOR, DIVER_INDICATOR, OXYGEN_BAR_COLOR,
+        )
+
     @partial(jax.jit, static_argnums=(0,))
     def render(self, state):
-        raster = jnp.zeros((WIDTH, HEIGHT, 3))
-
-        # render background
-        frame_bg = aj.get_sprite_frame(SPRITE_BG, 0)
-        raster = aj.render_at(raster, 0, 0, frame_bg)
+        # start from the cached background layer
+        raster = aj.start_frame(self.background_layer, self.viewport, dtype=jnp.float32)
+        return aj.finish_frame(self._draw(raster, state))
 
+    def _draw(self, raster, state):
         # render player submarine
         frame_pl_sub = aj.get_sprite_frame(SPRITE_PL_SUB, state.step_counter)
         raster = aj.render_at(
@@ -3018,22 +2594,20 @@ class SeaquestRenderer(AtraJaxisRenderer):
             state.player_y,
             frame_pl_sub,
             flip_horizontal=state.player_direction == FACE_LEFT,
+            binary_alpha=self.binary_alpha,
         )
 
         # render player torpedo
         frame_pl_torp = aj.get_sprite_frame(SPRITE_PL_TORP, state.step_counter)
         should_render = state.player_missile_position[0] > 0
-        raster = jax.lax.cond(
-            should_render,
-            lambda r: aj.render_at(
-                r,
-                state.player_missile_position[0],
-                state.player_missile_position[1],
-                frame_pl_torp,
-                flip_horizontal=state.player_missile_position[2] == FACE_LEFT,
-            ),
-            lambda r: r,
+        raster = aj.render_at(
             raster,
+            state.player_missile_position[0],
+            state.player_missile_position[1],
+            frame_pl_torp,
+            flip_horizontal=state.player_missile_position[2] == FACE_LEFT,
+            visible=should_render,
+            binary_alpha=self.binary_alpha,
         )
 
         # render divers
@@ -3042,17 +2616,14 @@ class SeaquestRenderer(AtraJaxisRenderer):
 
         def render_diver(i, raster_base):
             should_render = diver_positions[i][0] > 0
-            return jax.lax.cond(
-                should_render,
-                lambda r: aj.render_at(
-                    r,
-                    diver_positions[i][0],
-                    diver_positions[i][1],
-                    frame_diver,
-                    flip_horizontal=(diver_positions[i][2] == FACE_LEFT),
-                ),
-                lambda r: r,
+            return aj.render_at(
                 raster_base,
+                diver_positions[i][0],
+                diver_positions[i][1],
+                frame_diver,
+                flip_horizontal=(diver_positions[i][2] == FACE_LEFT),
+                visible=should_render,
+                binary_alpha=self.binary_alpha,
             )
 
         raster = jax.lax.fori_loop(0, MAX_DIVERS, render_diver, raster)
@@ -3062,17 +2633,14 @@ class SeaquestRenderer(AtraJaxisRenderer):
 
         def render_shark(i, raster_base):
             should_render = state.shark_positions[i][0] > 0
-            return jax.lax.cond(
-                should_render,
-                lambda r: aj.render_at(
-                    r,
-                    state.shark_positions[i][0],
-                    state.shark_positions[i][1],
-                    frame_shark,
-                    flip_horizontal=(state.shark_positions[i][2] == FACE_LEFT),
-                ),
-                lambda r: r,
+            return aj.render_at(
                 raster_base,
+                state.shark_positions[i][0],
+                state.shark_positions[i][1],
+                frame_shark,
+                flip_horizontal=(state.shark_positions[i][2] == FACE_LEFT),
+                visible=should_render,
+                binary_alpha=self.binary_alpha,
             )
 
         # Use fori_loop to render all sharks
@@ -3083,34 +2651,28 @@ class SeaquestRenderer(AtraJaxisRenderer):
 
         def render_enemy_sub(i, raster_base):
             should_render = state.sub_positions[i][0] > 0
-            return jax.lax.cond(
-                should_render,
-                lambda r: aj.render_at(
-                    r,
-                    state.sub_positions[i][0],
-                    state.sub_positions[i][1],
-                    frame_enemy_sub,
-                    flip_horizontal=(state.sub_positions[i][2] == FACE_LEFT),
-                ),
-                lambda r: r,
+            return aj.render_at(
                 raster_base,
+                state.sub_positions[i][0],
+                state.sub_positions[i][1],
+                frame_enemy_sub,
+                flip_horizontal=(state.sub_positions[i][2] == FACE_LEFT),
+                visible=should_render,
+                binary_alpha=self.binary_alpha,
             )
 
         raster = jax.lax.fori_loop(0, MAX_SUBS, render_enemy_sub, raster)
 
         def render_enemy_surface_sub(i, raster_base):
             should_render = state.surface_sub_position[0] > 0
-            return jax.lax.cond(
-                should_render,
-                lambda r: aj.render_at(
-                    r,
-                    state.surface_sub_position[0],
-                    state.surface_sub_position[1],
-                    frame_enemy_sub,
-                    flip_horizontal=(state.surface_sub_position[2] == FACE_LEFT),
-                ),
-                lambda r: r,
+            return aj.render_at(
                 raster_base,
+                state.surface_sub_position[0],
+                state.surface_sub_position[1],
+                frame_enemy_sub,
+                flip_horizontal=(state.surface_sub_position[2] == FACE_LEFT),
+                visible=should_render,
+                binary_alpha=self.binary_alpha,
             )
 
         raster = jax.lax.fori_loop(
@@ -3121,150 +2683,46 @@ class SeaquestRenderer(AtraJaxisRenderer):
 
         def render_enemy_torp(i, raster_base):
             should_render = state.enemy_missile_positions[i][0] > 0
-            return jax.lax.cond(
-                should_render,
-                lambda r: aj.render_at(
-                    r,
-                    state.enemy_missile_positions[i][0],
-                    state.enemy_missile_positions[i][1],
-                    frame_enemy_torp,
-                    flip_horizontal=(state.enemy_missile_positions[i][2] == FACE_LEFT),
-                ),
-                lambda r: r,
+            return aj.render_at(
                 raster_base,
+                state.enemy_missile_positions[i][0],
+                state.enemy_missile_positions[i][1],
+                frame_enemy_torp,
+                flip_horizontal=(state.enemy_missile_positions[i][2] == FACE_LEFT),
+                visible=should_render,
+                binary_alpha=self.binary_alpha,
             )
 
         raster = jax.lax.fori_loop(0, MAX_ENEMY_MISSILES, render_enemy_torp, raster)
 
         # show the scores
-        score_array = aj.int_to_digits(state.score, max_digits=8)
-        # convert the score to a list of digits
-        raster = aj.render_label(raster, 10, 10, score_array, DIGITS, spacing=7)
+        raster = aj.render_number(raster, 10, 10, state.score, SCORE_GLYPHS, max_digits=SCORE_DIGITS, binary_alpha=self.binary_alpha)
         raster = aj.render_indicator(
-            raster, 10, 20, state.lives, LIFE_INDICATOR, spacing=10
+            raster, 10, 20, state.lives, LIFE_INDICATOR, spacing=10, binary_alpha=self.binary_alpha
         )
         raster = aj.render_indicator(
-            raster, 49, 178, state.divers_collected, DIVER_INDICATOR, spacing=10
+            raster, 49, 178, state.divers_collected, DIVER_INDICATOR, spacing=10, binary_alpha=self.binary_alpha
         )
 
         raster = aj.render_bar(
-            raster, 49, 170, state.oxygen, 64, 63, 5, OXYGEN_BAR_COLOR, (0, 0, 0, 0)
+            raster, 49, 170, state.oxygen, 64, 63, 5, OXYGEN_BAR_COLOR, (0, 0, 0, 0), binary_alpha=self.binary_alpha
         )
 
         # Force the first 8 columns (x=0 to x=7) to be black
         bar_width = 8
-        # Assuming raster shape is (Height, Width, Channels)
-        # Select all rows (:), the first 'bar_width' columns (0:bar_width), and all channels (:)
-        raster = raster.at[0:bar_width, :, :].set(0)
+        raster = aj.fill_rect(raster, 0, 0, bar_width, HEIGHT, 0)
 
         return raster
 
 
-def get_human_action() -> chex.Array:
-    """Get human action from keyboard with support for diagonal movement and combined fire"""
-    keys = pygame.key.get_pressed()
-    up = keys[pygame.K_UP] or keys[pygame.K_w]
-    down = keys[pygame.K_DOWN] or keys[pygame.K_s]
-    left = keys[pygame.K_LEFT] or keys[pygame.K_a]
-    right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
-    fire = keys[pygame.K_SPACE]
-
-    # Diagonal movements with fire
-    if up and right and fire:
-        return jnp.array(Action.UPRIGHTFIRE)
-    if up and left and fire:
-        return jnp.array(Action.UPLEFTFIRE)
-    if down and right and fire:
-        return jnp.array(Action.DOWNRIGHTFIRE)
-    if down and left and fire:
-        return jnp.array(Action.DOWNLEFTFIRE)
-
-    # Cardinal directions with fire
-    if up and fire:
-        return jnp.array(Action.UPFIRE)
-    if down and fire:
-        return jnp.array(Action.DOWNFIRE)
-    if left and fire:
-        return jnp.array(Action.LEFTFIRE)
-    if right and fire:
-        return jnp.array(Action.RIGHTFIRE)
-
-    # Diagonal movements
-    if up and right:
-        return jnp.array(Action.UPRIGHT)
-    if up and left:
-        return jnp.array(Action.UPLEFT)
-    if down and right:
-        return jnp.array(Action.DOWNRIGHT)
-    if down and left:
-        return jnp.array(Action.DOWNLEFT)
-
-    # Cardinal directions
-    if up:
-        return jnp.array(Action.UP)
-    if down:
-        return jnp.array(Action.DOWN)
-    if left:
-        return jnp.array(Action.LEFT)
-    if right:
-        return jnp.array(Action.RIGHT)
-    if fire:
-        return jnp.array(Action.FIRE)
-
-    return jnp.array(Action.NOOP)
-
-
 if __name__ == "__main__":
-    # Initialize game and renderer
-    game = JaxSeaquest()
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH * SCALING_FACTOR, HEIGHT * SCALING_FACTOR))
-    clock = pygame.time.Clock()
-
-    renderer_AtraJaxis = SeaquestRenderer()
-
-    # Get jitted functions
-    jitted_step = jax.jit(game.step)
-    jitted_reset = jax.jit(game.reset)
-
-    curr_obs, curr_state = jitted_reset()
-
-    # Game loop with rendering
-    running = True
-    frame_by_frame = False
-    frameskip = 1
-    counter = 1
-
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_f:
-                    frame_by_frame = not frame_by_frame
-            elif event.type == pygame.KEYDOWN or (
-                event.type == pygame.KEYUP and event.key == pygame.K_n
-            ):
-                if event.key == pygame.K_n and frame_by_frame:
-                    if counter % frameskip == 0:
-                        action = get_human_action()
-                        curr_obs, curr_state, reward, done, info = jitted_step(
-                            curr_state, action
-                        )
-                        print(f"Observations: {curr_obs}")
-                        print(f"Reward: {reward}, Done: {done}, Info: {info}")
-
-        if not frame_by_frame:
-            if counter % frameskip == 0:
-                action = get_human_action()
-                curr_obs, curr_state, reward, done, info = jitted_step(
-                    curr_state, action
-                )
+    from jaxatari import interactive
 
-        # render and update pygame
-        raster = renderer_AtraJaxis.render(curr_state)
-        aj.update_pygame(screen, raster, SCALING_FACTOR, WIDTH, HEIGHT)
-        counter += 1
-        clock.tick(60)
+    def print_step(obs, state, reward, done, info):
+        print(f"Observations: {obs}")
+        print(f"Reward: {reward}, Done: {done}, Info: {info}")
 
-    pygame.quit()
\ No newline at end of file
+    interactive.run(
+        JaxSeaquest(), SeaquestRenderer(), interactive.get_human_action, fps=60, scale=SCALING_FACTOR, caption="Seaquest",
+        on_frame_step=print_step,
+    )
@@ -1,4 +1,4 @@
-import jax.numpy as jnp
+import numpy as np
 from typing import NamedTuple
 import chex
 
@@ -20,13 +20,13 @@ class LevelConstants(NamedTuple):
     child_position: chex.Array
 
 
-LADDER_HEIGHT = jnp.array(35)
-LADDER_WIDTH = jnp.array(8)
-P_HEIGHT = jnp.array(4)
+LADDER_HEIGHT = 35
+LADDER_WIDTH = 8
+P_HEIGHT = 4
 
 # -------------------- Level 1 --------------------
 
-LEVEL_1_LADDERS_POS = jnp.array(
+LEVEL_1_LADDERS_POS = np.array(
     [
         [132, 132],  # L1L1
         [20, 84],  # L1L2
@@ -34,7 +34,7 @@ LEVEL_1_LADDERS_POS = jnp.array(
     ]
 )
 
-LEVEL_1_LADDERS_SIZE = jnp.array(
+LEVEL_1_LADDERS_SIZE = np.array(
     [
         [LADDER_WIDTH, LADDER_HEIGHT],
         [LADDER_WIDTH, LADDER_HEIGHT],
@@ -42,7 +42,7 @@ LEVEL_1_LADDERS_SIZE = jnp.array(
     ]
 )
 
-LEVEL_1_PLATFORMS_POS = jnp.array(
+LEVEL_1_PLATFORMS_POS = np.array(
     [
         [16, 172],  # L1P1
         [16, 124],  # L1P2
@@ -51,7 +51,7 @@ LEVEL_1_PLATFORMS_POS = jnp.array(
     ]
 )
 
-LEVEL_1_PLATFORMS_SIZE = jnp.array(
+LEVEL_1_PLATFORMS_SIZE = np.array(
     [
         [128, P_HEIGHT],
         [128, P_HEIGHT],
@@ -60,11 +60,11 @@ LEVEL_1_PLATFORMS_SIZE = jnp.array(
     ]
 )
 
-LEVEL_1_FRUITS_POS = jnp.array([[119, 108], [39, 84], [59, 60]])
+LEVEL_1_FRUITS_POS = np.array([[119, 108], [39, 84], [59, 60]])
 
-LEVEL_1_BELL_POS = jnp.array([93, 36])
+LEVEL_1_BELL_POS = np.array([93, 36])
 
-LEVEL_1_CHILD_POS = jnp.array([121, 13])
+LEVEL_1_CHILD_POS = np.array([121, 13])
 
 Kangaroo_Level_1 = LevelConstants(
     ladder_positions=LEVEL_1_LADDERS_POS,
@@ -78,7 +78,7 @@ Kangaroo_Level_1 = LevelConstants(
 
 # -------------------- Level 2 --------------------
 
-LEVEL_2_LADDERS_POS = jnp.array(
+LEVEL_2_LADDERS_POS = np.array(
     [
         [120, 132],  # L2L1
         [24, 116],  # L2L2
@@ -86,7 +86,7 @@ LEVEL_2_LADDERS_POS = jnp.array(
     ]
 )
 
-LEVEL_2_LADDERS_SIZE = jnp.array(
+LEVEL_2_LADDERS_SIZE = np.array(
     [
         [LADDER_WIDTH, 4],
         [LADDER_WIDTH, 4],
@@ -94,7 +94,7 @@ LEVEL_2_LADDERS_SIZE = jnp.array(
     ]
 )
 
-LEVEL_2_PLATFORMS_POS = jnp.array(
+LEVEL_2_PLATFORMS_POS = np.array(
     [
         [16, 172],  # L2P1
         [16, 28],  # L2P2
@@ -117,7 +117,7 @@ LEVEL_2_PLATFORMS_POS = jnp.array(
     ]
 )
 
-LEVEL_2_PLATFORMS_SIZE = jnp.array(
+LEVEL_2_PLATFORMS_SIZE = np.array(
     [
         [128, P_HEIGHT],  # L2P1
         [128, P_HEIGHT],  # L2P2
@@ -141,11 +141,11 @@ LEVEL_2_PLATFORMS_SIZE = jnp.array(
 )
 
 # LEVEL_2_FRUITS_POS
-LEVEL_2_FRUITS_POS = jnp.array([[44, 68], [124, 92], [94, 140]])
+LEVEL_2_FRUITS_POS = np.array([[44, 68], [124, 92], [94, 140]])
 # LEVEL_2_BELL_POS
-LEVEL_2_BELL_POS = jnp.array([31, 36])
+LEVEL_2_BELL_POS = np.array([31, 36])
 # LEVEL_2_CHILD_POS
-LEVEL_2_CHILD_POS = jnp.array([121, 13])
+LEVEL_2_CHILD_POS = np.array([121, 13])
 
 Kangaroo_Level_2 = LevelConstants(
     ladder_positions=LEVEL_2_LADDERS_POS,
@@ -159,7 +159,7 @@ Kangaroo_Level_2 = LevelConstants(
 
 # -------------------- Level 3 --------------------
 
-LEVEL_3_LADDERS_POS = jnp.array(
+LEVEL_3_LADDERS_POS = np.array(
     [
         [20, 36],  # L3L1
         [20, 148],  # L3L2
@@ -170,7 +170,7 @@ LEVEL_3_LADDERS_POS = jnp.array(
     ]
 )
 
-LEVEL_3_LADDERS_SIZE = jnp.array(
+LEVEL_3_LADDERS_SIZE = np.array(
     [
         [LADDER_WIDTH, 28],  # L3L1
         [LADDER_WIDTH, 4],  # L3L2
@@ -181,7 +181,7 @@ LEVEL_3_LADDERS_SIZE = jnp.array(
     ]
 )
 
-LEVEL_3_PLATFORMS_POS = jnp.array(
+LEVEL_3_PLATFORMS_POS = np.array(
     [
         [16, 172],  # L3P1
         [16, 28],  # L3P2
@@ -206,7 +206,7 @@ LEVEL_3_PLATFORMS_POS = jnp.array(
     ]
 )
 
-LEVEL_3_PLATFORMS_SIZE = jnp.array(
+LEVEL_3_PLATFORMS_SIZE = np.array(
     [
         [128, P_HEIGHT],  # L3P1
         [128, P_HEIGHT],  # L3P2
@@ -232,11 +232,11 @@ LEVEL_3_PLATFORMS_SIZE = jnp.array(
 )
 
 # LEVEL_3_FRUITS_POS
-LEVEL_3_FRUITS_POS = jnp.array([[124, 92], [89, 116], [18, 60]])
+LEVEL_3_FRUITS_POS = np.array([[124, 92], [89, 116], [18, 60]])
 # LEVEL_3_BELL_POS
-LEVEL_3_BELL_POS = jnp.array([130, 36])
+LEVEL_3_BELL_POS = np.array([130, 36])
 # LEVEL_3_CHILD_POS
-LEVEL_3_CHILD_POS = jnp.array([121, 13])
+LEVEL_3_CHILD_POS = np.array([121, 13])
 
 Kangaroo_Level_3 = LevelConstants(
     ladder_positions=LEVEL_3_LADDERS_POS,
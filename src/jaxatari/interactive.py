@@ -0,0 +1,211 @@
+"""
+Interactive play of a game in a Pygame window.
+
+:func:`run` steps the environment with actions read from the keyboard (or any other source)
+and displays the rendered frames at a fixed frame rate. Stepping, rendering and converting
+the frame to the pixels of the window are fused into a single jitted call. On accelerators
+the frames are double buffered: the call computing the next frame is dispatched before the
+previous frame is transferred and displayed, so the device computes while the host displays
+and waits for the next tick. On the CPU backend the device and the host share the cores,
+there is nothing to overlap, and the asynchronous copy only adds work, so every frame is
+displayed right after it is computed.
+
+Keys handled by the runner:
+
+- ``F``: toggle the frame by frame mode
+- ``N``: advance one step in the frame by frame mode
+- ``Esc`` or closing the window: quit
+
+Pygame is only imported when a game is run.
+
+Usage:
+
+.. code-block:: python
+
+    from jaxatari import interactive, registry
+
+    interactive.run(registry.make("pong"), registry.make_renderer("pong"), fps=60, scale=3)
+"""
+from typing import Any, Callable, Optional
+
+import chex
+import jax
+import jax.numpy as jnp
+
+from jaxatari.environment import JaxEnvironment, JAXAtariAction as Action
+from jaxatari.renderers import AtraJaxisRenderer
+import jaxatari.rendering.atraJaxis as aj
+
+
+def get_human_action() -> int:
+    """
+    Get the action from the pressed keys, with support for diagonal movement and combined fire.
+    Arrows or WASD move, space fires.
+    """
+    import pygame
+
+    keys = pygame.key.get_pressed()
+
+    up = keys[pygame.K_UP] or keys[pygame.K_w]
+    down = keys[pygame.K_DOWN] or keys[pygame.K_s]
+    left = keys[pygame.K_LEFT] or keys[pygame.K_a]
+    right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
+    fire = keys[pygame.K_SPACE]
+
+    # The order of these checks is crucial for prioritizing actions
+    # (e.g., UPRIGHTFIRE before UPFIRE or UPRIGHT)
+    if up and right and fire:
+        return Action.UPRIGHTFIRE
+    if up and left and fire:
+        return Action.UPLEFTFIRE
+    if down and right and fire:
+        return Action.DOWNRIGHTFIRE
+    if down and left and fire:
+        return Action.DOWNLEFTFIRE
+    if up and fire:
+        return Action.UPFIRE
+    if down and fire:
+        return Action.DOWNFIRE
+    if left and fire:
+        return Action.LEFTFIRE
+    if right and fire:
+        return Action.RIGHTFIRE
+    if up and right:
+        return Action.UPRIGHT
+    if up and left:
+        return Action.UPLEFT
+    if down and right:
+        return Action.DOWNRIGHT
+    if down and left:
+        return Action.DOWNLEFT
+    if up:
+        return Action.UP
+    if down:
+        return Action.DOWN
+    if left:
+        return Action.LEFT
+    if right:
+        return Action.RIGHT
+    if fire:
+        return Action.FIRE
+    return Action.NOOP
+
+
+def compile_step_and_render(env: JaxEnvironment, renderer: AtraJaxisRenderer, scale: int, shifts=None):
+    """
+    Jitted functions producing display frames.
+    Args:
+        env: the environment
+        renderer: the renderer of the game
+        scale: integer upscaling factor
+        shifts: channel shifts of a 32 bit window (aj.surface_shifts), None for uint8 RGB frames
+    Returns:
+        ``render(state) -> frame`` and ``step_and_render(state, action) -> (step outputs, frame)``,
+        where the frames are ready for aj.display_frame (see aj.to_pixels and aj.upscale)
+    """
+
+    def to_frame(state):
+        raster = renderer.render(state)
+        if shifts is None:
+            return aj.upscale(raster, scale)
+        return aj.to_pixels(raster, scale, shifts)
+
+    def step_and_render(state, action):
+        outputs = env.step(state, action)
+        return outputs, to_frame(outputs[1])
+
+    return jax.jit(to_frame), jax.jit(step_and_render)
+
+
+def run(
+    env: JaxEnvironment,
+    renderer: AtraJaxisRenderer,
+    get_action: Callable[[], Optional[int]] = get_human_action,
+    fps: Optional[float] = 60,
+    frameskip: int = 1,
+    scale: int = 4,
+    caption: str = "JAXAtari",
+    key: Optional[chex.PRNGKey] = None,
+    quit_when_done: bool = False,
+    on_frame_step: Optional[Callable[..., Any]] = None,
+    double_buffer: Optional[bool] = None,
+):
+    """
+    Run a game interactively in a Pygame window until it is closed.
+    Args:
+        env: the environment
+        renderer: the renderer of the game
+        get_action: called for every step, returns the action or None to quit
+        fps: displayed frames per second, None runs as fast as possible
+        frameskip: the environment is stepped every ``frameskip`` displayed frames
+        scale: integer upscaling factor of the window
+        caption: window title
+        key: PRNG key for the reset, None uses the environment's default
+        quit_when_done: quit after the frame of the first step that is done has been shown for 2 seconds
+        on_frame_step: called with the outputs of steps taken in the frame by frame mode
+                       ``(obs, state, reward, done, info)``, e.g. to print them
+        double_buffer: display the previous frame while the next one is computed,
+                       None enables it on every backend except the CPU
+    Returns:
+        the last state
+    """
+    import pygame
+
+    pygame.init()
+    pygame.display.set_caption(caption)
+
+    _, state = jax.jit(env.reset)() if key is None else jax.jit(env.reset)(key)
+    width, height = jax.eval_shape(renderer.render, state).shape[:2]
+    window = pygame.display.set_mode((width * scale, height * scale))
+    render, step_and_render = compile_step_and_render(env, renderer, scale, aj.surface_shifts(window))
+
+    if double_buffer is None:
+        double_buffer = jax.default_backend() != "cpu"
+    clock = pygame.time.Clock()
+    # frame (and its done flag) computed in the previous iteration, displayed in this one when double buffered
+    frame, frame_done = render(state), False
+    frame_by_frame = False
+    counter = 0
+    running = True
+
+    while running:
+        advance = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                frame_by_frame = not frame_by_frame
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_n:
+                advance = frame_by_frame
+        if not running:
+            break
+
+        counter += 1
+        next_frame = None
+        if advance or (not frame_by_frame and counter % frameskip == 0):
+            action = get_action()
+            if action is None:
+                break
+            # dispatched asynchronously, when double buffered the device computes while the previous frame is displayed
+            outputs, next_frame = step_and_render(state, jnp.asarray(action, dtype=jnp.int32))
+            if double_buffer:
+                next_frame.copy_to_host_async()
+            state = outputs[1]
+            if advance and on_frame_step is not None:
+                on_frame_step(*outputs)
+            if not double_buffer:
+                frame, frame_done, next_frame = next_frame, outputs[3], None
+
+        if frame is not None:
+            aj.display_frame(window, frame)
+            if quit_when_done and bool(frame_done):
+                pygame.time.wait(2000)
+                break
+        frame = next_frame
+        if next_frame is not None:
+            frame_done = outputs[3]
+
+        clock.tick(fps or 0)
+
+    pygame.quit()
+    return state
@@ -0,0 +1,329 @@
+"""
+Compile time and cost profile of the games.
+
+Every game's ``step`` and ``render`` are lowered and compiled once for a single state and
+once vmapped over a batch of states, without running them. For each the profile reports
+
+- the wall-clock time of tracing/lowering and of the XLA compilation
+- the number of jaxpr equations (recursively, including control flow and nested jits)
+- the operations of the optimized HLO module: instructions executed at the top level by
+  opcode, fusions by kind and the number of instructions inside the fusions
+- the estimated flops, transcendentals and bytes accessed (``compiled.cost_analysis()``)
+- the memory of the executable (``compiled.memory_analysis()``): arguments, outputs,
+  temporaries and the resulting peak estimate, and the generated code size
+
+and the same broken down by the top-level functions, i.e. the outermost jitted functions
+called from ``step`` / ``render`` (e.g. ``update_enemy_spawns`` in Seaquest or
+``monkey_controller`` in Kangaroo), which are compiled on their own from their jaxprs.
+
+The profiles are written as JSON, and two JSON files (e.g. of two commits) can be compared.
+
+Usage:
+    python -m jaxatari.profile
+    python -m jaxatari.profile --games seaquest kangaroo --batch-size 64 --json profile.json
+    python -m jaxatari.profile --compare before.json after.json
+"""
+import argparse
+import collections
+import json
+import re
+import subprocess
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import jax
+from jax import core
+
+from jaxatari import registry
+
+# header of an HLO computation, e.g. "%fused_computation.1 (param_0: f32[8]) -> f32[8] {"
+_HLO_COMPUTATION = re.compile(r"^(?:ENTRY\s+)?%?([^\s(]+)\s*\(.*\{\s*$")
+# instruction of an HLO computation, e.g. "  ROOT %add.0 = f32[8]{0} add(...), metadata=..."
+_HLO_INSTRUCTION = re.compile(r"^\s+(?:ROOT\s+)?%?[^\s=]+\s*=\s*(.*)$")
+
+
+def _opcode(rest: str) -> str:
+    """Opcode of an HLO instruction from the text after '=', which starts with the (tuple) shape."""
+    if rest.startswith("("):
+        depth = 0
+        for i, char in enumerate(rest):
+            depth += char == "("
+            depth -= char == ")"
+            if depth == 0:
+                rest = rest[i + 1:]
+                break
+    else:
+        rest = rest.split(" ", 1)[1] if " " in rest else ""
+    return rest.strip().split("(", 1)[0]
+
+
+def hlo_op_counts(hlo_text: str) -> Dict[str, Any]:
+    """
+    Counts the operations of an optimized HLO module (compiled.as_text()).
+    Returns:
+        a dict with the number of ``instructions`` of all computations, the ``ops`` outside of
+        fusions (what the runtime executes) by opcode, the ``fusions`` by kind and the number of
+        ``fused_instructions`` inside the fusions
+    """
+    computations = {}
+    current = None
+    for line in hlo_text.splitlines():
+        header = _HLO_COMPUTATION.match(line)
+        if header is not None and not line.startswith("HloModule"):
+            current = computations.setdefault(header.group(1), [])
+            continue
+        instruction = _HLO_INSTRUCTION.match(line)
+        if instruction is not None and current is not None:
+            current.append((_opcode(instruction.group(1)), line))
+
+    fused = set()
+    fusions = collections.Counter()
+    for instructions in computations.values():
+        for opcode, line in instructions:
+            if opcode == "fusion":
+                kind = re.search(r"kind=(\w+)", line)
+                fusions[kind.group(1) if kind else "unknown"] += 1
+                fused.update(re.findall(r"calls=%?([\w.\-]+)", line))
+
+    ops = collections.Counter()
+    for name, instructions in computations.items():
+        if name not in fused:
+            ops.update(opcode for opcode, _ in instructions if opcode not in ("parameter", "constant"))
+    return {
+        "instructions": sum(len(instructions) for instructions in computations.values()),
+        "ops": dict(ops.most_common()),
+        "fusions": dict(fusions.most_common()),
+        "fused_instructions": sum(len(computations.get(name, ())) for name in fused),
+    }
+
+
+def _cost(compiled) -> Dict[str, float]:
+    cost = compiled.cost_analysis()
+    cost = cost[0] if isinstance(cost, (list, tuple)) else cost
+    cost = cost or {}
+    return {name: float(cost.get(name, 0.0)) for name in ("flops", "transcendentals", "bytes accessed")}
+
+
+def _memory(compiled) -> Optional[Dict[str, int]]:
+    stats = compiled.memory_analysis()
+    if stats is None:
+        return None
+    memory = {
+        name: int(getattr(stats, f"{name}_size_in_bytes"))
+        for name in ("argument", "output", "alias", "temp", "generated_code")
+    }
+    # buffers that are alive while the executable runs, donated (aliased) outputs are counted once
+    memory["peak"] = memory["argument"] + memory["output"] + memory["temp"] - memory["alias"]
+    return memory
+
+
+def count_equations(jaxpr: core.Jaxpr) -> int:
+    """Number of equations of a jaxpr, including the equations of all sub-jaxprs."""
+    return sum(1 + sum(count_equations(sub) for sub in _sub_jaxprs(eqn)) for eqn in jaxpr.eqns)
+
+
+def _sub_jaxprs(eqn) -> List[core.Jaxpr]:
+    """The jaxprs in the parameters of an equation (control flow branches and bodies, nested jits, ...)."""
+    subs = []
+    for param in eqn.params.values():
+        for value in param if isinstance(param, (tuple, list)) else (param,):
+            if isinstance(value, core.ClosedJaxpr):
+                subs.append(value.jaxpr)
+            elif isinstance(value, core.Jaxpr):
+                subs.append(value)
+    return subs
+
+
+def top_level_functions(jaxpr: core.Jaxpr, entry: str) -> Dict[str, List[core.ClosedJaxpr]]:
+    """
+    The outermost jitted functions called from a jaxpr, through control flow.
+    The jitted entry function itself (a jit named ``entry`` at the top level) is looked into.
+    Returns:
+        the closed jaxprs of every call by function name, in order of appearance
+    """
+    functions = collections.defaultdict(list)
+
+    def visit(jaxpr, is_entry):
+        for eqn in jaxpr.eqns:
+            if eqn.primitive.name == "pjit":
+                if is_entry and eqn.params["name"] == entry:
+                    visit(eqn.params["jaxpr"].jaxpr, False)
+                else:
+                    functions[eqn.params["name"]].append(eqn.params["jaxpr"])
+                continue
+            for sub in _sub_jaxprs(eqn):
+                visit(sub, False)
+
+    visit(jaxpr, True)
+    return dict(functions)
+
+
+def _struct(aval):
+    return jax.ShapeDtypeStruct(aval.shape, aval.dtype)
+
+
+def profile_function(fn: Callable, args: Tuple) -> Dict[str, Any]:
+    """
+    Lowers and compiles ``jax.jit(fn)`` for abstract ``args`` (e.g. jax.ShapeDtypeStruct) and profiles it.
+    Returns:
+        lower and compile times in seconds, cost and memory analysis and the HLO operation counts
+    """
+    start = time.perf_counter()
+    lowered = jax.jit(fn).lower(*args)
+    lower_time = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled = lowered.compile()
+    compile_time = time.perf_counter() - start
+    return {
+        "lower_seconds": lower_time,
+        "compile_seconds": compile_time,
+        "cost": _cost(compiled),
+        "memory": _memory(compiled),
+        "hlo": hlo_op_counts(compiled.as_text()),
+    }
+
+
+def profile_entry(fn: Callable, args: Tuple, entry: str, breakdown: bool = True) -> Dict[str, Any]:
+    """Profiles a function and, with ``breakdown``, each of its top-level functions compiled on its own."""
+    closed = jax.make_jaxpr(fn)(*args)
+    profile = profile_function(fn, args)
+    profile["equations"] = count_equations(closed.jaxpr)
+    if breakdown:
+        profile["functions"] = {}
+        for name, calls in top_level_functions(closed.jaxpr, entry).items():
+            # every call is compiled on its own, calls with the same signature are compiled once
+            signatures = {}
+            for call in calls:
+                signature = tuple((aval.shape, str(aval.dtype)) for aval in call.in_avals)
+                if signature not in signatures:
+                    signatures[signature] = profile_function(core.jaxpr_as_fun(call), tuple(map(_struct, call.in_avals)))
+            profiles = [signatures[tuple((aval.shape, str(aval.dtype)) for aval in call.in_avals)] for call in calls]
+            profile["functions"][name] = {
+                "calls": len(calls),
+                "equations": sum(count_equations(call.jaxpr) for call in calls),
+                "compile_seconds": sum(p["compile_seconds"] for p in signatures.values()),
+                "cost": {key: sum(p["cost"][key] for p in profiles) for key in profiles[0]["cost"]},
+                "instructions": sum(p["hlo"]["instructions"] for p in profiles),
+                "fusions": sum(sum(p["hlo"]["fusions"].values()) for p in profiles),
+            }
+    return profile
+
+
+def _batched(tree, batch_size):
+    return jax.tree.map(lambda leaf: jax.ShapeDtypeStruct((batch_size,) + leaf.shape, leaf.dtype), tree)
+
+
+def profile_game(game: str, batch_size: int = 64, breakdown: bool = True) -> Dict[str, Any]:
+    """Profiles ``step`` and ``render`` of a registered game, single and vmapped over ``batch_size`` states."""
+    env, renderer = registry.make(game), registry.make_renderer(game)
+    state = jax.eval_shape(env.reset)[1]
+    action = jax.ShapeDtypeStruct((), jax.numpy.int32)
+    functions = {
+        "step": (env.step, (state, action)),
+        "render": (renderer.render, (state,)),
+    }
+    result = {}
+    for name, (fn, args) in functions.items():
+        result[name] = {
+            "single": profile_entry(fn, args, name, breakdown),
+            f"vmap{batch_size}": profile_entry(jax.vmap(fn), _batched(args, batch_size), name, breakdown),
+        }
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def profile_games(games: List[str], batch_size: int = 64, breakdown: bool = True) -> Dict[str, Any]:
+    """Profiles the given games, with the environment (JAX version, backend, commit) to compare profiles."""
+    return {
+        "jax_version": jax.__version__,
+        "backend": jax.default_backend(),
+        "device": str(jax.devices()[0]),
+        "commit": _git_commit(),
+        "batch_size": batch_size,
+        "games": {game: profile_game(game, batch_size, breakdown) for game in games},
+    }
+
+
+def _summary(profile: Dict[str, Any]) -> Dict[str, float]:
+    """The numbers compared between profiles."""
+    summary = {
+        "lower [s]": profile["lower_seconds"],
+        "compile [s]": profile["compile_seconds"],
+        "equations": profile["equations"],
+        "ops": sum(profile["hlo"]["ops"].values()),
+        "fusions": sum(profile["hlo"]["fusions"].values()),
+        "MFLOP": profile["cost"]["flops"] / 1e6,
+        "MB accessed": profile["cost"]["bytes accessed"] / 1e6,
+    }
+    if profile["memory"] is not None:
+        summary["peak MB"] = profile["memory"]["peak"] / 1e6
+    return summary
+
+
+def print_profiles(profiles: Dict[str, Any], top: int = 10):
+    print(f"JAX {profiles['jax_version']} on {profiles['device']}, commit {profiles['commit']}")
+    for game, functions in profiles["games"].items():
+        for function, modes in functions.items():
+            for mode, profile in modes.items():
+                summary = "  ".join(f"{key} {value:.6g}" for key, value in _summary(profile).items())
+                print(f"{game}.{function} ({mode}): {summary}")
+                by_compile_time = sorted(
+                    profile.get("functions", {}).items(), key=lambda item: item[1]["compile_seconds"], reverse=True
+                )
+                for name, stats in by_compile_time[:top]:
+                    print(
+                        f"    {name:<32} calls {stats['calls']:>3}  compile {stats['compile_seconds']:>7.3f}s  "
+                        f"equations {stats['equations']:>6}  instructions {stats['instructions']:>6}  "
+                        f"fusions {stats['fusions']:>5}  MFLOP {stats['cost']['flops'] / 1e6:>9.3f}"
+                    )
+
+
+def compare_profiles(before: Dict[str, Any], after: Dict[str, Any]):
+    """Prints the relative change of the summary numbers of every game, function and mode in both profiles."""
+    print(f"before: commit {before['commit']}, JAX {before['jax_version']} on {before['device']}")
+    print(f"after:  commit {after['commit']}, JAX {after['jax_version']} on {after['device']}")
+    for game, functions in after["games"].items():
+        for function, modes in functions.items():
+            for mode, profile in modes.items():
+                old = before["games"].get(game, {}).get(function, {}).get(mode)
+                if old is None:
+                    continue
+                old, new = _summary(old), _summary(profile)
+                changes = "  ".join(
+                    f"{key} {old[key]:.4g} -> {new[key]:.4g}" + (f" ({(new[key] - old[key]) / old[key]:+.0%})" if old[key] else "")
+                    for key in new
+                    if key in old
+                )
+                print(f"{game}.{function} ({mode}): {changes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile time and cost profile of the games' step and render.")
+    parser.add_argument("--games", nargs="+", choices=registry.list_games(), default=registry.list_games())
+    parser.add_argument("--batch-size", type=int, default=64, help="batch size of the vmapped step and render")
+    parser.add_argument("--no-breakdown", action="store_true", help="do not compile the top-level functions on their own")
+    parser.add_argument("--top", type=int, default=10, help="number of top-level functions printed per profile")
+    parser.add_argument("--json", type=str, default=None, help="write the profiles to this JSON file")
+    parser.add_argument("--compare", type=str, nargs=2, metavar=("BEFORE", "AFTER"), help="compare two JSON profiles")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as before, open(args.compare[1]) as after:
+            compare_profiles(json.load(before), json.load(after))
+        return
+
+    profiles = profile_games(args.games, args.batch_size, not args.no_breakdown)
+    print_profiles(profiles, args.top)
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(profiles, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Streaming trajectory recording.
+
+Trajectories are written to a directory in a columnar, memory-mappable format:
+
+.. code-block:: text
+
+    trajectory/
+        index.json
+        chunk_000000/
+            action.npy
+            reward.npy
+            obs.player.x.npy
+            state.player_x.npy
+            ...
+        chunk_000001/
+            ...
+
+Every chunk holds one ``.npy`` file per field with the steps of the chunk stacked along
+the first axis, so a batched rollout of ``B`` environments produces arrays of shape
+``(steps, B, ...)``. ``index.json`` lists the fields with their dtype and per-step shape
+and the chunks with their number of steps. It is rewritten after every chunk, so a
+trajectory that is still being recorded can already be read.
+
+Steps are written into a preallocated chunk buffer on the device, one jitted in-place
+update per step, and the buffer is handed to a background thread once it is full. The thread transfers the chunk to the host and writes it, so the step loop only
+blocks if more than ``max_pending_chunks`` chunks are waiting to be written.
+"""
+import json
+import os
+import queue
+import threading
+from functools import partial
+from typing import Any, Dict, Iterator, List
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari.snapshot import field_name
+from jaxatari.wrappers import GymnaxWrapper
+
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+
+
+def flatten_fields(**trees) -> Dict[str, Any]:
+    """Flatten keyword pytrees into ``{field name: leaf}`` with the keyword as prefix."""
+    leaves, _ = jax.tree_util.tree_flatten_with_path(trees)
+    return {field_name(path): leaf for path, leaf in leaves}
+
+
+@partial(jax.jit, donate_argnums=(0,))
+def _write_step(buffer, index, leaves):
+    """Write one step into the chunk buffer in place."""
+    return [chunk.at[index].set(leaf) for chunk, leaf in zip(buffer, leaves)]
+
+
+class TrajectoryRecorder:
+    """
+    Records steps of (batched) rollouts to disk on a background thread.
+
+    Usage:
+
+    .. code-block:: python
+
+        with TrajectoryRecorder("trajectory", chunk_size=1000) as recorder:
+            for _ in range(num_steps):
+                obs, state, reward, done, info = step(state, action)
+                recorder.add(obs=obs, action=action, reward=reward, done=done, state=state)
+
+    Args:
+        path: directory to write the trajectory to, must not contain a trajectory yet
+        chunk_size: number of steps per chunk
+        max_pending_chunks: number of full chunks that may wait for the writer thread
+            before ``add`` blocks, bounds the memory held by the recorder
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1000, max_pending_chunks: int = 2):
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            raise FileExistsError(f"{path} already contains a trajectory")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        self.chunks: List[Dict[str, Any]] = []
+        self._names = None
+        self._treedef = None
+        self._buffer = None
+        self._buffered_steps = 0
+        self._queue = queue.Queue(maxsize=max_pending_chunks)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def add(self, **trees):
+        """Add one step. Every keyword is a pytree (e.g. ``obs=..., state=...``) whose leaves become fields."""
+        self._check()
+        leaves, treedef = jax.tree_util.tree_flatten(trees)
+        if self._treedef is None or treedef != self._treedef:
+            # field names are only derived when the structure of the steps changes
+            self.flush()
+            self._names = list(flatten_fields(**trees))
+            self._treedef = treedef
+        if self._buffer is None:
+            self._buffer = [
+                jnp.zeros((self.chunk_size,) + jnp.shape(leaf), jnp.result_type(leaf))
+                for leaf in leaves
+            ]
+        self._buffer = _write_step(self._buffer, self._buffered_steps, leaves)
+        self._buffered_steps += 1
+        if self._buffered_steps == self.chunk_size:
+            self.flush()
+
+    def add_chunk(self, **trees):
+        """Add several steps at once, e.g. the stacked outputs of a ``lax.scan`` rollout. Leaves have a leading time axis."""
+        self._check()
+        self.flush()
+        self._put(flatten_fields(**trees))
+
+    def flush(self):
+        """Hand the buffered steps to the writer thread, even if the chunk is not full."""
+        if self._buffered_steps:
+            self._put({
+                name: chunk[: self._buffered_steps] for name, chunk in zip(self._names, self._buffer)
+            })
+            self._buffer = None
+            self._buffered_steps = 0
+
+    def close(self):
+        """Write all remaining steps and wait for the writer thread to finish."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Writing the trajectory failed") from self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _check(self):
+        if self._closed:
+            raise RuntimeError("The recorder is closed")
+        if self._error is not None:
+            raise RuntimeError("Writing the trajectory failed") from self._error
+
+    def _put(self, fields):
+        for value in fields.values():
+            # start the device to host transfer now, the writer thread picks it up later
+            if isinstance(value, jax.Array):
+                value.copy_to_host_async()
+        self._queue.put(fields)
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._write_chunk(item)
+            except Exception as e:  # re-raised on the recording thread
+                self._error = e
+
+    def _write_chunk(self, chunk):
+        stacked = {name: np.asarray(value) for name, value in chunk.items()}
+        num_steps = len(next(iter(stacked.values())))
+
+        fields = {
+            name: {"dtype": array.dtype.str, "shape": list(array.shape[1:])}
+            for name, array in stacked.items()
+        }
+        if self.chunks and fields != self.fields:
+            raise ValueError(f"Chunk fields {fields} do not match the fields of the trajectory {self.fields}")
+        self.fields = fields
+
+        chunk_name = f"chunk_{len(self.chunks):06d}"
+        chunk_dir = os.path.join(self.path, chunk_name)
+        os.makedirs(chunk_dir, exist_ok=True)
+        for name, array in stacked.items():
+            np.save(os.path.join(chunk_dir, f"{name}.npy"), array)
+        self.chunks.append({"name": chunk_name, "steps": num_steps})
+        self._write_index()
+
+    def _write_index(self):
+        index = {"version": FORMAT_VERSION, "fields": self.fields, "chunks": self.chunks}
+        tmp_path = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, INDEX_FILE))
+
+
+class TrajectoryReader:
+    """Reads a trajectory written by :class:`TrajectoryRecorder`, memory mapping the chunks."""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported trajectory format version {index['version']}")
+        self.path = path
+        self.fields: Dict[str, Dict[str, Any]] = index["fields"]
+        self.chunks: List[Dict[str, Any]] = index["chunks"]
+
+    @property
+    def num_steps(self) -> int:
+        return sum(chunk["steps"] for chunk in self.chunks)
+
+    def chunk(self, i: int, fields=None) -> Dict[str, np.ndarray]:
+        """Memory mapped arrays of chunk ``i`` for the given fields (default: all)."""
+        chunk_dir = os.path.join(self.path, self.chunks[i]["name"])
+        return {
+            name: np.load(os.path.join(chunk_dir, f"{name}.npy"), mmap_mode="r")
+            for name in (fields if fields is not None else self.fields)
+        }
+
+    def iter_chunks(self, fields=None) -> Iterator[Dict[str, np.ndarray]]:
+        for i in range(len(self.chunks)):
+            yield self.chunk(i, fields)
+
+    def read(self, name: str) -> np.ndarray:
+        """Load a whole field into memory, concatenated over all chunks."""
+        return np.concatenate([chunk[name] for chunk in self.iter_chunks([name])])
+
+
+class RecorderWrapper(GymnaxWrapper):
+    """
+    Records every step of the wrapped environment with a :class:`TrajectoryRecorder`.
+
+    The wrapper works on the host: apply it outside of ``jit`` and ``lax.scan``, e.g. around
+    a jitted, vmapped environment. For rollouts that run inside a ``lax.scan`` use
+    :meth:`TrajectoryRecorder.add_chunk` with the stacked scan outputs instead.
+    """
+
+    def __init__(self, env, recorder: TrajectoryRecorder, record_state: bool = True):
+        super().__init__(env)
+        self.recorder = recorder
+        self.record_state = record_state
+
+    def step(self, *args):
+        # the action is the last argument both for environments and for the key taking wrappers
+        obs, state, reward, done, info = self._env.step(*args)
+        fields = dict(obs=obs, action=args[-1], reward=reward, done=done)
+        if self.record_state:
+            fields["state"] = state
+        self.recorder.add(**fields)
+        return obs, state, reward, done, info
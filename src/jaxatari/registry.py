@@ -0,0 +1,198 @@
+"""
+Lazy registry of the available games.
+
+A game is registered by name with the import paths (``"module:Class"``) of its environment
+and renderer. Nothing is imported until a game is built, so a worker that runs a single
+game only imports (and loads the sprites of) that game.
+
+Games are found in three places:
+
+- the game modules of :mod:`jaxatari.games`, which are discovered by parsing the module
+  files (in parallel, without importing them); ``jax_<name>.py`` is registered as ``<name>``
+- the ``jaxatari.games`` and ``jaxatari.renderers`` entry point groups of installed
+  packages, e.g. in a ``pyproject.toml``:
+
+  .. code-block:: toml
+
+      [project.entry-points."jaxatari.games"]
+      breakout = "my_package.breakout:JaxBreakout"
+
+      [project.entry-points."jaxatari.renderers"]
+      breakout = "my_package.breakout:BreakoutRenderer"
+
+- :func:`register` at runtime
+
+A name registered by several sources resolves in a fixed order: :func:`register` takes
+precedence over the game modules of :mod:`jaxatari.games`, which take precedence over
+entry points. The built-in games are only discovered from the module files, so an
+installed distribution (e.g. a stale install of jaxatari) can not shadow them.
+
+Usage:
+
+.. code-block:: python
+
+    from jaxatari import registry
+
+    registry.list_games()                # ['freeway', 'kangaroo', 'pong', 'seaquest']
+    env = registry.make("seaquest")
+    renderer = registry.make_renderer("seaquest")
+"""
+import ast
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.metadata import entry_points
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+GAMES_PACKAGE = "jaxatari.games"
+GAME_MODULE_PREFIX = "jax_"
+ENV_ENTRY_POINTS = "jaxatari.games"
+RENDERER_ENTRY_POINTS = "jaxatari.renderers"
+ENV_BASE = "JaxEnvironment"
+RENDERER_BASE = "AtraJaxisRenderer"
+
+
+def _load(path: str):
+    """Import the object referenced by a ``"module:attribute"`` path."""
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class GameSpec(NamedTuple):
+    """
+    A registered game.
+    Args:
+        name: name of the game, e.g. ``"seaquest"``
+        env: import path of the environment class, ``"module:Class"``
+        renderer: import path of the renderer class, None if the game has no renderer
+    """
+    name: str
+    env: str
+    renderer: Optional[str] = None
+
+    def make(self, **kwargs):
+        """Import the game and create the environment, ``kwargs`` are passed to its constructor."""
+        return _load(self.env)(**kwargs)
+
+    def make_renderer(self, **kwargs):
+        """
+        Import the game and create the renderer, None if the game has no renderer.
+        ``kwargs`` are passed to its constructor, e.g. ``viewport``.
+        """
+        return _load(self.renderer)(**kwargs) if self.renderer is not None else None
+
+    def action_set(self) -> Tuple[int, ...]:
+        """The actions of the game (this builds the environment)."""
+        return _action_set(self)
+
+
+@lru_cache(maxsize=None)
+def _action_set(spec: GameSpec) -> Tuple[int, ...]:
+    return tuple(int(action) for action in spec.make().get_action_space())
+
+
+def _base_names(node: ast.ClassDef) -> List[str]:
+    """Names of the base classes of a class definition, e.g. ``JaxEnvironment`` for ``JaxEnvironment[S, O, I]``."""
+    names = []
+    for base in node.bases:
+        if isinstance(base, ast.Subscript):
+            base = base.value
+        if isinstance(base, ast.Attribute):
+            names.append(base.attr)
+        elif isinstance(base, ast.Name):
+            names.append(base.id)
+    return names
+
+
+def _scan_module(path: str, module_name: str) -> Optional[GameSpec]:
+    """Find the environment and renderer class of a game module without importing it."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    env = renderer = None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = _base_names(node)
+            if env is None and ENV_BASE in bases:
+                env = f"{module_name}:{node.name}"
+            elif renderer is None and RENDERER_BASE in bases:
+                renderer = f"{module_name}:{node.name}"
+    if env is None:
+        return None
+    name = os.path.splitext(os.path.basename(path))[0][len(GAME_MODULE_PREFIX):]
+    return GameSpec(name, env, renderer)
+
+
+def discover_games(directory: str, package: str) -> Dict[str, GameSpec]:
+    """
+    Find the games in a directory of game modules (``jax_<name>.py``) by parsing the files in parallel.
+    Args:
+        directory: the directory of the game modules
+        package: the package name of the directory, used for the import paths
+    """
+    files = sorted(
+        file for file in os.listdir(directory)
+        if file.startswith(GAME_MODULE_PREFIX) and file.endswith(".py")
+    )
+    with ThreadPoolExecutor() as executor:
+        specs = executor.map(
+            lambda file: _scan_module(os.path.join(directory, file), f"{package}.{os.path.splitext(file)[0]}"),
+            files,
+        )
+        return {spec.name: spec for spec in specs if spec is not None}
+
+
+def _entry_point_games() -> Dict[str, GameSpec]:
+    """Games registered by installed packages. Only the entry point values are read, nothing is imported."""
+    renderers = {entry_point.name: entry_point.value for entry_point in entry_points(group=RENDERER_ENTRY_POINTS)}
+    return {
+        entry_point.name: GameSpec(entry_point.name, entry_point.value, renderers.get(entry_point.name))
+        for entry_point in entry_points(group=ENV_ENTRY_POINTS)
+    }
+
+
+_registry: Dict[str, GameSpec] = {}
+
+
+@lru_cache(maxsize=None)
+def _discovered_games() -> Dict[str, GameSpec]:
+    """Games of entry points, overridden by the game modules of :mod:`jaxatari.games` with the same name."""
+    games_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games")
+    return {**_entry_point_games(), **discover_games(games_dir, GAMES_PACKAGE)}
+
+
+def register(name: str, env: str, renderer: Optional[str] = None):
+    """
+    Register a game, overriding a built-in or entry point game with the same name.
+    Args:
+        name: name of the game
+        env: import path of the environment class, ``"module:Class"``
+        renderer: import path of the renderer class
+    """
+    _registry[name] = GameSpec(name, env, renderer)
+
+
+def games() -> Dict[str, GameSpec]:
+    """All registered games by name."""
+    return {**_discovered_games(), **_registry}
+
+
+def list_games() -> List[str]:
+    return sorted(games())
+
+
+def get_spec(name: str) -> GameSpec:
+    try:
+        return games()[name]
+    except KeyError:
+        raise NotImplementedError(f"The game {name} does not exist, available games: {list_games()}") from None
+
+
+def make(name: str, **kwargs):
+    """Create the environment of a game, importing only that game."""
+    return get_spec(name).make(**kwargs)
+
+
+def make_renderer(name: str, **kwargs):
+    """Create the renderer of a game, None if the game has no renderer."""
+    return get_spec(name).make_renderer(**kwargs)
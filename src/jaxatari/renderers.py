@@ -3,8 +3,16 @@ class PyGameRenderer:
         pass
 
 class AtraJaxisRenderer:
-    def __init__(self):
-        pass
+    def __init__(self, viewport=None):
+        """
+        Args:
+            viewport: jaxatari.rendering.atraJaxis.Viewport to render reduced resolution, cropped
+                      and/or grayscale frames directly, None renders the full RGB screen.
+        """
+        self.viewport = viewport
+        # set by renderers whose sprites all have binary alpha (aj.has_binary_alpha), passed
+        # to the drawing functions as binary_alpha
+        self.binary_alpha = False
 
     def render(self, state):
         pass
@@ -4,7 +4,7 @@ import numpy as np
 import jax.numpy as jnp
 import jax
 from functools import partial
-import pygame
+from typing import NamedTuple, Optional, Tuple
 from jax import lax
 
 
@@ -31,9 +31,10 @@ def loadFrame(fileName, transpose=True):
                    to (W, H, C). If False, assumes source is already (W, H, C).
 
     Returns:
-        JAX array of shape (Width, Height, 4).
+        NumPy array of shape (Width, Height, 4). Sprites are loaded on the host and only
+        become device arrays when they are used in (jitted) rendering code.
     """
-    frame = jnp.load(fileName)
+    frame = np.load(fileName)
     if frame.ndim != 3 or frame.shape[2] != 4:
          raise ValueError(
             f"Invalid frame format in {fileName}. Source .npy must be loadable with 3 dims and 4 channels."
@@ -41,13 +42,12 @@ def loadFrame(fileName, transpose=True):
 
     if transpose:
         # Source assumed H, W, C -> transpose to W, H, C
-        return jnp.transpose(frame, (1, 0, 2))
+        return np.transpose(frame, (1, 0, 2))
     else:
          # Source assumed W, H, C
         return frame
 
 
-@partial(jax.jit, static_argnames=["path_pattern", "num_chars"])
 def load_and_pad_digits(path_pattern, num_chars=10):
     """Loads digit sprites, pads them to the max dimensions, assuming (W, H, C) format.
 
@@ -56,7 +56,7 @@ def load_and_pad_digits(path_pattern, num_chars=10):
         num_chars: Number of digits to load (e.g., 10 for 0-9).
 
     Returns:
-        JAX array of shape (num_chars, max_Width, max_Height, 4).
+        NumPy array of shape (num_chars, max_Width, max_Height, 4).
     """
     digits = []
     max_width, max_height = 0, 0
@@ -80,7 +80,7 @@ def load_and_pad_digits(path_pattern, num_chars=10):
         pad_bottom = pad_h - pad_top
 
         # Padding order: ((pad_axis0_before, after), (pad_axis1_before, after), ...)
-        padded_digit = jnp.pad(
+        padded_digit = np.pad(
             digit,
             ((pad_left, pad_right), (pad_top, pad_bottom), (0, 0)), # Pad Width (axis 0), then Height (axis 1)
             mode="constant",
@@ -88,10 +88,10 @@ def load_and_pad_digits(path_pattern, num_chars=10):
         )
         padded_digits.append(padded_digit)
 
-    return jnp.array(padded_digits)
+    return np.array(padded_digits)
 
 
-@jax.jit
+@partial(jax.jit, static_argnames=["loop"])
 def get_sprite_frame(frames, frame_idx, loop=True):
     """Extracts a single sprite frame from an animation sequence.
 
@@ -104,80 +104,60 @@ def get_sprite_frame(frames, frame_idx, loop=True):
         JAX array of shape (Width, Height, Channels) for the selected frame,
         or a blank frame if index is invalid and loop is False.
     """
+    frames = jnp.asarray(frames)
     num_frames = frames.shape[0]
 
-    frame_idx_looped = jnp.mod(frame_idx, num_frames)
-    frame_idx_converted = jax.lax.cond(
-        loop, lambda _: frame_idx_looped, lambda _: frame_idx, operand=None
-    )
+    if loop:
+        # a looped index is always valid, the frame is a single gather
+        return frames[jnp.mod(frame_idx, num_frames)]
 
-    valid_frame = jnp.logical_and(
-        frame_idx_converted >= 0, frame_idx_converted < num_frames
-    )
+    valid_frame = jnp.logical_and(frame_idx >= 0, frame_idx < num_frames)
+    frame = frames[jnp.clip(frame_idx, 0, num_frames - 1)] # Shape (W, H, C)
+    return jnp.where(valid_frame, frame, jnp.zeros_like(frame))
 
-    # Get dimensions from input array shape (N, W, H, C)
-    frame_width = frames.shape[1]    # Axis 1 is Width
-    frame_height = frames.shape[2]   # Axis 2 is Height
-    frame_channels = frames.shape[3] # Axis 3 is Channels
-    blank_frame = jnp.zeros(
-        (frame_width, frame_height, frame_channels), dtype=frames.dtype # W, H, C
-    )
 
-    return jax.lax.cond(
-        valid_frame,
-        lambda _: frames[frame_idx_converted], # Shape (W, H, C)
-        lambda _: blank_frame,                 # Shape (W, H, C)
-        operand=None,
-    )
+def has_binary_alpha(*sprites):
+    """Checks on the host whether sprites only use binary alpha (fully transparent or opaque).
 
-
-@jax.jit
-def render_at(raster, x, y, sprite_frame, flip_horizontal=False, flip_vertical=False):
-    """Renders a sprite onto a raster at position (x, y) top-left, with clipping and optional flipping.
+    Renderers declare binary alpha for render_at once, when their sprites are loaded, so
+    opaque pixels are copied instead of blended.
 
     Args:
-        raster: JAX array of shape (Width, Height, 3/4) for the target image.
-        x: Integer x coordinate (left edge, horizontal) for sprite placement.
-        y: Integer y coordinate (top edge, vertical) for sprite placement.
-        sprite_frame: JAX array of shape (Width, Height, 4) containing RGB + alpha.
-        flip_horizontal: Boolean flag to flip the sprite horizontally (left-right).
-        flip_vertical: Boolean flag to flip the sprite vertically (top-bottom).
+        sprites: Arrays (or RGBA colors) with RGB + alpha in the last axis, e.g. sprite banks.
 
     Returns:
-        A new raster JAX array (Width, Height, 3/4) with the sprite rendered.
+        True if every alpha value is 0 or 255.
     """
-    # --- Input Validation and Setup ---
-    x, y = jnp.asarray(x, dtype=jnp.int32), jnp.asarray(y, dtype=jnp.int32)
-    # Arrays are (Width, Height, Channels)
-    sprite_frame = jnp.asarray(sprite_frame) # Assume concrete shape (W, H, 4)
-    raster = jnp.asarray(raster)             # Assume shape (W, H, 3 or 4)
-    raster_width, raster_height, raster_channels = raster.shape
-    sprite_width, sprite_height, _ = sprite_frame.shape # Need concrete shape here
+    return all(np.isin(np.asarray(sprite)[..., 3], (0, 255)).all() for sprite in sprites)
 
-    # --- Sprite Flipping ---
-    sprite = sprite_frame
-    # Flip horizontal means flipping along the Width axis (Axis 0)
-    sprite = jax.lax.cond(flip_horizontal, lambda s: jnp.flip(s, axis=0), lambda s: s, sprite)
-    # Flip vertical means flipping along the Height axis (Axis 1)
-    sprite = jax.lax.cond(flip_vertical,   lambda s: jnp.flip(s, axis=1), lambda s: s, sprite)
+
+def _blend_sprite(region, sprite_xs, sprite_ys, sprite, visible=True, binary_alpha=False):
+    """Alpha blends a sprite onto a region of a raster.
+
+    Args:
+        region: JAX array of shape (Width, Height, 3/4), a window of the target raster.
+        sprite_xs: Sprite x coordinate of every column of the region (Width,).
+        sprite_ys: Sprite y coordinate of every row of the region (Height,).
+        sprite: JAX array of shape (Width, Height, 4) containing RGB + alpha.
+        visible: Boolean flag, the region is returned unchanged if False.
+        binary_alpha: Static flag, the sprite's alpha is only 0 or 255 (see has_binary_alpha).
+
+    Returns:
+        The blended region, same shape and dtype as region.
+    """
+    region_width, region_height, region_channels = region.shape
+    sprite_width, sprite_height, _ = sprite.shape
 
     # --- Coordinate Calculation & Masking ---
-    # Create coordinate grids for the *entire* raster (W, H)
-    # 'ij' indexing: xx varies along axis 0 (Width), yy varies along axis 1 (Height)
-    raster_xx, raster_yy = jnp.meshgrid(
-        jnp.arange(raster_width),   # X coords (0..W-1)
-        jnp.arange(raster_height),  # Y coords (0..H-1)
-        indexing='ij'
-    ) # raster_xx shape (W, H), raster_yy shape (W, H)
-
-    # Calculate corresponding coordinates relative to the sprite's origin (top-left)
-    sprite_coord_x = raster_xx - x # X position on sprite for each raster pixel
-    sprite_coord_y = raster_yy - y # Y position on sprite for each raster pixel
-
-    # Create mask: identifies raster pixels (at raster_xx, raster_yy) that
-    # correspond to valid coordinates *within* the sprite's bounds (0..W-1, 0..H-1)
+    # Coordinates relative to the sprite's origin (top-left) for each region pixel (W, H)
+    # xx varies along axis 0 (Width), yy varies along axis 1 (Height)
+    sprite_coord_x = jnp.broadcast_to(sprite_xs[:, None], (region_width, region_height))
+    sprite_coord_y = jnp.broadcast_to(sprite_ys[None, :], (region_width, region_height))
+
+    # Create mask: identifies region pixels that correspond to valid coordinates
+    # *within* the sprite's bounds (0..W-1, 0..H-1)
     sprite_bounds_mask = (sprite_coord_x >= 0) & (sprite_coord_x < sprite_width) & \
-                         (sprite_coord_y >= 0) & (sprite_coord_y < sprite_height)
+                         (sprite_coord_y >= 0) & (sprite_coord_y < sprite_height) & visible
     # sprite_bounds_mask has shape (W, H)
 
     # --- Safe Gathering using Padding ---
@@ -195,38 +175,400 @@ def render_at(raster, x, y, sprite_frame, flip_horizontal=False, flip_vertical=F
     gathered_sprite_rgba = sprite_padded[sprite_coord_x_padded, sprite_coord_y_padded]
     # gathered_sprite_rgba has shape (W, H, 4)
 
-    # --- Blending Calculation (for all raster pixels) ---
+    if binary_alpha:
+        # opaque pixels replace the region, transparent ones keep it: the same result as
+        # blending with alpha 1.0 / 0.0, without converting to float
+        opaque_mask = sprite_bounds_mask & (gathered_sprite_rgba[..., 3] != 0)
+        return jnp.where(opaque_mask[..., None], gathered_sprite_rgba[..., :3].astype(region.dtype), region)
+
+    # --- Blending Calculation (for all region pixels) ---
     gathered_sprite_rgb = gathered_sprite_rgba[..., :3].astype(jnp.float32)
     gathered_sprite_alpha = (gathered_sprite_rgba[..., 3:].astype(jnp.float32) / 255.0) # Shape (W, H, 1)
 
-    # Get current raster RGB (shape W, H, C)
-    current_raster_rgb = raster[..., :raster_channels].astype(jnp.float32)
+    # Get current region RGB (shape W, H, C)
+    current_rgb = region[..., :region_channels].astype(jnp.float32)
 
     # Perform alpha blending calculation everywhere
     blended_rgb = gathered_sprite_rgb * gathered_sprite_alpha + \
-                  current_raster_rgb * (1.0 - gathered_sprite_alpha)
+                  current_rgb * (1.0 - gathered_sprite_alpha)
     # blended_rgb has shape (W, H, C)
 
     # --- Apply Mask with jnp.where ---
     final_mask_broadcasted = sprite_bounds_mask[..., None] # Shape (W, H, 1)
 
     # Where the mask is True (pixel corresponds to valid sprite area), select blended_rgb.
-    # Where the mask is False (pixel outside sprite area), select the original current_raster_rgb.
-    new_raster_float = jnp.where(
+    # Where the mask is False (pixel outside sprite area), select the original current_rgb.
+    new_region_float = jnp.where(
         final_mask_broadcasted, # Condition (W, H, 1)
         blended_rgb,            # Value if True (W, H, C)
-        current_raster_rgb      # Value if False (W, H, C)
+        current_rgb             # Value if False (W, H, C)
     )
 
     # Cast final result back to original raster dtype
-    new_raster = new_raster_float.astype(raster.dtype) # Shape (W, H, C)
+    return new_region_float.astype(region.dtype) # Shape (W, H, C)
 
-    return new_raster
+
+@partial(jax.jit, static_argnames=["binary_alpha"])
+def render_at(raster, x, y, sprite_frame, flip_horizontal=False, flip_vertical=False, visible=True, binary_alpha=False):
+    """Renders a sprite onto a raster at position (x, y) top-left, with clipping and optional flipping.
+
+    Only the dirty rectangle under the sprite is blended: a sprite sized window of the raster
+    is sliced out, blended and written back, so the cost depends on the sprite size and not
+    on the raster size. For sprites that are only drawn in some states, pass the condition
+    as visible instead of wrapping the call in lax.cond: under vmap, a cond selects between
+    two whole rasters, while visible only masks the window.
+
+    Args:
+        raster: JAX array of shape (Width, Height, 3/4) for the target image, or a Canvas
+                (the sprite is then blended at the sample points of its viewport).
+        x: Integer x coordinate (left edge, horizontal) for sprite placement.
+        y: Integer y coordinate (top edge, vertical) for sprite placement.
+        sprite_frame: JAX array of shape (Width, Height, 4) containing RGB + alpha.
+        flip_horizontal: Boolean flag to flip the sprite horizontally (left-right).
+        flip_vertical: Boolean flag to flip the sprite vertically (top-bottom).
+        visible: Boolean flag, the raster is returned unchanged if False.
+        binary_alpha: Static flag, declares that the sprite's alpha is only 0 or 255 (see
+                      has_binary_alpha). Opaque pixels are then copied instead of blended in
+                      float32, with the same result.
+
+    Returns:
+        A new raster JAX array (Width, Height, 3/4) with the sprite rendered.
+    """
+    # --- Input Validation and Setup ---
+    x, y = jnp.asarray(x, dtype=jnp.int32), jnp.asarray(y, dtype=jnp.int32)
+    # Arrays are (Width, Height, Channels)
+    sprite_frame = jnp.asarray(sprite_frame) # Assume concrete shape (W, H, 4)
+    sprite_width, sprite_height, _ = sprite_frame.shape # Need concrete shape here
+
+    # --- Sprite Flipping ---
+    sprite = sprite_frame
+    # Flip horizontal means flipping along the Width axis (Axis 0)
+    sprite = jnp.where(flip_horizontal, jnp.flip(sprite, axis=0), sprite)
+    # Flip vertical means flipping along the Height axis (Axis 1)
+    sprite = jnp.where(flip_vertical, jnp.flip(sprite, axis=1), sprite)
+
+    if isinstance(raster, Canvas):
+        return _render_sampled(raster, x, y, sprite, visible, binary_alpha)
+
+    raster = jnp.asarray(raster)             # Assume shape (W, H, 3 or 4)
+    raster_width, raster_height, raster_channels = raster.shape
+
+    if sprite_width > raster_width or sprite_height > raster_height:
+        # the sprite covers the whole raster, blend everything
+        return _blend_sprite(raster, jnp.arange(raster_width) - x, jnp.arange(raster_height) - y, sprite, visible, binary_alpha)
+
+    # --- Dirty Rectangle ---
+    # The window is clamped into the raster. It always contains the visible part of the
+    # sprite, pixels of the window outside the sprite are masked in _blend_sprite.
+    window_x = jnp.clip(x, 0, raster_width - sprite_width)
+    window_y = jnp.clip(y, 0, raster_height - sprite_height)
+    window = lax.dynamic_slice(raster, (window_x, window_y, 0), (sprite_width, sprite_height, raster_channels))
+    window = _blend_sprite(window, jnp.arange(sprite_width) + window_x - x, jnp.arange(sprite_height) + window_y - y, sprite, visible, binary_alpha)
+    return lax.dynamic_update_slice(raster, window, (window_x, window_y, 0))
+
+
+def composite_layer(width, height, sprites, dtype=np.float32):
+    """Pre-composites static sprites into an RGB layer on the host.
+
+    Static parts of a frame (backgrounds, fixed decorations) never change, so instead of
+    blending them with render_at in every frame, a renderer composites them once (e.g. per
+    level) and starts each frame from the cached layer. The sprites are blended exactly
+    like a sequence of render_at calls onto an empty raster of the given dtype.
+
+    Args:
+        width: Width of the layer.
+        height: Height of the layer.
+        sprites: Sequence of (x, y, sprite_frame) drawn in order, sprite_frame of shape
+                 (Width, Height, 4) containing RGB + alpha.
+        dtype: Dtype of the raster the layer replaces, e.g. np.uint8 if the renderer
+               starts from a uint8 raster (blending results are then truncated after
+               every sprite, like render_at does).
+
+    Returns:
+        NumPy uint8 array of shape (Width, Height, 3).
+    """
+    raster = np.zeros((width, height, 3), dtype=dtype)
+    for x, y, sprite in sprites:
+        sprite = np.asarray(sprite)
+        # clip the sprite to the raster
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + sprite.shape[0], width), min(y + sprite.shape[1], height)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        sprite = sprite[x0 - x:x1 - x, y0 - y:y1 - y]
+        rgb = sprite[..., :3].astype(np.float32)
+        alpha = sprite[..., 3:].astype(np.float32) / np.float32(255.0)
+        current = raster[x0:x1, y0:y1].astype(np.float32)
+        raster[x0:x1, y0:y1] = (rgb * alpha + current * (np.float32(1.0) - alpha)).astype(dtype)
+    layer = raster.astype(np.uint8)
+    if not np.array_equal(layer, raster):
+        raise ValueError("The static sprites blend to non-integer colors and can not be cached as a uint8 layer.")
+    return layer
+
+
+# axis order of frames: (Width, Height, Channels) is the native layout of the rasters,
+# (Height, Width, Channels) is row-major like images, (Channels, Height, Width) is channels-first
+LAYOUTS = ("WHC", "HWC", "CHW")
+
+
+class Viewport(NamedTuple):
+    """
+    Pixels a renderer rasterizes instead of the full (160, 210) RGB screen, e.g. for agents
+    that observe 84x84 grayscale frames.
+
+    The crop of the screen is sampled at the centers of a width x height grid (nearest
+    neighbour). Renderers draw directly onto the sampled pixels: a frame rendered with a
+    viewport equals the full frame sampled at the same points, without the full frame ever
+    being rendered. The default viewport is the full screen.
+
+    Args:
+        width: Width of the rendered frame.
+        height: Height of the rendered frame.
+        crop: Region (x, y, width, height) of the screen that is sampled.
+        grayscale: If True, frames have a single luminance channel.
+        layout: Axis order of the frames, one of LAYOUTS. The background layers are stored and
+                the frames are rasterized in this layout, so no frame has to be transposed.
+    """
+    width: int = 160
+    height: int = 210
+    crop: Tuple[int, int, int, int] = (0, 0, 160, 210)
+    grayscale: bool = False
+    layout: str = "WHC"
+
+    def axes(self):
+        """Axes (in WHC order) of the layout, as for np.transpose of a (Width, Height, C) array."""
+        if self.layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout {self.layout!r}, expected one of {LAYOUTS}")
+        return tuple("WHC".index(axis) for axis in self.layout)
+
+    def sample_points(self):
+        """Screen x coordinates of the columns and y coordinates of the rows, NumPy arrays."""
+        crop_x, crop_y, crop_width, crop_height = self.crop
+        sample_x = crop_x + (2 * np.arange(self.width) + 1) * crop_width // (2 * self.width)
+        sample_y = crop_y + (2 * np.arange(self.height) + 1) * crop_height // (2 * self.height)
+        return sample_x, sample_y
+
+
+@jax.tree_util.register_pytree_node_class
+class Canvas:
+    """
+    A raster rendered at the sample points of a viewport, in the layout of the viewport.
+
+    All drawing functions accept a Canvas in place of a raster array, the viewport is static
+    (pytree auxiliary data), so a Canvas can be carried through loops and jitted functions.
+    Created by start_frame, finish_frame returns its pixels.
+    """
+
+    def __init__(self, pixels, viewport: Viewport):
+        self.pixels = pixels
+        self.viewport = viewport
+
+    def tree_flatten(self):
+        return (self.pixels,), self.viewport
+
+    @classmethod
+    def tree_unflatten(cls, viewport, children):
+        return cls(children[0], viewport)
+
+
+def sample_layer(layer, viewport: Optional[Viewport]):
+    """Samples a static layer (e.g. from composite_layer) at the points of a viewport on the host.
+
+    Args:
+        layer: NumPy array of shape (Width, Height, C) covering the screen.
+        viewport: The viewport, None for the full screen (the layer is returned unchanged).
+
+    Returns:
+        NumPy array of shape (viewport.width, viewport.height, C), in the layout of the viewport.
+    """
+    if viewport is None:
+        return layer
+    sample_x, sample_y = viewport.sample_points()
+    return np.ascontiguousarray(np.asarray(layer)[sample_x][:, sample_y].transpose(viewport.axes()))
+
+
+def start_frame(layer, viewport: Optional[Viewport] = None, dtype=None):
+    """Starts a frame from a background layer.
+
+    Args:
+        layer: Background layer, already sampled with sample_layer if a viewport is given.
+        viewport: The viewport to render, None for the full screen.
+        dtype: Dtype of the raster, defaults to the dtype of the layer.
+
+    Returns:
+        The raster array, or a Canvas if a viewport is given.
+    """
+    raster = jnp.asarray(layer, dtype=dtype)
+    return raster if viewport is None else Canvas(raster, viewport)
+
+
+def finish_frame(raster):
+    """Returns the pixels of a finished frame, converted to luminance for a grayscale viewport.
+
+    Args:
+        raster: The raster array or a Canvas.
+
+    Returns:
+        JAX array of shape (Width, Height, 3), or (Width, Height, 1) for a grayscale viewport,
+        in the layout of the viewport and with the dtype of the raster.
+    """
+    if not isinstance(raster, Canvas):
+        return raster
+    pixels = raster.pixels
+    if not raster.viewport.grayscale:
+        return pixels
+    # ITU-R BT.601 luma, like the grayscale observations of the ALE
+    channel_axis = raster.viewport.layout.index("C")
+    rgb = lax.slice_in_dim(pixels, 0, 3, axis=channel_axis).astype(jnp.float32)
+    weights = jnp.array([0.299, 0.587, 0.114]).reshape([3 if axis == "C" else 1 for axis in raster.viewport.layout])
+    luma = jnp.sum(rgb * weights, axis=channel_axis, keepdims=True)
+    if jnp.issubdtype(pixels.dtype, jnp.integer):
+        luma = jnp.round(luma)
+    return luma.astype(pixels.dtype)
+
+
+def fill_rect(raster, x, y, width, height, color):
+    """Fills a rectangle of the screen with a color.
+
+    Args:
+        raster: The raster array or a Canvas.
+        x, y, width, height: The rectangle in screen coordinates, Python integers.
+        color: RGB color (or a scalar) the rectangle is filled with.
+
+    Returns:
+        The updated raster array or Canvas.
+    """
+    if not isinstance(raster, Canvas):
+        return raster.at[x:x + width, y:y + height, :].set(color)
+    # the sample points are sorted, so the samples inside the rectangle are a slice
+    viewport = raster.viewport
+    sample_x, sample_y = viewport.sample_points()
+    x0, x1 = np.searchsorted(sample_x, [x, x + width])
+    y0, y1 = np.searchsorted(sample_y, [y, y + height])
+    color = jnp.asarray(color)
+    if color.ndim:
+        # the color is along the channel axis
+        color = color.reshape([-1 if axis == "C" else 1 for axis in viewport.layout])
+    index = tuple({"W": slice(x0, x1), "H": slice(y0, y1), "C": slice(None)}[axis] for axis in viewport.layout)
+    return Canvas(raster.pixels.at[index].set(color), viewport)
+
+
+def _max_samples(sample_points, length):
+    """Largest number of sample points inside any interval of the given length."""
+    return max(1, int(np.max(np.searchsorted(sample_points, sample_points + length) - np.arange(len(sample_points)))))
+
+
+def _render_sampled(canvas, x, y, sprite, visible, binary_alpha):
+    """render_at for a Canvas: blends the sprite at the sample points it covers."""
+    viewport = canvas.viewport
+    axes = viewport.axes()
+    inverse_axes = tuple(int(axis) for axis in np.argsort(axes))
+    pixels = canvas.pixels
+    canvas_width, canvas_height, canvas_channels = (pixels.shape[axis] for axis in inverse_axes)
+    sprite_width, sprite_height, _ = sprite.shape
+    sample_x, sample_y = viewport.sample_points()
+
+    # --- Dirty Rectangle ---
+    # The window starts at the first sample point on (or right of / below) the sprite and is
+    # large enough for the sample points of the sprite at any position, clamped into the canvas.
+    window_width = min(_max_samples(sample_x, sprite_width), canvas_width)
+    window_height = min(_max_samples(sample_y, sprite_height), canvas_height)
+    sample_x, sample_y = jnp.asarray(sample_x, dtype=jnp.int32), jnp.asarray(sample_y, dtype=jnp.int32)
+    window_x = jnp.clip(jnp.searchsorted(sample_x, x), 0, canvas_width - window_width)
+    window_y = jnp.clip(jnp.searchsorted(sample_y, y), 0, canvas_height - window_height)
+    # the window is sliced in the layout of the canvas and blended in (Width, Height, C)
+    start = [(window_x, window_y, 0)[axis] for axis in axes]
+    size = [(window_width, window_height, canvas_channels)[axis] for axis in axes]
+    window = lax.dynamic_slice(pixels, start, size).transpose(inverse_axes)
+    window = _blend_sprite(
+        window,
+        lax.dynamic_slice(sample_x, (window_x,), (window_width,)) - x,
+        lax.dynamic_slice(sample_y, (window_y,), (window_height,)) - y,
+        sprite,
+        visible,
+        binary_alpha,
+    )
+    return Canvas(lax.dynamic_update_slice(pixels, window.transpose(axes), start), viewport)
+
+
+@partial(jax.jit, static_argnums=(1,))
+def upscale(raster, scale):
+    """Converts a (W, H, C) raster to a uint8 (W * scale, H * scale, 3) frame on the device.
+
+    Args:
+        raster: JAX array of shape (Width, Height, 3/4) containing the image data.
+        scale: Integer scaling factor, every pixel becomes a scale x scale block.
+    """
+    frame = raster[..., :3].astype(jnp.uint8)
+    width, height, channels = frame.shape
+    frame = jnp.broadcast_to(frame[:, None, :, None], (width, scale, height, scale, channels))
+    return frame.reshape(width * scale, height * scale, channels)
+
+
+@partial(jax.jit, static_argnums=(1, 2))
+def to_pixels(raster, scale, shifts=(16, 8, 0)):
+    """Converts a (W, H, C) raster to the packed pixels of a 32 bit Pygame surface on the device.
+
+    The result has the memory layout of the surface, (H * scale, W * scale) uint32, so
+    display_frame only has to do a contiguous copy.
+
+    Args:
+        raster: JAX array of shape (Width, Height, 3/4) containing the image data.
+        scale: Integer scaling factor, every pixel becomes a scale x scale block.
+        shifts: Bit shifts of the red, green and blue channels (surface.get_shifts()[:3]).
+    """
+    rgb = raster[..., :3].astype(jnp.uint32)
+    pixels = (rgb[..., 0] << shifts[0]) | (rgb[..., 1] << shifts[1]) | (rgb[..., 2] << shifts[2])
+    pixels = pixels.T
+    height, width = pixels.shape
+    pixels = jnp.broadcast_to(pixels[:, None, :, None], (height, scale, width, scale))
+    return pixels.reshape(height * scale, width * scale)
+
+
+def display_frame(pygame_screen, frame):
+    """Writes a frame into the Pygame screen surface in place and updates the display.
+
+    The frame is copied once, straight into the pixels of the screen, so it should already
+    have the display size. Parts of the screen outside the frame are black.
+
+    Args:
+        pygame_screen: The Pygame screen surface.
+        frame: Packed (H, W) pixels from to_pixels for 32 bit surfaces, or a uint8 (W, H, 3)
+            frame from upscale.
+    """
+    import pygame
+
+    frame = np.asarray(frame)
+    if frame.ndim == 2:
+        # (H, W) -> (W, H) view with the memory order of the surface
+        frame = frame.T
+    width, height = frame.shape[:2]
+    if (width, height) != pygame_screen.get_size():
+        pygame_screen.fill((0, 0, 0))
+    if frame.ndim == 2:
+        pixels = pygame.surfarray.pixels2d(pygame_screen)
+    else:
+        pixels = pygame.surfarray.pixels3d(pygame_screen)
+    width, height = min(width, pixels.shape[0]), min(height, pixels.shape[1])
+    pixels[:width, :height] = frame[:width, :height]
+    # releasing the pixel view unlocks the surface
+    del pixels
+    pygame.display.flip()
+
+
+def surface_shifts(pygame_screen):
+    """Channel shifts for to_pixels, or None if the surface does not use 32 bit pixels."""
+    if pygame_screen.get_bitsize() != 32:
+        return None
+    return tuple(pygame_screen.get_shifts()[:3])
 
 
 def update_pygame(pygame_screen, raster, SCALING_FACTOR=3, WIDTH=400, HEIGHT=300):
     """Updates the Pygame display with the rendered raster.
 
+    Integer scaling factors are applied on the device and the result is written directly
+    into the screen surface (see to_pixels and display_frame).
+
     Args:
         pygame_screen: The Pygame screen surface.
         raster: JAX array of shape (Width, Height, 3/4) containing the image data.
@@ -234,11 +576,20 @@ def update_pygame(pygame_screen, raster, SCALING_FACTOR=3, WIDTH=400, HEIGHT=300
         WIDTH: Expected width of the input raster (used for scaling calculation).
         HEIGHT: Expected height of the input raster (used for scaling calculation).
     """
+    if float(SCALING_FACTOR).is_integer():
+        shifts = surface_shifts(pygame_screen)
+        if shifts is not None:
+            display_frame(pygame_screen, to_pixels(raster, int(SCALING_FACTOR), shifts))
+        else:
+            display_frame(pygame_screen, upscale(raster, int(SCALING_FACTOR)))
+        return
+
+    import pygame
+
     pygame_screen.fill((0, 0, 0))
 
     # Convert JAX array (W, H, C) to NumPy (W, H, C)
-    raster_np = np.array(raster)
-    raster_np = raster_np.astype(np.uint8)
+    raster_np = np.asarray(raster).astype(np.uint8)
 
     # Pygame surface needs (W, H). make_surface expects (W, H, C) correctly.
     frame_surface = pygame.surfarray.make_surface(raster_np)
@@ -325,8 +676,77 @@ def render_label_selective(raster, x, y,
     return raster
 
 
-@jax.jit
-def render_indicator(raster, x, y, value, sprite, spacing=15):
+def glyph_strip(char_sprites, spacing):
+    """Precomputes the glyph cells render_number gathers numbers from, on the host.
+
+    Every glyph is placed at the left of a cell that is `spacing` pixels wide, so a
+    number of fixed length is a single gather of cells. A blank (fully transparent)
+    cell is appended for suppressed leading zeros.
+
+    Args:
+        char_sprites: Array of sprites (NumChars, W, H, C), e.g. from load_and_pad_digits.
+        spacing: Horizontal spacing between character origins, at least the glyph width.
+
+    Returns:
+        NumPy array of shape (NumChars + 1, spacing, H, C), the last cell is blank.
+    """
+    char_sprites = np.asarray(char_sprites)
+    num_chars, glyph_width, glyph_height, channels = char_sprites.shape
+    if glyph_width > spacing:
+        raise ValueError(f"Glyphs of width {glyph_width} overlap with a spacing of {spacing}")
+    cells = np.zeros((num_chars + 1, spacing, glyph_height, channels), dtype=char_sprites.dtype)
+    cells[:num_chars, :glyph_width] = char_sprites
+    return cells
+
+
+@partial(jax.jit, static_argnames=["max_digits", "align", "leading_zeros", "binary_alpha"])
+def render_number(raster, x, y, n, glyphs, max_digits, align="left", leading_zeros=True, binary_alpha=False):
+    """Renders a non-negative integer from precomputed glyph cells in a single blit.
+
+    The digits are gathered from the glyph cells into one strip of `max_digits` cells,
+    which is blitted once, instead of rendering every digit separately.
+
+    Args:
+        raster: Target raster (W, H, C).
+        x: Left x coordinate of the strip of max_digits cells.
+        y: Top y coordinate.
+        n: The integer to render, clipped to [0, 10**max_digits - 1].
+        glyphs: Glyph cells for the digits 0-9 from glyph_strip.
+        max_digits: Number of digit cells in the strip.
+        align: Position of the number within the strip if leading zeros are suppressed,
+               "left", "right" or "center" (rounded to the left).
+        leading_zeros: If False, leading zeros are not rendered (0 is still rendered as 0).
+        binary_alpha: Static flag, the glyphs' alpha is only 0 or 255 (see render_at).
+
+    Returns:
+        Updated raster.
+    """
+    if align not in ("left", "right", "center"):
+        raise ValueError(f"Unknown alignment {align!r}")
+    num_cells, spacing, glyph_height, channels = glyphs.shape
+    blank = num_cells - 1
+
+    digits = int_to_digits(n, max_digits=max_digits)
+    if leading_zeros:
+        num_blank = 0
+    else:
+        # number of digits the number actually has (at least one)
+        n = jnp.maximum(n, 0)
+        num_digits = 1 + jnp.sum(n >= 10 ** jnp.arange(1, max_digits))
+        num_blank = max_digits - num_digits
+        digits = jnp.where(jnp.arange(max_digits) < num_blank, blank, digits)
+
+    strip = glyphs[digits].reshape(max_digits * spacing, glyph_height, channels)
+    # the strip holds the number right aligned, shift it for the other alignments
+    if align == "left":
+        x = x - num_blank * spacing
+    elif align == "center":
+        x = x - (num_blank * spacing) // 2
+    return render_at(raster, x, y, strip, binary_alpha=binary_alpha)
+
+
+@partial(jax.jit, static_argnames=["binary_alpha"])
+def render_indicator(raster, x, y, value, sprite, spacing=15, binary_alpha=False):
     """Renders 'value' copies of 'sprite' horizontally starting at (x, y).
 
     Args:
@@ -336,6 +756,7 @@ def render_indicator(raster, x, y, value, sprite, spacing=15):
         value: Number of times to render the sprite.
         sprite: The sprite to render (W, H, C).
         spacing: Horizontal spacing between sprite origins.
+        binary_alpha: Static flag, the sprite's alpha is only 0 or 255 (see render_at).
 
     Returns:
         Updated raster.
@@ -343,13 +764,13 @@ def render_indicator(raster, x, y, value, sprite, spacing=15):
     # Assumes sprite is (W, H, C)
     def render_single_indicator(i, current_raster):
         indicator_x = x + i * spacing # Calculate x for this instance
-        return render_at(current_raster, indicator_x, y, sprite)
+        return render_at(current_raster, indicator_x, y, sprite, binary_alpha=binary_alpha)
 
     return jax.lax.fori_loop(0, value, render_single_indicator, raster)
 
 
-@partial(jax.jit, static_argnames=["width", "height"])
-def render_bar(raster, x, y, value, max_value, width, height, color, default_color):
+@partial(jax.jit, static_argnames=["width", "height", "binary_alpha"])
+def render_bar(raster, x, y, value, max_value, width, height, color, default_color, binary_alpha=False):
     """Renders a horizontal progress bar at (x, y) with specified geometry.
 
     Args:
@@ -362,6 +783,7 @@ def render_bar(raster, x, y, value, max_value, width, height, color, default_col
         height: Geometric height of the bar in pixels.
         color: RGBA tuple/list/array for the filled portion.
         default_color: RGBA tuple/list/array for the unfilled portion.
+        binary_alpha: Static flag, both colors have an alpha of 0 or 255 (see render_at).
 
     Returns:
         Updated raster.
@@ -391,20 +813,19 @@ def render_bar(raster, x, y, value, max_value, width, height, color, default_col
     )
 
     # Render the generated bar (W, H, 4) onto the raster at (x, y)
-    raster = render_at(raster, x, y, bar_content)
+    raster = render_at(raster, x, y, bar_content, binary_alpha=binary_alpha)
 
     return raster
 
 
-@jax.jit
 def pad_to_match(sprites):
     """Pads a list of sprites to the maximum dimensions found in the list.
 
     Args:
-        sprites: A list of JAX arrays, each assumed shape (W, H, C).
+        sprites: A list of arrays, each assumed shape (W, H, C).
 
     Returns:
-        A list of JAX arrays, all padded to (maxW, maxH, C).
+        A list of NumPy arrays, all padded to (maxW, maxH, C).
     """
     max_width = 0
     max_height = 0
@@ -418,7 +839,7 @@ def pad_to_match(sprites):
         pad_h = max_height - sprite.shape[1]
         # Padding spec: ((pad_axis0_before, after), (pad_axis1_before, after), ...)
         pad_spec = ((0, pad_w), (0, pad_h), (0, 0)) # Pad Width (axis 0), then Height (axis 1)
-        padded_sprite = jnp.pad(
+        padded_sprite = np.pad(
             sprite,
             pad_spec,
             mode="constant",
@@ -429,6 +850,37 @@ def pad_to_match(sprites):
     return padded_sprites
 
 
+def sprite_bank(sprites):
+    """Stacks sprites that are chosen by an animation state into one padded bank.
+
+    The renderer computes the index of the sprite to draw (e.g. with select_index) and
+    picks it with get_sprite_frame, a single gather instead of a chain of lax.cond.
+
+    Args:
+        sprites: A list of arrays, each assumed shape (W, H, C).
+
+    Returns:
+        NumPy array of shape (NumSprites, maxW, maxH, C), padded like pad_to_match.
+    """
+    return np.stack(pad_to_match([np.asarray(sprite) for sprite in sprites]))
+
+
+def select_index(cases, default):
+    """Returns the index of the first case whose condition holds, like a chain of nested lax.cond.
+
+    Args:
+        cases: Sequence of (condition, index) in order of priority.
+        default: Index if no condition holds.
+
+    Returns:
+        Integer JAX array (the shape of the broadcast conditions).
+    """
+    index = jnp.asarray(default)
+    for condition, case_index in reversed(cases):
+        index = jnp.where(condition, case_index, index)
+    return index
+
+
 @partial(jax.jit, static_argnames=["max_digits"])
 def int_to_digits(n, max_digits=8):
     """Convert a non-negative integer to a fixed-length JAX array of digits (most significant first).
@@ -446,24 +898,14 @@ def int_to_digits(n, max_digits=8):
     max_val = 10**max_digits - 1
     n = jnp.minimum(n, max_val)
 
-    # Use lax.scan to extract digits efficiently
-    def scan_body(carry, _):
-        current_n = carry
-        digit = current_n % 10
-        next_n = current_n // 10
-        # Return next carry and the extracted digit
-        return next_n, digit
-
-    # Initial carry is the number itself
-    # Scan over a dummy array of the correct length
-    _, digits_reversed = lax.scan(scan_body, n, None, length=max_digits)
-
-    # Digits are generated least significant first, flip them
-    return jnp.flip(digits_reversed)
+    # Extract all digits at once, most significant first
+    powers = 10 ** jnp.arange(max_digits - 1, -1, -1)
+    return (n // powers) % 10
 
 
 # debug code
 if __name__ == "__main__":
+    import pygame
 
     # Load frames assuming loadFrame default transpose=True gives (W, H, C)
     sub1 = loadFrame("./sprites/seaquest/player_sub/1.npy")
@@ -0,0 +1,295 @@
+"""
+Binary snapshots of game states and other pytrees.
+
+A snapshot file consists of:
+
+- the magic bytes ``JXSNAP`` and a format version byte
+- the length of the header as a little endian uint32
+- a JSON header that describes every leaf of the flattened pytree (path, dtype, shape
+  and byte offset), the compression and, for batched snapshots, the batch size
+- the raw bytes of all leaves at 64 byte aligned offsets, optionally zlib compressed
+
+Uncompressed snapshots can be memory mapped with :func:`memmap_states`, and
+:class:`StateWriter` fills a batched snapshot file in place.
+
+Typed PRNG keys (``jax.random.key``) are stored as their key data together with the
+implementation name and are restored as typed keys. Raw ``uint32`` keys are ordinary
+arrays.
+
+Loading needs a template state (e.g. the state returned by ``reset``) to rebuild the
+pytree, so nested states like ``SeaquestState.spawn_state`` round-trip exactly. Without
+a template the leaves are returned as a flat ``{path: array}`` dict.
+
+A batched snapshot stores a whole batch of environment states (every leaf has a leading
+batch axis) in one file. It can be loaded with a batched or an unbatched template.
+"""
+import io
+import json
+import struct
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import jax
+import numpy as np
+
+MAGIC = b"JXSNAP"
+FORMAT_VERSION = 1
+PRNG_IMPLEMENTATIONS = ("threefry2x32", "rbg", "unsafe_rbg")
+# leaves and the payload start at multiples of this many bytes, so uncompressed snapshots can be memory mapped
+ALIGNMENT = 64
+
+
+def field_name(path) -> str:
+    """Turn a pytree key path into a file name friendly field name, e.g. ``spawn_state.survived``."""
+    names = []
+    for key in path:
+        for attribute in ("name", "key", "idx"):
+            if hasattr(key, attribute):
+                names.append(str(getattr(key, attribute)))
+                break
+        else:
+            names.append(str(key))
+    return ".".join(names)
+
+
+@lru_cache(maxsize=None)
+def _prng_implementations() -> Dict[str, str]:
+    """Map the key dtype of every PRNG implementation (e.g. ``key<fry>``) to its name."""
+    return {
+        str(jax.eval_shape(lambda: jax.random.key(0, impl=name)).dtype): name
+        for name in PRNG_IMPLEMENTATIONS
+    }
+
+
+def _is_prng_key(leaf) -> bool:
+    return hasattr(leaf, "dtype") and jax.dtypes.issubdtype(leaf.dtype, jax.dtypes.prng_key)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _flatten(tree):
+    """Flatten a pytree into ``(field name, leaf, PRNG implementation)`` with typed keys replaced by their key data."""
+    result = []
+    for path, leaf in jax.tree_util.tree_flatten_with_path(tree)[0]:
+        prng_impl = None
+        if _is_prng_key(leaf):
+            prng_impl = _prng_implementations()[str(leaf.dtype)]
+            if isinstance(leaf, jax.ShapeDtypeStruct):
+                leaf = jax.eval_shape(jax.random.key_data, leaf)
+            else:
+                leaf = jax.random.key_data(leaf)
+        result.append((field_name(path), leaf, prng_impl))
+    return result
+
+
+def _layout(leaves, batch_size: Optional[int] = None):
+    """Header entries with aligned offsets for flattened leaves, optionally with a batch axis prepended."""
+    entries = []
+    offset = 0
+    for name, leaf, prng_impl in leaves:
+        shape = ([batch_size] if batch_size is not None else []) + list(leaf.shape)
+        dtype = np.dtype(leaf.dtype)
+        entry = {"path": name, "dtype": dtype.str, "shape": shape, "offset": offset}
+        entry["nbytes"] = int(np.prod(shape)) * dtype.itemsize
+        if prng_impl is not None:
+            entry["prng_impl"] = prng_impl
+        entries.append(entry)
+        offset = _aligned(offset + entry["nbytes"])
+    return entries, offset
+
+
+def _prefix(header: dict) -> bytes:
+    """Magic, version and header, padded so that the payload starts aligned."""
+    header_bytes = json.dumps(header).encode("utf-8")
+    unpadded = len(MAGIC) + 1 + 4 + len(header_bytes)
+    header_bytes += b" " * (_aligned(unpadded) - unpadded)
+    return MAGIC + bytes([FORMAT_VERSION]) + struct.pack("<I", len(header_bytes)) + header_bytes
+
+
+def to_bytes(tree, batched: bool = False, compress: bool = False) -> bytes:
+    """
+    Serialize a pytree to the snapshot format.
+    Args:
+        tree: pytree of arrays, e.g. a game state
+        batched: whether every leaf has a leading batch axis of the same size
+        compress: whether to zlib compress the leaf data
+    Returns:
+        the snapshot as bytes
+    """
+    leaves = [(name, np.asarray(leaf), prng_impl) for name, leaf, prng_impl in _flatten(tree)]
+    entries, payload_size = _layout(leaves)
+
+    size = None
+    if batched:
+        sizes = {entry["shape"][0] if entry["shape"] else None for entry in entries}
+        if len(sizes) != 1 or None in sizes:
+            raise ValueError(f"Batched snapshots need a common leading batch axis, got sizes {sizes}")
+        size = sizes.pop()
+
+    payload = bytearray(payload_size)
+    for entry, (_, array, _) in zip(entries, leaves):
+        payload[entry["offset"]:entry["offset"] + entry["nbytes"]] = array.tobytes()
+    data = zlib.compress(payload) if compress else bytes(payload)
+    return _prefix({"leaves": entries, "batch_size": size, "compression": "zlib" if compress else None}) + data
+
+
+def _read_header(f):
+    """Read the header from a file object, returns the header and the offset of the payload."""
+    start = f.read(len(MAGIC) + 1 + 4)
+    if start[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a JAXAtari snapshot")
+    version = start[len(MAGIC)]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    (header_size,) = struct.unpack("<I", start[len(MAGIC) + 1:])
+    header = json.loads(f.read(header_size).decode("utf-8"))
+    return header, len(start) + header_size
+
+
+def batch_size(data: bytes) -> Optional[int]:
+    """Batch size of a snapshot, None for a single state."""
+    return _read_header(io.BytesIO(data))[0]["batch_size"]
+
+
+def _restore(header, arrays: Dict[str, np.ndarray], like: Optional[Any], to_device: bool = True):
+    """Rebuild the pytree of ``like`` from flat arrays, wrapping typed PRNG keys."""
+    for entry in header["leaves"]:
+        if "prng_impl" in entry:
+            arrays[entry["path"]] = jax.random.wrap_key_data(arrays[entry["path"]], impl=entry["prng_impl"])
+    if like is None:
+        return arrays
+
+    template, treedef = jax.tree_util.tree_flatten_with_path(like)
+    paths = [field_name(path) for path, _ in template]
+    if paths != list(arrays):
+        raise ValueError(f"The snapshot fields {list(arrays)} do not match the template fields {paths}")
+    shapes = [tuple(arrays[name].shape) for name in paths]
+    expected_shapes = [tuple(getattr(expected, "shape", np.shape(expected))) for _, expected in template]
+    # a batched snapshot can be loaded with a batched template or with a single, unbatched state
+    unbatched_template = header["batch_size"] is not None and any(
+        len(shape) != len(expected_shape) for shape, expected_shape in zip(shapes, expected_shapes)
+    )
+    leaves = []
+    for (path, expected), name, shape, expected_shape in zip(template, paths, shapes, expected_shapes):
+        array = arrays[name]
+        if unbatched_template:
+            shape = shape[1:]
+        if _is_prng_key(expected) != _is_prng_key(array) or shape != expected_shape:
+            batch_note = " (without the batch axis)" if unbatched_template else ""
+            raise ValueError(f"Field {name} has shape {shape}{batch_note} in the snapshot, expected {expected_shape}")
+        leaves.append(jax.numpy.asarray(array) if to_device and not _is_prng_key(array) else array)
+    return jax.tree_util.tree_unflatten(treedef, leaves)
+
+
+def from_bytes(data: bytes, like: Optional[Any] = None):
+    """
+    Deserialize a snapshot.
+    Args:
+        data: the snapshot bytes
+        like: template pytree with the structure of the saved tree, e.g. a state returned by reset.
+            For batched snapshots the template can be batched or a single, unbatched state.
+    Returns:
+        the restored pytree, or a flat ``{path: array}`` dict if no template is given
+    """
+    header, payload_start = _read_header(io.BytesIO(data))
+    payload = data[payload_start:]
+    if header["compression"] == "zlib":
+        payload = zlib.decompress(payload)
+
+    arrays = {
+        entry["path"]: np.frombuffer(
+            payload, dtype=np.dtype(entry["dtype"]), count=int(np.prod(entry["shape"])), offset=entry["offset"]
+        ).reshape(entry["shape"])
+        for entry in header["leaves"]
+    }
+    return _restore(header, arrays, like)
+
+
+def memmap_states(path: str, like: Optional[Any] = None):
+    """
+    Memory map an uncompressed snapshot file instead of reading it.
+    Leaves are read-only ``np.memmap`` arrays (typed PRNG keys are loaded), so only the parts that are
+    accessed are read from disk.
+    """
+    with open(path, "rb") as f:
+        header, payload_start = _read_header(f)
+    if header["compression"] is not None:
+        raise ValueError(f"{path} is compressed and cannot be memory mapped")
+    arrays = {
+        entry["path"]: np.memmap(
+            path, dtype=np.dtype(entry["dtype"]), mode="r", offset=payload_start + entry["offset"], shape=tuple(entry["shape"])
+        )
+        for entry in header["leaves"]
+    }
+    return _restore(header, arrays, like, to_device=False)
+
+
+class StateWriter:
+    """
+    Creates a batched snapshot file for ``batch_size`` states with the structure of ``like`` and fills it in place,
+    so batches of states can be written as they are generated without holding all of them in memory.
+    """
+
+    def __init__(self, path: str, like, batch_size: int):
+        self.path = path
+        self.batch_size = batch_size
+        leaves = _flatten(jax.eval_shape(lambda: like))
+        entries, payload_size = _layout(leaves, batch_size)
+        prefix = _prefix({"leaves": entries, "batch_size": batch_size, "compression": None})
+        with open(path, "wb") as f:
+            f.write(prefix)
+            f.truncate(len(prefix) + payload_size)
+        self._arrays = [
+            np.memmap(path, dtype=np.dtype(entry["dtype"]), mode="r+", offset=len(prefix) + entry["offset"], shape=tuple(entry["shape"]))
+            for entry in entries
+        ]
+
+    def write(self, start: int, states):
+        """Write a batch of states (leaves with a leading batch axis) to the slots ``start, start + 1, ...``."""
+        leaves = _flatten(states)
+        if len(leaves) != len(self._arrays):
+            raise ValueError(f"Expected states with {len(self._arrays)} fields, got {len(leaves)}")
+        for array, (_, leaf, _) in zip(self._arrays, leaves):
+            leaf = np.asarray(leaf)
+            array[start:start + len(leaf)] = leaf
+
+    def close(self):
+        for array in self._arrays:
+            array.flush()
+        self._arrays = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def save_state(path: str, state, compress: bool = False):
+    """Save a single state to a snapshot file."""
+    with open(path, "wb") as f:
+        f.write(to_bytes(state, compress=compress))
+
+
+def save_states(path: str, states, compress: bool = False):
+    """Save a batch of states (leaves with a leading batch axis, e.g. from a vmapped reset) to one snapshot file."""
+    with open(path, "wb") as f:
+        f.write(to_bytes(states, batched=True, compress=compress))
+
+
+def load_state(path: str, like: Optional[Any] = None):
+    """Load a snapshot file written by :func:`save_state` or :func:`save_states`."""
+    with open(path, "rb") as f:
+        return from_bytes(f.read(), like)
+
+
+def load_states(path: str, like: Optional[Any] = None):
+    """Load a batch of states written by :func:`save_states`. ``like`` may be batched or a single, unbatched state."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if batch_size(data) is None:
+        raise ValueError(f"{path} does not contain a batch of states")
+    return from_bytes(data, like)
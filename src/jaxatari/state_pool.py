@@ -0,0 +1,170 @@
+"""
+Start-state pools for diverse resets.
+
+The ``reset`` of every game returns the same start state, so all episodes begin
+identically. A state pool is a batched snapshot file (see :mod:`jaxatari.snapshot`) of
+mid-game states collected from rollouts. :class:`PoolResetWrapper` samples the start
+state of every episode from such a pool on the device, which gives diverse initial
+conditions without running warm-up steps each episode.
+
+Usage:
+
+.. code-block:: python
+
+    from jaxatari import state_pool
+
+    state_pool.generate_pool(env, "seaquest.pool", size=100_000)
+
+    _, template = env.reset()
+    pool = state_pool.load_pool("seaquest.pool", like=template)
+    env = state_pool.PoolResetWrapper(env, pool)
+    obs, state = env.reset(key)
+
+The pool is a pytree child of the wrapper, pass the wrapper as an argument to jitted
+functions instead of closing over it.
+"""
+import functools
+import os
+from typing import Any, Optional, Tuple
+
+import chex
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari import snapshot
+from jaxatari.environment import EnvState, JaxEnvironment
+from jaxatari.wrappers import GymnaxWrapper
+
+
+def _select(mask, on_true, on_false):
+    """Per environment select between two batched states."""
+    return jax.tree.map(
+        lambda a, b: jnp.where(mask.reshape(mask.shape + (1,) * (a.ndim - 1)), a, b), on_true, on_false
+    )
+
+
+def generate_pool(
+    env: JaxEnvironment,
+    path: str,
+    size: int,
+    num_envs: int = 256,
+    warmup_steps: int = 100,
+    interval: int = 25,
+    seed: int = 0,
+    actions: Optional[chex.Array] = None,
+    max_intervals: int = 10_000,
+):
+    """
+    Collect ``size`` states from rollouts of ``num_envs`` environments into a pool file.
+    Every ``interval`` steps, the states of all environments that have been stepped at least ``warmup_steps`` times
+    since their last reset are added to the pool. Environments whose episode ends start over from ``reset``.
+    Args:
+        env: the environment to collect states from
+        path: the pool file to write
+        size: number of states in the pool
+        num_envs: number of environments stepped in parallel
+        warmup_steps: number of steps since the last reset before the state of an environment is collected
+        interval: number of steps between collected states of an environment
+        seed: seed for the reset keys and the random actions
+        actions: optional (steps, num_envs) actions, e.g. from recorded demonstrations, used instead of random
+            actions. They are repeated if the rollouts need more steps.
+        max_intervals: number of intervals after which the collection is given up, e.g. because the episodes
+            rarely last ``warmup_steps`` steps
+    Raises:
+        RuntimeError: if the pool is not full after ``max_intervals`` intervals, the incomplete pool file is removed
+    """
+    action_set = env.get_action_space()
+    key, reset_key = jax.random.split(jax.random.PRNGKey(seed))
+    reset = jax.jit(jax.vmap(env.reset))
+    _, initial_states = reset(jax.random.split(reset_key, num_envs))
+    # environments are reset inside the rollouts, the reset states need the dtypes of the stepped states
+    stepped = jax.eval_shape(jax.vmap(env.step), initial_states, jnp.zeros(num_envs, dtype=jnp.int32))[1]
+    initial_states = jax.tree.map(lambda x, s: x.astype(s.dtype), initial_states, stepped)
+    if actions is not None:
+        actions = jnp.asarray(actions, dtype=jnp.int32)
+
+    @functools.partial(jax.jit, static_argnums=(5,))
+    def rollout(states, steps_since_reset, initial_states, key, first_step, num_steps):
+        def step(carry, t):
+            states, steps_since_reset, key = carry
+            key, action_key = jax.random.split(key)
+            if actions is None:
+                action = jax.random.choice(action_key, action_set, (num_envs,))
+            else:
+                action = actions[t % actions.shape[0]]
+            _, states, _, done, _ = jax.vmap(env.step)(states, action)
+            states = _select(done, initial_states, states)
+            steps_since_reset = jnp.where(done, 0, steps_since_reset + 1)
+            return (states, steps_since_reset, key), None
+
+        carry = (states, steps_since_reset, key)
+        (states, steps_since_reset, _), _ = jax.lax.scan(step, carry, first_step + jnp.arange(num_steps))
+        return states, steps_since_reset
+
+    key, rollout_key = jax.random.split(key)
+    states, steps_since_reset = rollout(
+        initial_states, jnp.zeros(num_envs, dtype=jnp.int32), initial_states, rollout_key, 0, warmup_steps
+    )
+    step_count = warmup_steps
+
+    written = 0
+    with snapshot.StateWriter(path, jax.tree.map(lambda x: x[0], states), size) as writer:
+        for _ in range(max_intervals):
+            keep = np.flatnonzero(np.asarray(steps_since_reset) >= warmup_steps)[: size - written]
+            writer.write(written, jax.tree.map(lambda x: np.asarray(x)[keep], states))
+            written += len(keep)
+            if written == size:
+                break
+            key, rollout_key = jax.random.split(key)
+            states, steps_since_reset = rollout(states, steps_since_reset, initial_states, rollout_key, step_count, interval)
+            step_count += interval
+    if written < size:
+        os.remove(path)
+        raise RuntimeError(
+            f"Collected only {written} of {size} states in {max_intervals} intervals of {interval} steps, "
+            f"few episodes last {warmup_steps} steps. Lower warmup_steps or raise max_intervals."
+        )
+
+
+def load_pool(path: str, like: Any, max_states: Optional[int] = None):
+    """
+    Load (the first ``max_states`` states of) a pool file onto the device.
+    Args:
+        path: the pool file
+        like: a single state of the game, e.g. from ``reset``
+        max_states: optional limit on the number of states to load
+    Returns:
+        the pool as a batched state
+    """
+    pool = snapshot.memmap_states(path, like)
+    return jax.tree.map(lambda x: jnp.asarray(x[:max_states]), pool)
+
+
+@jax.jit
+def sample_states(pool, key: chex.PRNGKey):
+    """Sample one state from a pool uniformly at random."""
+    size = jax.tree_util.tree_leaves(pool)[0].shape[0]
+    index = jax.random.randint(key, (), 0, size)
+    return jax.tree.map(lambda x: x[index], pool)
+
+
+class PoolResetWrapper(GymnaxWrapper):
+    """
+    Resets the wrapped environment to start states sampled from a pool.
+    Wrap the game directly, e.g. ``AtariWrapper(PoolResetWrapper(env, pool))``, so automatic resets also use the pool.
+    The pool is a pytree child of the wrapper (and of the wrappers around it): pass the outermost wrapper as an
+    argument to jitted functions, e.g. a training step, instead of closing over it, otherwise the whole pool is
+    embedded in the compiled program as a constant.
+    """
+
+    _pytree_fields = ("pool",)
+
+    def __init__(self, env, pool):
+        super().__init__(env)
+        self.pool = pool
+
+    @jax.jit
+    def reset(self, key: chex.PRNGKey) -> Tuple[chex.Array, EnvState]:
+        state = sample_states(self.pool, key)
+        return self._env.get_observation(state), state
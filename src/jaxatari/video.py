@@ -0,0 +1,207 @@
+"""
+Video export of game trajectories without a display.
+
+A trajectory of states (every leaf with a leading time axis, e.g. the stacked states of a
+``lax.scan`` rollout or a :class:`jaxatari.recorder.TrajectoryReader` field set) is rendered
+with a vmapped, jitted renderer in chunks of ``chunk_size`` frames. Frames are converted to
+``uint8`` images of shape ``(height, width, 3)`` and optionally upscaled on the device. While
+one chunk is transferred to the host and written, the next chunk is already rendered.
+
+Frames can be written as
+
+- ``.gif``: an animated GIF, encoded with NumPy only
+- ``.npy``: the raw ``(frames, height, width, 3)`` uint8 array
+
+Usage:
+
+.. code-block:: python
+
+    from jaxatari import video
+
+    video.save_video("episode.gif", renderer, states, fps=30, scale=2)
+
+    for frames in video.render_frames(renderer, states):
+        ...  # (chunk, height, width, 3) uint8 NumPy arrays
+"""
+import os
+import struct
+from functools import partial
+from typing import Iterable, Iterator
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from jaxatari.renderers import AtraJaxisRenderer
+
+# the GIF encoder emits every pixel as a 9 bit literal code and resets the code table before it would grow
+GIF_CODE_SIZE = 8
+GIF_CLEAR_INTERVAL = 250
+
+
+def to_images(rasters: jax.Array, scale: int = 1, viewport=None) -> jax.Array:
+    """
+    Convert rendered rasters to uint8 RGB images.
+    Args:
+        rasters: frames of a renderer, ``(..., width, height, C)`` or in the layout of its viewport
+        scale: integer upscaling factor
+        viewport: the renderer's viewport (``renderer.viewport``), frames in other layouts are
+                  transposed and grayscale frames are expanded to RGB
+    Returns:
+        ``(..., height * scale, width * scale, 3)`` uint8 images
+    """
+    if viewport is not None:
+        # move the axes of the layout to height, width, channels
+        batch_axes = tuple(range(rasters.ndim - 3))
+        rasters = jnp.transpose(rasters, batch_axes + tuple(len(batch_axes) + viewport.layout.index(axis) for axis in "HWC"))
+        if viewport.grayscale:
+            rasters = jnp.repeat(rasters[..., :1], 3, axis=-1)
+        images = rasters[..., :3]
+    else:
+        images = jnp.swapaxes(rasters[..., :3], -3, -2)
+    images = jnp.clip(jnp.round(images), 0, 255).astype(jnp.uint8)
+    if scale > 1:
+        images = jnp.repeat(jnp.repeat(images, scale, axis=-3), scale, axis=-2)
+    return images
+
+
+@partial(jax.jit, static_argnums=(0, 3, 4))
+def _render_chunk(renderer, states, start, chunk_size, scale):
+    chunk = jax.tree.map(lambda x: jax.lax.dynamic_slice_in_dim(x, start, chunk_size), states)
+    return to_images(jax.vmap(renderer.render)(chunk), scale, renderer.viewport)
+
+
+def render_frames(
+    renderer: AtraJaxisRenderer, states, chunk_size: int = 64, scale: int = 1
+) -> Iterator[np.ndarray]:
+    """
+    Render a trajectory of states in chunks.
+    Args:
+        renderer: the renderer of the game
+        states: states with a leading time axis
+        chunk_size: number of frames rendered per call, bounds the device memory used for frames
+        scale: integer upscaling factor
+    Returns:
+        an iterator over ``(chunk, height, width, 3)`` uint8 arrays of consecutive frames
+    """
+    num_frames = jax.tree_util.tree_leaves(states)[0].shape[0]
+    chunk_size = min(chunk_size, num_frames)
+    pending = None
+    for start in range(0, num_frames, chunk_size):
+        # the last chunk is shifted back to keep its shape, frames rendered twice are dropped
+        shifted = min(start, num_frames - chunk_size)
+        frames = _render_chunk(renderer, states, shifted, chunk_size, scale)
+        frames.copy_to_host_async()
+        if pending is not None:
+            yield np.asarray(pending[0])[pending[1]:]
+        pending = (frames, start - shifted)
+    if pending is not None:
+        yield np.asarray(pending[0])[pending[1]:]
+
+
+def _palettize(frame: np.ndarray):
+    """Map an RGB frame to palette indices and a palette of at most 256 colors."""
+    packed = (frame[..., 0].astype(np.uint32) << 16) | (frame[..., 1].astype(np.uint32) << 8) | frame[..., 2]
+    colors, indices = np.unique(packed.ravel(), return_inverse=True)
+    if len(colors) > 256:
+        # too many colors for one palette, fall back to 3-3-2 bit RGB
+        indices = (frame[..., 0] & 0xE0) | ((frame[..., 1] & 0xE0) >> 3) | (frame[..., 2] >> 6)
+        colors = np.arange(256, dtype=np.uint32)
+        colors = ((colors & 0xE0) << 16) | ((colors & 0x1C) << 11) | ((colors & 0x03) << 6)
+    palette = np.stack([(colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF], axis=-1).astype(np.uint8)
+    return indices.reshape(frame.shape[:2]).astype(np.uint16), palette
+
+
+def _lzw_literals(indices: np.ndarray) -> bytes:
+    """GIF image data of palette indices, every pixel stored as a literal code with regular clear codes."""
+    clear, end = 1 << GIF_CODE_SIZE, (1 << GIF_CODE_SIZE) + 1
+    pixels = indices.ravel()
+    num_groups = -(-len(pixels) // GIF_CLEAR_INTERVAL)
+    groups = np.full((num_groups, GIF_CLEAR_INTERVAL + 1), -1, dtype=np.int32)
+    groups[:, 0] = clear
+    groups[:, 1:].flat[: len(pixels)] = pixels
+    codes = np.concatenate([groups[groups >= 0], [end]])
+    bits = (codes[:, None] >> np.arange(GIF_CODE_SIZE + 1)) & 1
+    data = np.packbits(bits.astype(np.uint8).ravel(), bitorder="little").tobytes()
+    blocks = [bytes([len(data[i:i + 255])]) + data[i:i + 255] for i in range(0, len(data), 255)]
+    return bytes([GIF_CODE_SIZE]) + b"".join(blocks) + b"\x00"
+
+
+class GifWriter:
+    """
+    Writes frames to an animated GIF as they are produced.
+    Args:
+        path: the GIF file
+        fps: frames per second, GIF stores delays in 1/100 s
+        loop: number of repetitions, 0 loops forever
+    """
+
+    def __init__(self, path: str, fps: float = 30, loop: int = 0):
+        self._file = open(path, "wb")
+        self._delay = max(1, round(100 / fps))
+        self._loop = loop
+        self._size = None
+
+    def write(self, frames: Iterable[np.ndarray]):
+        """Append ``(height, width, 3)`` uint8 frames."""
+        for frame in frames:
+            height, width = frame.shape[:2]
+            if self._size is None:
+                self._size = (width, height)
+                self._file.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+                self._file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self._loop) + b"\x00")
+            elif self._size != (width, height):
+                raise ValueError(f"Frame size {(width, height)} differs from the first frame {self._size}")
+            indices, palette = _palettize(frame)
+            table_bits = max(1, int(np.ceil(np.log2(len(palette)))))
+            table = np.zeros((1 << table_bits, 3), dtype=np.uint8)
+            table[: len(palette)] = palette
+            self._file.write(b"\x21\xf9\x04\x00" + struct.pack("<H", self._delay) + b"\x00\x00")
+            self._file.write(b"\x2c" + struct.pack("<HHHHB", 0, 0, width, height, 0x80 | (table_bits - 1)))
+            self._file.write(table.tobytes())
+            self._file.write(_lzw_literals(indices))
+
+    def close(self):
+        if not self._file.closed:
+            self._file.write(b"\x3b")
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def save_video(
+    path: str, renderer: AtraJaxisRenderer, states, fps: float = 30, chunk_size: int = 64, scale: int = 1
+):
+    """
+    Render a trajectory of states and write it to ``path``, a ``.gif`` or ``.npy`` file.
+    Args:
+        path: output file, the extension selects the format
+        renderer: the renderer of the game
+        states: states with a leading time axis
+        fps: frames per second of the GIF
+        chunk_size: number of frames rendered per call
+        scale: integer upscaling factor
+    """
+    extension = os.path.splitext(path)[1].lower()
+    chunks = render_frames(renderer, states, chunk_size, scale)
+    if extension == ".gif":
+        with GifWriter(path, fps) as writer:
+            for frames in chunks:
+                writer.write(frames)
+    elif extension == ".npy":
+        num_frames = jax.tree_util.tree_leaves(states)[0].shape[0]
+        video = None
+        written = 0
+        for frames in chunks:
+            if video is None:
+                video = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(num_frames,) + frames.shape[1:])
+            video[written:written + len(frames)] = frames
+            written += len(frames)
+        if video is not None:
+            video.flush()
+    else:
+        raise ValueError(f"Unsupported video format {extension!r}, use .gif or .npy")
@@ -1,6 +1,5 @@
 """Wrappers for pure RL."""
 
-import functools
 from typing import Any, Dict, Tuple, Union
 
 
@@ -13,11 +12,40 @@ from gymnax.environments import spaces
 
 
 class GymnaxWrapper(object):
-    """Base class for Gymnax wrappers."""
+    """Base class for Gymnax wrappers.
+
+    Wrappers are pytrees: wrapped wrappers and the attributes named in ``_pytree_fields``
+    (e.g. the start states of a state pool) are children, all other attributes (the game,
+    settings) are static. The jitted methods take ``self`` as an argument, so arrays held by
+    a wrapper are arguments of the compiled programs instead of embedded constants. Pass the
+    wrapper as an argument to your own jitted functions for the same reason.
+    """
+
+    _pytree_fields: Tuple[str, ...] = ()
 
     def __init__(self, env):
         self._env = env
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        jax.tree_util.register_pytree_node(cls, cls._tree_flatten, cls._tree_unflatten)
+
+    def _tree_flatten(self):
+        attributes = vars(self)
+        children = tuple(
+            name for name, value in attributes.items() if name in self._pytree_fields or isinstance(value, GymnaxWrapper)
+        )
+        static = tuple((name, value) for name, value in attributes.items() if name not in children)
+        return tuple(attributes[name] for name in children), (children, static)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        names, static = aux_data
+        wrapper = object.__new__(cls)
+        wrapper.__dict__.update(static)
+        wrapper.__dict__.update(zip(names, children))
+        return wrapper
+
     # provide proxy access to regular attributes of wrapped object
     def __getattr__(self, name):
         return getattr(self._env, name)
@@ -40,7 +68,7 @@ class FlattenObservationWrapper(GymnaxWrapper):
             dtype=self._env.observation_space().dtype,
         )
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def reset(
         self, key: chex.PRNGKey
     ) -> Tuple[chex.Array, EnvState]:
@@ -49,7 +77,7 @@ class FlattenObservationWrapper(GymnaxWrapper):
         chex.assert_shape(obs, (self._env.obs_size * self._env.frame_stack_size,))
         return obs, state
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def step(
         self,
         key: chex.PRNGKey,
@@ -68,16 +96,34 @@ class AtariState:
     obs_stack: chex.Array
     
 class AtariWrapper(GymnaxWrapper):
-    def __init__(self, env, sticky_actions: bool = True, frame_stack_size: int = 4, frame_skip: int = 4, max_episode_length: int = 10_000):
+    """Sticky actions, frame skipping and frame stacking.
+
+    Args:
+        env: The environment to wrap.
+        sticky_actions: Repeat the previous action with probability 0.25.
+        frame_stack_size: Number of stacked observations.
+        frame_skip: Number of environment steps per step, the action is repeated.
+        max_episode_length: Number of steps after which the episode is done.
+        renderer: Optional renderer of the game (e.g. registry.make_renderer(game), also with
+                  a viewport). If given, the observations are rendered frames instead of the
+                  environment's observations: the maximum of the last two frames of every
+                  frame skip window, as in ALE. Only these two frames are rendered, the
+                  earlier steps of the window only step the environment.
+    """
+
+    def __init__(self, env, sticky_actions: bool = True, frame_stack_size: int = 4, frame_skip: int = 4, max_episode_length: int = 10_000, renderer=None):
         super().__init__(env)
         self.sticky_actions = sticky_actions
         self.frame_stack_size = frame_stack_size
         self.frame_skip = frame_skip
         self.max_episode_length = max_episode_length
+        self.renderer = renderer
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def reset(self, key: chex.PRNGKey) -> Tuple[chex.Array, EnvState]:
         obs, env_state = self._env.reset(key)
+        if self.renderer is not None:
+            obs = self.renderer.render(env_state)
         step = jnp.array(0)
         prev_action = jnp.array(0)
 
@@ -90,7 +136,7 @@ class AtariWrapper(GymnaxWrapper):
 
         return obs, AtariState(env_state, step, prev_action, obs)
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def step(self, key: chex.PRNGKey, state: AtariState, action: Union[int, float]) -> Tuple[chex.Array, EnvState, float, bool, Dict[Any, Any]]:
         new_action = action
         if self.sticky_actions:
@@ -101,22 +147,42 @@ class AtariWrapper(GymnaxWrapper):
 
         # use scan to step the env for frame_skip times
 
+        # the state before the last step is carried along for the max pooling of rendered frames
         def body_fn(carry, _):
-            env_state, action = carry
+            env_state, _, action = carry
             obs, new_env_state, reward, done, info = self._env.step(env_state, action) 
-            return (new_env_state, action), (obs, reward, done, info)
+            return (new_env_state, env_state, action), (obs, reward, done, info)
 
-        (new_env_state, new_action), (obs, rewards, dones, infos) = jax.lax.scan(
+        (new_env_state, prev_env_state, new_action), (obs, rewards, dones, infos) = jax.lax.scan(
             body_fn,
-            (state.env_state, new_action),
+            (state.env_state, state.env_state, new_action),
             None,
             length=self.frame_skip,
         )
+        if self.renderer is not None:
+            return self._step_rendered(key, state, new_env_state, prev_env_state, new_action, rewards, dones, infos)
+
         # all results are now shaped: (env_num, frame_skip, obs_size)
         latest_obs = jax.tree.map(lambda x: x[-1], obs)
         # push latest obs into the stack 
         new_obs = jax.tree.map(lambda stack, obs: jnp.concatenate([stack[1:], jnp.expand_dims(obs, axis=0)], axis=0), state.obs_stack, latest_obs)
 
+        reward, done, info = self._reduce(state, rewards, dones, infos)
+
+        new_state = AtariState(new_env_state, state.step + 1, new_action, new_obs)
+
+        # Reset the environment if done
+        new_obs, new_state = jax.lax.cond(
+            done,
+            lambda _: self.reset(key),
+            lambda _: (new_obs, new_state),
+            operand=None
+        )
+
+        return new_obs, new_state, reward, done, info
+
+    def _reduce(self, state, rewards, dones, infos):
+        """Reduces the rewards, dones and infos of the frame skip window."""
         reward = jnp.sum(rewards)
 
         done = jnp.logical_or(dones.any(), state.step >= self.max_episode_length)
@@ -130,17 +196,35 @@ class AtariWrapper(GymnaxWrapper):
         info = {
             k: reduce_info(k, v) for k, v in infos._asdict().items()
         }
+        return reward, done, info
 
-        new_state = AtariState(new_env_state, state.step + 1, new_action, new_obs)
+    def _step_rendered(self, key, state, new_env_state, prev_env_state, new_action, rewards, dones, infos):
+        """Finishes step with rendered observations: renders and max pools the last two frames of the window."""
+        reward, done, info = self._reduce(state, rewards, dones, infos)
 
-        # Reset the environment if done
-        new_obs, new_state = jax.lax.cond(
+        # the reset state replaces the last state before it is rendered, so a reset does not
+        # render a separate frame (under vmap both branches of a cond are computed)
+        new_env_state = jax.lax.cond(
             done,
-            lambda _: self.reset(key),
-            lambda _: (new_obs, new_state),
+            lambda _: self._env.reset(key)[1],
+            lambda _: new_env_state,
             operand=None
         )
+        frame = self.renderer.render(new_env_state)
+        pooled = jnp.maximum(self.renderer.render(prev_env_state), frame)
 
+        # after a reset the stack is filled with the first frame (broadcast, not materialized)
+        new_obs = jnp.where(
+            done,
+            frame[None],
+            jnp.concatenate([state.obs_stack[1:], pooled[None]], axis=0),
+        )
+        new_state = AtariState(
+            new_env_state,
+            jnp.where(done, 0, state.step + 1),
+            jnp.where(done, 0, new_action),
+            new_obs,
+        )
         return new_obs, new_state, reward, done, info
         
 
@@ -155,7 +239,7 @@ class LogEnvState:
 class LogWrapper(GymnaxWrapper):
     """Log the episode returns and lengths."""
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def reset(
         self, key: chex.PRNGKey
     ) -> Tuple[chex.Array, LogEnvState]:
@@ -163,7 +247,7 @@ class LogWrapper(GymnaxWrapper):
         state = LogEnvState(env_state, 0, 0, 0, 0)
         return obs, state
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def step(
         self,
         key: chex.PRNGKey,
@@ -215,7 +299,7 @@ class MultiRewardLogEnvState:
 class MultiRewardLogWrapper(GymnaxWrapper):
     """Log the episode returns and lengths."""
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def reset(
         self, key: chex.PRNGKey, 
     ) -> Tuple[chex.Array, MultiRewardLogEnvState]:
@@ -225,7 +309,7 @@ class MultiRewardLogWrapper(GymnaxWrapper):
         state = MultiRewardLogEnvState(env_state, 0, episode_returns_init, 0, 0, episode_returns_init, 0)
         return obs, state
 
-    @functools.partial(jax.jit, static_argnums=(0,))
+    @jax.jit
     def step(
         self,
         key: chex.PRNGKey,